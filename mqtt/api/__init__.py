@@ -6,6 +6,9 @@ Total: ~315 Endpoints in 14 modules
 """
 
 from .base import JellyfinAPIBase
+from .http_pool import HTTPPool, get_http_pool
+from .request_stats import RequestStats
+from .response_cache import ResponseCache
 from .system import SystemAPI
 from .sessions import SessionsAPI, parse_session
 from .library import LibraryAPI
@@ -48,29 +51,37 @@ class JellyfinAPI:
         'misc': 'Subtitles, channels, backup, localization, etc.',
     }
     
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str,
+                 pool_size: int = 4, max_per_host: int = 10,
+                 cache_enable: bool = True, cache_ttl: float = 0.5,
+                 cache_max_bytes: int = 2 * 1024 * 1024):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         
+        # One keep-alive connection pool and GET response cache shared by all modules
+        self.http = HTTPPool(pool_size=pool_size, max_per_host=max_per_host,
+                             response_cache=ResponseCache(default_ttl=cache_ttl, max_bytes=cache_max_bytes,
+                                                          enabled=cache_enable))
+        
         # Group enabled states (all enabled by default)
         self._group_enabled = {group: False for group in self.GROUPS}
         
         # Initialize API modules
-        self.system = SystemAPI(base_url, api_key)
-        self.sessions = SessionsAPI(base_url, api_key)
-        self.library = LibraryAPI(base_url, api_key)
-        self.items = ItemsAPI(base_url, api_key)
-        self.users = UsersAPI(base_url, api_key)
-        self.playstate = PlaystateAPI(base_url, api_key)
-        self.tasks = TasksAPI(base_url, api_key)
-        self.devices = DevicesAPI(base_url, api_key)
-        self.plugins = PluginsAPI(base_url, api_key)
-        self.livetv = LiveTvAPI(base_url, api_key)
-        self.syncplay = SyncPlayAPI(base_url, api_key)
-        self.playlists = PlaylistsAPI(base_url, api_key)
-        self.media = MediaAPI(base_url, api_key)
-        self.images = ImagesAPI(base_url, api_key)
-        self.misc = MiscAPI(base_url, api_key)
+        self.system = SystemAPI(base_url, api_key, self.http)
+        self.sessions = SessionsAPI(base_url, api_key, self.http)
+        self.library = LibraryAPI(base_url, api_key, self.http)
+        self.items = ItemsAPI(base_url, api_key, self.http)
+        self.users = UsersAPI(base_url, api_key, self.http)
+        self.playstate = PlaystateAPI(base_url, api_key, self.http)
+        self.tasks = TasksAPI(base_url, api_key, self.http)
+        self.devices = DevicesAPI(base_url, api_key, self.http)
+        self.plugins = PluginsAPI(base_url, api_key, self.http)
+        self.livetv = LiveTvAPI(base_url, api_key, self.http)
+        self.syncplay = SyncPlayAPI(base_url, api_key, self.http)
+        self.playlists = PlaylistsAPI(base_url, api_key, self.http)
+        self.media = MediaAPI(base_url, api_key, self.http)
+        self.images = ImagesAPI(base_url, api_key, self.http)
+        self.misc = MiscAPI(base_url, api_key, self.http)
     
     def is_group_enabled(self, group: str) -> bool:
         """Check if a group is enabled for polling"""
@@ -107,6 +118,22 @@ class JellyfinAPI:
         """Get API module by group name"""
         return getattr(self, group, None)
     
+    def get_pool_stats(self) -> dict:
+        """Get shared connection pool hit/miss counters"""
+        return self.http.get_stats()
+    
+    def get_request_stats(self) -> dict:
+        """Get per-endpoint request latency/status/bytes summary"""
+        return self.http.request_stats.get_stats()
+    
+    def get_cache_stats(self) -> dict:
+        """Get response cache hit/miss/coalesce counters"""
+        return self.http.response_cache.get_stats()
+    
+    def close(self):
+        """Close shared connection pool"""
+        self.http.close()
+    
     # =========================================================================
     # CONVENIENCE METHODS (delegate to modules)
     # =========================================================================
@@ -147,6 +174,9 @@ class JellyfinAPI:
 __all__ = [
     'JellyfinAPI',
     'JellyfinAPIBase',
+    'HTTPPool',
+    'RequestStats',
+    'get_http_pool',
     'SystemAPI',
     'SessionsAPI',
     'LibraryAPI',
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Jellyfin API - Asyncio Client
+Async counterpart of JellyfinAPI and its group modules
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor
+from typing import Optional, Any
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIModule:
+    """
+    Async view of a sync API module
+    Every public method becomes a coroutine that runs the sync call
+    on the given executor over the shared keep-alive pool
+    """
+
+    def __init__(self, module, executor: Optional[Executor] = None):
+        self._module = module
+        self._executor = executor
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._module, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(attr, *args, **kwargs)
+            )
+
+        return call
+
+
+class AsyncJellyfinAPI:
+    """
+    Async Jellyfin API client
+    Wraps a sync JellyfinAPI; group state and connection pool are shared
+    so sync scripts and the async bridge see the same client
+    """
+
+    def __init__(self, api, executor: Optional[Executor] = None):
+        self.sync = api
+        self.executor = executor
+        self.GROUPS = api.GROUPS
+
+        for group in api.GROUPS:
+            setattr(self, group, AsyncAPIModule(api.get_module(group), executor))
+
+    def is_group_enabled(self, group: str) -> bool:
+        """Check if a group is enabled for polling"""
+        return self.sync.is_group_enabled(group)
+
+    def get_module(self, group: str) -> Optional[AsyncAPIModule]:
+        """Get async API module by group name"""
+        return getattr(self, group, None) if group in self.GROUPS else None
+
+    async def ping(self) -> bool:
+        """Ping server (delegates to system module)"""
+        return await self.system.ping()
+
+    async def get_system_info(self):
+        """Get system info (delegates to system module)"""
+        return await self.system.get_system_info()
+
+    async def gather(self, *calls, return_exceptions: bool = True):
+        """Run several API coroutines concurrently"""
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
@@ -4,19 +4,31 @@ Jellyfin API - Base Class
 Provides core request methods for all API modules
 """
 
+import time
 import logging
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+from .http_pool import HTTPPool, get_http_pool
 
 logger = logging.getLogger(__name__)
 
+# Query params for count-only list requests: no items, images, user data or fields
+COUNT_ONLY_PARAMS = {
+    'limit': 0,
+    'enableImages': False,
+    'enableUserData': False,
+    'enableTotalRecordCount': True,
+}
+
 
 class JellyfinAPIBase:
     """Base class for Jellyfin API modules"""
     
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str, http_pool: Optional[HTTPPool] = None):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
+        self.http = http_pool or get_http_pool()
         self.headers = {
             'X-Emby-Token': api_key,
             'Content-Type': 'application/json'
@@ -29,14 +41,22 @@ class JellyfinAPIBase:
                  timeout: int = 10,
                  raw_response: bool = False) -> Optional[Any]:
         """Make API request with error handling"""
+        return self._send(method, endpoint, params, json_data, data, timeout, raw_response)[0]
+    
+    def _send(self, method: str, endpoint: str, params: Optional[Dict], json_data: Optional[Dict],
+              data: Optional[Any], timeout: int, raw_response: bool) -> Tuple[Optional[Any], int]:
+        """Send request, returns (result, response bytes)"""
         url = f"{self.base_url}{endpoint}"
         
         if params is None:
             params = {}
         params['api_key'] = self.api_key
         
+        stats = self.http.request_stats
+        start = time.monotonic()
+        response = None
         try:
-            response = requests.request(
+            response = self.http.request(
                 method, 
                 url, 
                 headers=self.headers,
@@ -46,33 +66,63 @@ class JellyfinAPIBase:
                 timeout=timeout
             )
             response.raise_for_status()
+            size = len(response.content) if not raw_response else 0
             
             if raw_response:
-                return response
+                result = response
+            elif response.status_code == 204 or not response.text:
+                result = True
+            else:
+                try:
+                    result = response.json()
+                except ValueError as e:
+                    # Caught here: requests' JSONDecodeError is also a RequestException
+                    stats.record(method, endpoint, time.monotonic() - start, response.status_code, size, error=True)
+                    logger.error("API invalid JSON: %s %s - %s", method, endpoint, str(e))
+                    return None, 0
             
-            if response.status_code == 204:
-                return True
-            
-            if response.text:
-                return response.json()
-            return True
+            stats.record(method, endpoint, time.monotonic() - start, response.status_code, size)
+            return result, size
             
         except requests.exceptions.Timeout:
+            stats.record(method, endpoint, time.monotonic() - start, timeout=True)
             logger.error("API timeout: %s %s", method, endpoint)
-            return None
+            return None, 0
         except requests.exceptions.RequestException as e:
+            stats.record(method, endpoint, time.monotonic() - start,
+                         response.status_code if response is not None else None,
+                         len(response.content) if response is not None else 0, error=True)
             logger.error("API error: %s %s - %s", method, endpoint, str(e))
-            return None
+            return None, 0
     
     def _get(self, endpoint: str, params: Optional[Dict] = None, **kwargs) -> Optional[Any]:
-        """GET request"""
-        return self._request('GET', endpoint, params=params, **kwargs)
+        """GET request (cached/coalesced unless raw_response)"""
+        if kwargs.get('raw_response'):
+            return self._request('GET', endpoint, params=params, **kwargs)
+        timeout = kwargs.get('timeout', 10)
+        return self.http.response_cache.fetch(
+            endpoint, params,
+            lambda: self._send('GET', endpoint, params, None, None, timeout, False),
+            wait=timeout + 1)
+    
+    def _get_count(self, endpoint: str, params: Optional[Dict] = None) -> Optional[int]:
+        """GET list endpoint in count-only mode, returns TotalRecordCount"""
+        params = {k: v for k, v in (params or {}).items() if k not in ('fields', 'startIndex')}
+        params.update(COUNT_ONLY_PARAMS)
+        result = self._get(endpoint, params)
+        if isinstance(result, dict):
+            return result.get('TotalRecordCount', 0)
+        return None
     
     def _post(self, endpoint: str, params: Optional[Dict] = None, 
               json_data: Optional[Dict] = None, **kwargs) -> Optional[Any]:
-        """POST request"""
-        return self._request('POST', endpoint, params=params, json_data=json_data, **kwargs)
+        """POST request (invalidates cached responses of the resource)"""
+        result = self._request('POST', endpoint, params=params, json_data=json_data, **kwargs)
+        self.http.response_cache.invalidate(endpoint)
+        return result
     
     def _delete(self, endpoint: str, params: Optional[Dict] = None, **kwargs) -> Optional[Any]:
-        """DELETE request"""
-        return self._request('DELETE', endpoint, params=params, **kwargs)
+        """DELETE request (invalidates cached responses of the resource)"""
+        result = self._request('DELETE', endpoint, params=params, **kwargs)
+        self.http.response_cache.invalidate(endpoint)
+        return result
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Jellyfin API - Shared HTTP Connection Pool
+One keep-alive requests.Session shared by all API modules
+"""
+
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict
+
+from .request_stats import RequestStats
+from .response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Thread-safe pool hit/miss counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.new_connections = 0
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Get counters as dict (hits = reused keep-alive connections)"""
+        with self._lock:
+            return {
+                'requests': self.checkouts,
+                'hits': max(self.checkouts - self.new_connections, 0),
+                'misses': self.new_connections,
+            }
+
+
+class _CountingPoolMixin:
+    """Mixin for urllib3 connection pools that records checkouts and new connections"""
+
+    _pool_stats = None
+
+    def _get_conn(self, *args, **kwargs):
+        self._pool_stats.record_checkout()
+        return super()._get_conn(*args, **kwargs)
+
+    def _new_conn(self, *args, **kwargs):
+        self._pool_stats.record_new_connection()
+        return super()._new_conn(*args, **kwargs)
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host pools report to a PoolStats instance"""
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: type(f"Counting{cls.__name__}", (_CountingPoolMixin, cls),
+                         {'_pool_stats': self._stats})
+            for scheme, cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+class HTTPPool:
+    """
+    Shared keep-alive connection pool
+    pool_size: number of per-host pools kept open
+    max_per_host: max connections per host (blocks when exhausted)
+    response_cache: GET response cache shared by all modules (disabled if None)
+    """
+
+    def __init__(self, pool_size: int = 4, max_per_host: int = 10,
+                 response_cache: ResponseCache = None):
+        self.pool_size = pool_size
+        self.max_per_host = max_per_host
+        self.stats = PoolStats()
+        self.request_stats = RequestStats()
+        self.response_cache = response_cache or ResponseCache(enabled=False)
+        self.session = requests.Session()
+
+        adapter = _CountingAdapter(
+            self.stats,
+            pool_connections=pool_size,
+            pool_maxsize=max_per_host,
+            pool_block=True
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send request through the shared session"""
+        return self.session.request(method, url, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool hit/miss counters"""
+        stats = self.stats.snapshot()
+        stats['pool_size'] = self.pool_size
+        stats['max_per_host'] = self.max_per_host
+        return stats
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+# Default pool for modules created without an explicit pool
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_http_pool() -> HTTPPool:
+    """Get default HTTP pool singleton"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HTTPPool()
+        return _pool
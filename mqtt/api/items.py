@@ -5,7 +5,7 @@ Endpoints: 8
 - Items, ItemUpdate, ItemRefresh
 """
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from .base import JellyfinAPIBase
 
 
@@ -24,8 +24,8 @@ class ItemsAPI(JellyfinAPIBase):
                   sort_by: str = None, sort_order: str = None,
                   recursive: bool = None, search_term: str = None,
                   is_favorite: bool = None, is_played: bool = None,
-                  **kwargs) -> Optional[Dict]:
-        """GET /Items - Get items"""
+                  count_only: bool = False, **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /Items - Get items (count_only returns TotalRecordCount)"""
         params = {}
         if user_id:
             params['userId'] = user_id
@@ -52,12 +52,15 @@ class ItemsAPI(JellyfinAPIBase):
         if is_played is not None:
             params['isPlayed'] = is_played
         params.update({k: v for k, v in kwargs.items() if v is not None})
+        if count_only:
+            return self._get_count('/Items', params)
         return self._get('/Items', params)
     
     def get_resume_items(self, user_id: str = None, start_index: int = None,
                          limit: int = None, media_types: List[str] = None,
-                         parent_id: str = None) -> Optional[Dict]:
-        """GET /UserItems/Resume - Get resume items"""
+                         parent_id: str = None,
+                         count_only: bool = False) -> Optional[Union[Dict, int]]:
+        """GET /UserItems/Resume - Get resume items (count_only returns TotalRecordCount)"""
         params = {}
         if user_id:
             params['userId'] = user_id
@@ -69,6 +72,8 @@ class ItemsAPI(JellyfinAPIBase):
             params['mediaTypes'] = ','.join(media_types)
         if parent_id:
             params['parentId'] = parent_id
+        if count_only:
+            return self._get_count('/UserItems/Resume', params)
         return self._get('/UserItems/Resume', params)
     
     def get_user_item_data(self, item_id: str, user_id: str = None) -> Optional[Dict]:
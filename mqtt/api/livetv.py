@@ -5,7 +5,7 @@ Endpoints: 41
 - Channels, Programs, Recordings, Timers, Tuners, Listings
 """
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from .base import JellyfinAPIBase
 
 
@@ -33,14 +33,17 @@ class LiveTvAPI(JellyfinAPIBase):
     def get_livetv_channels(self, channel_type: str = None, user_id: str = None,
                             start_index: int = None, limit: int = None,
                             is_favorite: bool = None, is_liked: bool = None,
-                            is_disabled: bool = None, **kwargs) -> Optional[Dict]:
-        """GET /LiveTv/Channels - Get live TV channels"""
+                            is_disabled: bool = None, count_only: bool = False,
+                            **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /LiveTv/Channels - Get live TV channels (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'type': channel_type, 'userId': user_id,
             'startIndex': start_index, 'limit': limit,
             'isFavorite': is_favorite, 'isLiked': is_liked,
             'isDisabled': is_disabled, **kwargs
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/LiveTv/Channels', params)
         return self._get('/LiveTv/Channels', params)
     
     def get_livetv_channel(self, channel_id: str, user_id: str = None) -> Optional[Dict]:
@@ -67,14 +70,17 @@ class LiveTvAPI(JellyfinAPIBase):
     
     def get_livetv_programs(self, channel_ids: List[str] = None,
                             user_id: str = None, min_start_date: str = None,
-                            max_start_date: str = None, **kwargs) -> Optional[Dict]:
-        """GET /LiveTv/Programs - Get programs"""
+                            max_start_date: str = None, count_only: bool = False,
+                            **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /LiveTv/Programs - Get programs (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'userId': user_id, 'minStartDate': min_start_date,
             'maxStartDate': max_start_date, **kwargs
         }.items() if v is not None}
         if channel_ids:
             params['channelIds'] = ','.join(channel_ids)
+        if count_only:
+            return self._get_count('/LiveTv/Programs', params)
         return self._get('/LiveTv/Programs', params)
     
     def get_livetv_programs_post(self, body: Dict) -> Optional[Dict]:
@@ -106,13 +112,15 @@ class LiveTvAPI(JellyfinAPIBase):
     def get_livetv_recordings(self, channel_id: str = None, user_id: str = None,
                               start_index: int = None, limit: int = None,
                               status: str = None, is_in_progress: bool = None,
-                              **kwargs) -> Optional[Dict]:
-        """GET /LiveTv/Recordings - Get recordings"""
+                              count_only: bool = False, **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /LiveTv/Recordings - Get recordings (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'channelId': channel_id, 'userId': user_id,
             'startIndex': start_index, 'limit': limit,
             'status': status, 'isInProgress': is_in_progress, **kwargs
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/LiveTv/Recordings', params)
         return self._get('/LiveTv/Recordings', params)
     
     def get_livetv_recording(self, recording_id: str, user_id: str = None) -> Optional[Dict]:
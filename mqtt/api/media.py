@@ -5,7 +5,7 @@ Endpoints: ~25
 - Search, Artists, Genres, Studios, MusicGenres, Persons, TVShows, Movies, Collections
 """
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from .base import JellyfinAPIBase
 
 
@@ -57,18 +57,24 @@ class MediaAPI(JellyfinAPIBase):
     
     def get_artists(self, user_id: str = None, search_term: str = None,
                     parent_id: str = None, limit: int = None,
-                    start_index: int = None, **kwargs) -> Optional[Dict]:
-        """GET /Artists - Get all artists"""
+                    start_index: int = None, count_only: bool = False,
+                    **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /Artists - Get all artists (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'userId': user_id, 'searchTerm': search_term,
             'parentId': parent_id, 'limit': limit, 'startIndex': start_index,
             **kwargs
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/Artists', params)
         return self._get('/Artists', params)
     
-    def get_album_artists(self, user_id: str = None, **kwargs) -> Optional[Dict]:
-        """GET /Artists/AlbumArtists - Get all album artists"""
+    def get_album_artists(self, user_id: str = None, count_only: bool = False,
+                          **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /Artists/AlbumArtists - Get all album artists (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {'userId': user_id, **kwargs}.items() if v is not None}
+        if count_only:
+            return self._get_count('/Artists/AlbumArtists', params)
         return self._get('/Artists/AlbumArtists', params)
     
     def get_artist_by_name(self, name: str, user_id: str = None) -> Optional[Dict]:
@@ -81,12 +87,15 @@ class MediaAPI(JellyfinAPIBase):
     # =========================================================================
     
     def get_genres(self, user_id: str = None, start_index: int = None,
-                   limit: int = None, parent_id: str = None) -> Optional[Dict]:
-        """GET /Genres - Get all genres"""
+                   limit: int = None, parent_id: str = None,
+                   count_only: bool = False) -> Optional[Union[Dict, int]]:
+        """GET /Genres - Get all genres (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'userId': user_id, 'startIndex': start_index,
             'limit': limit, 'parentId': parent_id
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/Genres', params)
         return self._get('/Genres', params)
     
     def get_genre(self, genre_name: str, user_id: str = None) -> Optional[Dict]:
@@ -99,12 +108,15 @@ class MediaAPI(JellyfinAPIBase):
     # =========================================================================
     
     def get_music_genres(self, user_id: str = None, start_index: int = None,
-                         limit: int = None, parent_id: str = None) -> Optional[Dict]:
-        """GET /MusicGenres - Get music genres"""
+                         limit: int = None, parent_id: str = None,
+                         count_only: bool = False) -> Optional[Union[Dict, int]]:
+        """GET /MusicGenres - Get music genres (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'userId': user_id, 'startIndex': start_index,
             'limit': limit, 'parentId': parent_id
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/MusicGenres', params)
         return self._get('/MusicGenres', params)
     
     def get_music_genre(self, genre_name: str, user_id: str = None) -> Optional[Dict]:
@@ -117,12 +129,15 @@ class MediaAPI(JellyfinAPIBase):
     # =========================================================================
     
     def get_studios(self, user_id: str = None, start_index: int = None,
-                    limit: int = None, parent_id: str = None) -> Optional[Dict]:
-        """GET /Studios - Get studios"""
+                    limit: int = None, parent_id: str = None,
+                    count_only: bool = False) -> Optional[Union[Dict, int]]:
+        """GET /Studios - Get studios (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'userId': user_id, 'startIndex': start_index,
             'limit': limit, 'parentId': parent_id
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/Studios', params)
         return self._get('/Studios', params)
     
     def get_studio(self, name: str, user_id: str = None) -> Optional[Dict]:
@@ -135,11 +150,14 @@ class MediaAPI(JellyfinAPIBase):
     # =========================================================================
     
     def get_persons(self, user_id: str = None, start_index: int = None,
-                    limit: int = None, **kwargs) -> Optional[Dict]:
-        """GET /Persons - Get persons"""
+                    limit: int = None, count_only: bool = False,
+                    **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /Persons - Get persons (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'userId': user_id, 'startIndex': start_index, 'limit': limit, **kwargs
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/Persons', params)
         return self._get('/Persons', params)
     
     def get_person(self, name: str, user_id: str = None) -> Optional[Dict]:
@@ -154,14 +172,17 @@ class MediaAPI(JellyfinAPIBase):
     def get_next_up(self, user_id: str = None, start_index: int = None,
                     limit: int = None, parent_id: str = None,
                     enable_images: bool = None, enable_total_record_count: bool = None,
-                    disable_first_episode: bool = None, **kwargs) -> Optional[Dict]:
-        """GET /Shows/NextUp - Get next up episodes"""
+                    disable_first_episode: bool = None, count_only: bool = False,
+                    **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /Shows/NextUp - Get next up episodes (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'userId': user_id, 'startIndex': start_index, 'limit': limit,
             'parentId': parent_id, 'enableImages': enable_images,
             'enableTotalRecordCount': enable_total_record_count,
             'disableFirstEpisode': disable_first_episode, **kwargs
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/Shows/NextUp', params)
         return self._get('/Shows/NextUp', params)
     
     def get_upcoming_episodes(self, user_id: str = None, start_index: int = None,
@@ -240,11 +261,14 @@ class MediaAPI(JellyfinAPIBase):
     # =========================================================================
     
     def get_years(self, user_id: str = None, start_index: int = None,
-                  limit: int = None, **kwargs) -> Optional[Dict]:
-        """GET /Years - Get years"""
+                  limit: int = None, count_only: bool = False,
+                  **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /Years - Get years (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'userId': user_id, 'startIndex': start_index, 'limit': limit, **kwargs
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/Years', params)
         return self._get('/Years', params)
     
     def get_year(self, year: int, user_id: str = None) -> Optional[Dict]:
@@ -280,9 +304,12 @@ class MediaAPI(JellyfinAPIBase):
     # =========================================================================
     
     def get_trailers(self, user_id: str = None, start_index: int = None,
-                     limit: int = None, **kwargs) -> Optional[Dict]:
-        """GET /Trailers - Get trailers"""
+                     limit: int = None, count_only: bool = False,
+                     **kwargs) -> Optional[Union[Dict, int]]:
+        """GET /Trailers - Get trailers (count_only returns TotalRecordCount)"""
         params = {k: v for k, v in {
             'userId': user_id, 'startIndex': start_index, 'limit': limit, **kwargs
         }.items() if v is not None}
+        if count_only:
+            return self._get_count('/Trailers', params)
         return self._get('/Trailers', params)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Jellyfin API - Request Instrumentation
+Per-endpoint latency histograms, status codes, bytes and timeouts
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Latency buckets in seconds (upper bounds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path segments that are ids: GUIDs (with or without dashes), long hex, numbers
+_ID_SEGMENT = re.compile(r'^([0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}'
+                         r'|[0-9a-fA-F]{16,}|\d+)$')
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """Replace ids in an endpoint path with {id} to keep the number of series bounded"""
+    path = endpoint.split('?', 1)[0]
+    return '/'.join('{id}' if _ID_SEGMENT.match(seg) else seg for seg in path.split('/'))
+
+
+class Histogram:
+    """Fixed-bucket histogram (not thread-safe, callers lock)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Approximate percentile (upper bound of the bucket holding it)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, bound in enumerate(self.buckets):
+            seen += self.counts[i]
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """[(upper_bound, cumulative_count), ...] including +Inf"""
+        result = []
+        seen = 0
+        for bound, count in zip(list(self.buckets) + [float('inf')], self.counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+    def summary(self) -> Dict[str, float]:
+        """count, avg/p50/p95/max in milliseconds"""
+        return {
+            'count': self.count,
+            'avg_ms': round(self.sum / self.count * 1000, 1) if self.count else 0,
+            'p50_ms': round(self.percentile(0.5) * 1000, 1),
+            'p95_ms': round(self.percentile(0.95) * 1000, 1),
+            'max_ms': round(self.max * 1000, 1),
+        }
+
+
+class EndpointStats:
+    """Counters of one method + endpoint"""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.status_codes: Dict[str, int] = {}
+        self.bytes = 0
+        self.errors = 0
+        self.timeouts = 0
+
+
+class RequestStats:
+    """Thread-safe request instrumentation shared by all API modules"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+
+    def record(self, method: str, endpoint: str, seconds: float,
+               status: Optional[int] = None, size: int = 0,
+               timeout: bool = False, error: bool = False):
+        """Record one finished request"""
+        key = (method, normalize_endpoint(endpoint))
+        with self._lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = EndpointStats()
+            stats.latency.observe(seconds)
+            stats.bytes += size
+            if status is not None:
+                code = str(status)
+                stats.status_codes[code] = stats.status_codes.get(code, 0) + 1
+            if timeout:
+                stats.timeouts += 1
+            if error or timeout:
+                stats.errors += 1
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per "METHOD /endpoint" summary"""
+        with self._lock:
+            return {
+                f"{method} {endpoint}": dict(
+                    s.latency.summary(),
+                    bytes=s.bytes,
+                    errors=s.errors,
+                    timeouts=s.timeouts,
+                    status=dict(s.status_codes),
+                )
+                for (method, endpoint), s in self.endpoints.items()
+            }
+
+    def get_totals(self) -> Dict[str, float]:
+        """Totals over all endpoints"""
+        with self._lock:
+            count = sum(s.latency.count for s in self.endpoints.values())
+            total = sum(s.latency.sum for s in self.endpoints.values())
+            return {
+                'count': count,
+                'errors': sum(s.errors for s in self.endpoints.values()),
+                'timeouts': sum(s.timeouts for s in self.endpoints.values()),
+                'bytes': sum(s.bytes for s in self.endpoints.values()),
+                'avg_ms': round(total / count * 1000, 1) if count else 0,
+            }
+
+    def get_histograms(self) -> List[Tuple[str, str, List[Tuple[float, int]], float, int]]:
+        """[(method, endpoint, cumulative buckets, sum, count), ...] for exporters"""
+        with self._lock:
+            return [
+                (method, endpoint, s.latency.cumulative(), s.latency.sum, s.latency.count)
+                for (method, endpoint), s in self.endpoints.items()
+            ]
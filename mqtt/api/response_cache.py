@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Jellyfin API - Response Cache
+Short-TTL cache for GET responses with single-flight coalescing of
+identical concurrent requests and invalidation on POST/DELETE
+"""
+
+import time
+import threading
+import collections
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# TTL in seconds by endpoint prefix, longest match wins; endpoints without
+# a rule use the default TTL, which must stay below the shortest poll
+# interval. 0 = never cached, concurrent requests are still coalesced
+ENDPOINT_TTLS = {
+    '/Sessions': 0,
+    '/Users/Me': 3600,
+    '/System/Info/Public': 3600,
+}
+
+# Resources whose cached responses also change when another one is modified
+RELATED_RESOURCES = {
+    'Library': ('Items', 'Users', 'UserItems', 'UserViews'),
+    'Items': ('Library', 'Users', 'UserItems'),
+    'UserItems': ('Items', 'Users'),
+    'UserPlayedItems': ('Items', 'Users', 'UserItems'),
+    'UserFavoriteItems': ('Items', 'Users', 'UserItems'),
+}
+
+
+def _resource(endpoint: str) -> str:
+    """First path segment of an endpoint (/ScheduledTasks/Running/x -> ScheduledTasks)"""
+    return endpoint.lstrip('/').split('/', 1)[0].split('?', 1)[0]
+
+
+class _Flight:
+    """A GET in progress, followers wait for the leader's result"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class ResponseCache:
+    """
+    LRU cache of decoded GET responses, bounded by response bytes
+    Entries expire ttl seconds after their request was sent, so a poll never
+    sees the previous poll's response. Callers get the cached object itself
+    and must not modify it
+    """
+
+    def __init__(self, default_ttl: float = 0.5, max_bytes: int = 2 * 1024 * 1024,
+                 ttls: Optional[Dict[str, float]] = None, enabled: bool = True):
+        self.enabled = enabled
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.ttls = sorted((ttls if ttls is not None else ENDPOINT_TTLS).items(),
+                           key=lambda rule: len(rule[0]), reverse=True)
+        self._entries = collections.OrderedDict()   # key -> (result, size, expires)
+        self._flights: Dict[Tuple, _Flight] = {}
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(endpoint: str, params: Optional[Dict]) -> Tuple:
+        """Cache key of a request"""
+        return endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL of an endpoint"""
+        for prefix, ttl in self.ttls:
+            if endpoint == prefix or endpoint.startswith(prefix + '/'):
+                return ttl
+        return self.default_ttl
+
+    def fetch(self, endpoint: str, params: Optional[Dict],
+              load: Callable[[], Tuple[Any, int]], wait: float = 10) -> Any:
+        """
+        Cached result of a GET, load() returns (result, response_bytes)
+        Concurrent calls for the same key share one load(); failed loads
+        (None) are not cached
+        """
+        if not self.enabled:
+            return load()[0]
+
+        key = self.key(endpoint, params)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._drop(key)
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+                started = now
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait(wait)
+            return flight.result
+
+        result, size = None, 0
+        try:
+            result, size = load()
+            flight.result = result
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                ttl = self.ttl_for(endpoint)
+                # Skip results an invalidation raced with, they may predate the change
+                if (result is not None and ttl > 0 and generation == self._generation
+                        and size <= self.max_bytes):
+                    self._store(key, result, size, started + ttl)
+            flight.done.set()
+        return result
+
+    def _store(self, key, result, size, expires):
+        """Insert entry and evict least recently used ones over max_bytes (caller locks)"""
+        self._drop(key)
+        self._entries[key] = (result, size, expires)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def invalidate(self, endpoint: str):
+        """Drop cached responses of the endpoint's resource and related resources"""
+        if not self.enabled:
+            return
+        resource = _resource(endpoint)
+        resources = {resource, *RELATED_RESOURCES.get(resource, ())}
+        with self._lock:
+            self._generation += 1
+            stale = [key for key in self._entries if _resource(key[0]) in resources]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss/coalesce counters and memory use"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
@@ -14,8 +14,8 @@ class SystemAPI(JellyfinAPIBase):
     
     GROUP_NAME = 'system'
     
-    def __init__(self, base_url: str, api_key: str):
-        super().__init__(base_url, api_key)
+    def __init__(self, base_url: str, api_key: str, http_pool=None):
+        super().__init__(base_url, api_key, http_pool)
         self._server_info_cache = None
     
     # =========================================================================
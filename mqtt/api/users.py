@@ -14,10 +14,6 @@ class UsersAPI(JellyfinAPIBase):
     
     GROUP_NAME = 'users'
     
-    def __init__(self, base_url: str, api_key: str):
-        super().__init__(base_url, api_key)
-        self._user_id_cache = None
-    
     # =========================================================================
     # USER (14 endpoints)
     # =========================================================================
@@ -36,14 +32,9 @@ class UsersAPI(JellyfinAPIBase):
         return self._get('/Users/Me')
     
     def get_current_user_id(self) -> Optional[str]:
-        """Get current user ID (cached)"""
-        if self._user_id_cache:
-            return self._user_id_cache
+        """Get current user ID (/Users/Me is held by the response cache)"""
         me = self.get_current_user()
-        if me:
-            self._user_id_cache = me.get('Id')
-            return self._user_id_cache
-        return None
+        return me.get('Id') if isinstance(me, dict) else None
     
     def get_user(self, user_id: str) -> Optional[Dict]:
         """GET /Users/{userId} - Get user by ID"""
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Fake MQTT Broker
+Minimal MQTT 3.1.1/5 broker for benchmarks: retained messages, wildcard
+subscriptions, QoS 0/1/2 handshakes, v5 topic aliases and per-topic counters
+Not a conforming broker - no persistence, no QoS retries, no auth, other
+v5 properties are parsed and ignored
+"""
+
+import time
+import socket
+import struct
+import logging
+import threading
+import collections
+import socketserver
+
+logger = logging.getLogger(__name__)
+
+# Packet types
+CONNECT, CONNACK, PUBLISH, PUBACK, PUBREC, PUBREL, PUBCOMP = 1, 2, 3, 4, 5, 6, 7
+SUBSCRIBE, SUBACK, UNSUBSCRIBE, UNSUBACK, PINGREQ, PINGRESP, DISCONNECT = 8, 9, 10, 11, 12, 13, 14
+
+# MQTT 5 property ids by value size; string/binary ids carry a 2-byte length
+PROPERTY_SIZES = {
+    **dict.fromkeys((0x01, 0x17, 0x19, 0x24, 0x25, 0x28, 0x29, 0x2A), 1),
+    **dict.fromkeys((0x13, 0x21, 0x22, 0x23), 2),
+    **dict.fromkeys((0x02, 0x11, 0x18, 0x27), 4),
+}
+STRING_PROPERTIES = (0x03, 0x08, 0x09, 0x12, 0x15, 0x16, 0x1A, 0x1C, 0x1F)
+TOPIC_ALIAS, TOPIC_ALIAS_MAXIMUM, USER_PROPERTY, SUBSCRIPTION_ID = 0x23, 0x22, 0x26, 0x0B
+
+
+def topic_matches(pattern, topic):
+    """MQTT wildcard match (+ one level, # remaining levels)"""
+    pattern_parts = pattern.split('/')
+    topic_parts = topic.split('/')
+    for i, part in enumerate(pattern_parts):
+        if part == '#':
+            return True
+        if i >= len(topic_parts):
+            return False
+        if part != '+' and part != topic_parts[i]:
+            return False
+    return len(pattern_parts) == len(topic_parts)
+
+
+def _encode_length(length):
+    encoded = bytearray()
+    while True:
+        byte = length % 128
+        length //= 128
+        encoded.append(byte | 0x80 if length else byte)
+        if not length:
+            return bytes(encoded)
+
+
+def _string(data, offset):
+    (length,) = struct.unpack_from('!H', data, offset)
+    return data[offset + 2:offset + 2 + length].decode('utf-8'), offset + 2 + length
+
+
+def _varint(data, offset):
+    value, multiplier = 0, 1
+    while True:
+        byte = data[offset]
+        offset += 1
+        value += (byte & 0x7F) * multiplier
+        multiplier *= 128
+        if not byte & 0x80:
+            return value, offset
+
+
+def _properties(data, offset):
+    """MQTT 5 property block as {id: int or bytes} (user properties skipped)"""
+    length, offset = _varint(data, offset)
+    end = offset + length
+    properties = {}
+    while offset < end:
+        prop = data[offset]
+        offset += 1
+        if prop in PROPERTY_SIZES:
+            size = PROPERTY_SIZES[prop]
+            properties[prop] = int.from_bytes(data[offset:offset + size], 'big')
+            offset += size
+        elif prop in STRING_PROPERTIES:
+            (size,) = struct.unpack_from('!H', data, offset)
+            properties[prop] = data[offset + 2:offset + 2 + size]
+            offset += 2 + size
+        elif prop == USER_PROPERTY:
+            _, offset = _string(data, offset)
+            _, offset = _string(data, offset)
+        elif prop == SUBSCRIPTION_ID:
+            properties[prop], offset = _varint(data, offset)
+        else:
+            raise ConnectionError(f"Malformed property 0x{prop:02x}")
+    return properties, end
+
+
+def _packet(packet_type, flags, body):
+    return bytes([packet_type << 4 | flags]) + _encode_length(len(body)) + body
+
+
+class BrokerStats:
+    """Counters of everything clients published"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.publishes = 0
+        self.bytes = 0
+        self.wire_bytes = 0
+        self.aliased = 0
+        self.retained = 0
+        self.discovery_removed = 0
+        self.deliveries = 0
+        self.subscribes = 0
+        self.connects = 0
+        self.topics = collections.Counter()
+
+    def record(self, topic, payload, retain, wire_bytes=0, aliased=False):
+        with self._lock:
+            self.publishes += 1
+            self.bytes += len(topic) + len(payload)
+            self.wire_bytes += wire_bytes
+            self.aliased += aliased
+            self.topics[topic] += 1
+            if retain:
+                self.retained += 1
+            if not payload and topic.startswith('homeassistant/'):
+                self.discovery_removed += 1
+
+    def snapshot(self):
+        """Copy of the counters for delta computations"""
+        with self._lock:
+            return {
+                'publishes': self.publishes,
+                'bytes': self.bytes,
+                'wire_bytes': self.wire_bytes,
+                'aliased': self.aliased,
+                'retained': self.retained,
+                'deliveries': self.deliveries,
+                'subscribes': self.subscribes,
+                'connects': self.connects,
+                'discovery': sum(n for t, n in self.topics.items() if t.startswith('homeassistant/')),
+                'discovery_removed': self.discovery_removed,
+                'topics': len(self.topics),
+            }
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class FakeBroker:
+    """Threaded TCP MQTT broker"""
+
+    def __init__(self, host='127.0.0.1', port=0, v5=True, topic_alias_maximum=100):
+        self.host = host
+        self.port = port
+        self.v5 = v5
+        self.topic_alias_maximum = topic_alias_maximum
+        self.stats = BrokerStats()
+        self.retained = {}
+        self.listeners = []
+        self._clients = {}
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Broker state
+    # ------------------------------------------------------------------
+
+    def retain(self, topic, payload):
+        """Store (or clear with empty payload) a retained message"""
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        with self._lock:
+            if payload:
+                self.retained[topic] = payload
+            else:
+                self.retained.pop(topic, None)
+
+    def route(self, topic, payload, sender=None):
+        """Forward a message to every matching subscriber except the sender"""
+        with self._lock:
+            targets = [
+                client for client in self._clients.values()
+                if client is not sender and any(topic_matches(p, topic) for p in client.subscriptions)
+            ]
+        for client in targets:
+            client.deliver(topic, payload)
+
+    def inject(self, topic, payload, retain=False):
+        """Publish a message from the test side"""
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        if retain:
+            self.retain(topic, payload)
+        self.route(topic, payload)
+
+    def outage(self, seconds):
+        """Drop all clients and refuse connects for a while (broker restart)"""
+        with self._lock:
+            self._down_until = time.monotonic() + seconds
+            clients = list(self._clients.values())
+        for client in clients:
+            try:
+                client.request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+
+    def _handler(self):
+        broker = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def setup(self):
+                self.subscriptions = set()
+                self.send_lock = threading.Lock()
+                self.client_id = None
+                self.version = 4
+                self.aliases = {}
+
+            def send(self, data):
+                with self.send_lock:
+                    try:
+                        self.request.sendall(data)
+                    except OSError:
+                        pass
+
+            def deliver(self, topic, payload, retain=False):
+                topic_bytes = topic.encode('utf-8')
+                properties = b'\x00' if self.version == 5 else b''
+                body = struct.pack('!H', len(topic_bytes)) + topic_bytes + properties + payload
+                self.send(_packet(PUBLISH, 1 if retain else 0, body))
+                with broker.stats._lock:
+                    broker.stats.deliveries += 1
+
+            def _read_exact(self, size):
+                data = b''
+                while len(data) < size:
+                    chunk = self.request.recv(size - len(data))
+                    if not chunk:
+                        raise ConnectionError
+                    data += chunk
+                return data
+
+            def _read_packet(self):
+                header = self._read_exact(1)[0]
+                length, multiplier = 0, 1
+                while True:
+                    byte = self._read_exact(1)[0]
+                    length += (byte & 0x7F) * multiplier
+                    multiplier *= 128
+                    if not byte & 0x80:
+                        break
+                return header >> 4, header & 0x0F, self._read_exact(length) if length else b''
+
+            def handle(self):
+                try:
+                    while True:
+                        packet_type, flags, body = self._read_packet()
+                        if packet_type == DISCONNECT:
+                            break
+                        self.dispatch(packet_type, flags, body)
+                except (ConnectionError, OSError):
+                    pass
+                finally:
+                    with broker._lock:
+                        if broker._clients.get(self.client_id) is self:
+                            del broker._clients[self.client_id]
+
+            def dispatch(self, packet_type, flags, body):
+                if packet_type == CONNECT:
+                    _, offset = _string(body, 0)
+                    self.version = body[offset]
+                    offset += 4  # protocol level, connect flags, keepalive
+                    if self.version == 5:
+                        if not broker.v5:
+                            self.send(_packet(CONNACK, 0, b'\x00\x01'))   # unacceptable protocol version
+                            raise ConnectionError
+                        _, offset = _properties(body, offset)
+                    client_id, _ = _string(body, offset)
+                    self.client_id = client_id or str(id(self))
+                    with broker._lock:
+                        down = time.monotonic() < broker._down_until
+                    if down:
+                        # Server unavailable (3.1.1 code 3, v5 reason 0x88)
+                        self.send(_packet(CONNACK, 0, b'\x00\x88\x00' if self.version == 5 else b'\x00\x03'))
+                        raise ConnectionError
+                    with broker._lock:
+                        broker._clients[self.client_id] = self
+                    with broker.stats._lock:
+                        broker.stats.connects += 1
+                    properties = b''
+                    if self.version == 5:
+                        properties = bytes([3, TOPIC_ALIAS_MAXIMUM]) + struct.pack('!H', broker.topic_alias_maximum)
+                    self.send(_packet(CONNACK, 0, b'\x00\x00' + properties))
+                elif packet_type == PUBLISH:
+                    qos = flags >> 1 & 0x03
+                    retain = bool(flags & 0x01)
+                    topic, offset = _string(body, 0)
+                    packet_id = None
+                    if qos:
+                        (packet_id,) = struct.unpack_from('!H', body, offset)
+                        offset += 2
+                    aliased = False
+                    if self.version == 5:
+                        properties, offset = _properties(body, offset)
+                        alias = properties.get(TOPIC_ALIAS)
+                        if alias and not 0 < alias <= broker.topic_alias_maximum:
+                            raise ConnectionError(f"Topic alias {alias} out of range")
+                        if alias and topic:
+                            self.aliases[alias] = topic
+                        elif alias:
+                            topic, aliased = self.aliases[alias], True
+                    payload = body[offset:]
+                    broker.stats.record(topic, payload, retain, wire_bytes=len(_packet(PUBLISH, flags, body)),
+                                        aliased=aliased)
+                    for listener in broker.listeners:
+                        listener(topic, payload)
+                    if retain:
+                        broker.retain(topic, payload)
+                    broker.route(topic, payload, sender=self)
+                    if qos == 1:
+                        self.send(_packet(PUBACK, 0, struct.pack('!H', packet_id)))
+                    elif qos == 2:
+                        self.send(_packet(PUBREC, 0, struct.pack('!H', packet_id)))
+                elif packet_type == PUBREL:
+                    self.send(_packet(PUBCOMP, 0, body[:2]))
+                elif packet_type == SUBSCRIBE:
+                    (packet_id,) = struct.unpack_from('!H', body, 0)
+                    offset, granted, patterns = 2, bytearray(), []
+                    if self.version == 5:
+                        _, offset = _properties(body, offset)
+                    while offset < len(body):
+                        pattern, offset = _string(body, offset)
+                        granted.append(min(body[offset] & 0x03, 1))
+                        offset += 1
+                        patterns.append(pattern)
+                    self.subscriptions.update(patterns)
+                    with broker.stats._lock:
+                        broker.stats.subscribes += len(patterns)
+                    properties = b'\x00' if self.version == 5 else b''
+                    self.send(_packet(SUBACK, 0, struct.pack('!H', packet_id) + properties + bytes(granted)))
+                    with broker._lock:
+                        retained = [(t, p) for t, p in broker.retained.items()
+                                    if any(topic_matches(pat, t) for pat in patterns)]
+                    for topic, payload in retained:
+                        self.deliver(topic, payload, retain=True)
+                elif packet_type == UNSUBSCRIBE:
+                    (packet_id,) = struct.unpack_from('!H', body, 0)
+                    offset, removed = 2, 0
+                    if self.version == 5:
+                        _, offset = _properties(body, offset)
+                    while offset < len(body):
+                        pattern, offset = _string(body, offset)
+                        self.subscriptions.discard(pattern)
+                        removed += 1
+                    reasons = b'\x00' + bytes(removed) if self.version == 5 else b''
+                    self.send(_packet(UNSUBACK, 0, struct.pack('!H', packet_id) + reasons))
+                elif packet_type == PINGREQ:
+                    self.send(_packet(PINGRESP, 0, b''))
+
+        return Handler
+
+    def start(self):
+        """Start accepting connections in a background thread"""
+        self._server = _Server((self.host, self.port), self._handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-broker', daemon=True)
+        self._thread.start()
+        logger.info("Fake MQTT broker on %s:%d", self.host, self.port)
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
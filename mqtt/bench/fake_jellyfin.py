@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Fake Jellyfin Server
+Serves fixture payloads for the endpoints the bridge polls, with tunable
+session count, library size and injected latency, and a /socket WebSocket
+that pushes Sessions and ScheduledTasksInfo like the real event stream
+"""
+
+import json
+import time
+import base64
+import random
+import socket
+import struct
+import hashlib
+import logging
+import threading
+import collections
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench import fixtures
+
+logger = logging.getLogger(__name__)
+
+# Endpoints that return a JSON array instead of a QueryResult
+LIST_ENDPOINTS = {
+    '/Environment/Drives', '/Items/Latest', '/Library/VirtualFolders', '/Plugins',
+    '/SyncPlay/List', '/System/Logs', '/Users',
+}
+
+EMPTY_RESULT = {'Items': [], 'TotalRecordCount': 0, 'StartIndex': 0}
+
+# RFC 6455 handshake key suffix and the opcodes the fake handles
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+WS_TEXT, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+def _query_int(query, name, default):
+    """Case-insensitive integer query parameter"""
+    for key, values in query.items():
+        if key.lower() == name.lower():
+            try:
+                return int(values[0])
+            except (ValueError, IndexError):
+                return default
+    return default
+
+
+def _ws_frame(opcode, payload=b''):
+    """Unmasked, unfragmented server frame"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def _ws_read_frame(rfile):
+    """(opcode, payload) of the next client frame, None once the peer is gone"""
+    head = rfile.read(2)
+    if len(head) < 2:
+        return None
+    opcode, length = head[0] & 0x0F, head[1] & 0x7F
+    if length == 126:
+        (length,) = struct.unpack('!H', rfile.read(2))
+    elif length == 127:
+        (length,) = struct.unpack('!Q', rfile.read(8))
+    mask = rfile.read(4) if head[1] & 0x80 else b''
+    payload = rfile.read(length)
+    if len(payload) < length:
+        return None
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+class _EventSocket:
+    """
+    One /socket connection: the feeds it started and a lock so that pushes
+    from other threads do not interleave with replies
+    """
+
+    def __init__(self, handler):
+        self.connection = handler.connection
+        self.wfile = handler.wfile
+        self.feeds = set()
+        self._lock = threading.Lock()
+
+    def send(self, message_type, data=None):
+        message = {'MessageType': message_type}
+        if data is not None:
+            message['Data'] = data
+        return self.send_frame(WS_TEXT, json.dumps(message).encode('utf-8'))
+
+    def send_frame(self, opcode, payload=b''):
+        try:
+            with self._lock:
+                self.wfile.write(_ws_frame(opcode, payload))
+            return True
+        except OSError:
+            return False
+
+    def close(self):
+        """Drop the connection the way a restarting server would"""
+        self.send_frame(WS_CLOSE, struct.pack('!H', 1001))
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class FakeJellyfin:
+    """
+    Threaded HTTP server mimicking the parts of the Jellyfin API the bridge uses
+    Fixtures are generated once and deterministic for a given seed. /socket
+    clients get ForceKeepAlive on connect, the current state when they send
+    SessionsStart/ScheduledTasksInfoStart and then Sessions on every
+    set_sessions(); no fragmentation, no auth
+    """
+
+    def __init__(self, sessions=10, library_size=5000, persons=2000, tasks=20, users=7,
+                 libraries=5, transcode_ratio=0.3, latency_ms=0, jitter_ms=0, seed=1,
+                 keepalive_timeout=60, host='127.0.0.1', port=0):
+        self.host = host
+        self.port = port
+        self.library_size = library_size
+        self.persons = persons
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.keepalive_timeout = keepalive_timeout
+        self.hits = collections.Counter()
+        self.bytes_sent = 0
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._sockets = set()
+        self.socket_messages = collections.deque(maxlen=1000)   # (MessageType, Data) received on /socket
+
+        self.system_info = fixtures.make_system_info()
+        self.users = [fixtures.make_user(i) for i in range(users)]
+        self.libraries = [fixtures.make_library(i) for i in range(libraries)]
+        self.tasks = [fixtures.make_task(i, running=i % 7 == 3, progress=42.5) for i in range(tasks)]
+        self._items = {}
+        self._sessions = []
+        self._sessions_since = time.monotonic()
+        self.set_sessions([
+            fixtures.make_session(i, playing=i % 5 != 4, paused=i % 6 == 5,
+                                  transcoding=self.rng.random() < transcode_ratio,
+                                  position_ratio=self.rng.random())
+            for i in range(sessions)
+        ])
+
+    # ------------------------------------------------------------------
+    # Mutable state
+    # ------------------------------------------------------------------
+
+    def set_sessions(self, sessions):
+        """Replace the list served on /Sessions (used by churn scenarios)"""
+        with self._lock:
+            self._sessions = list(sessions)
+            self._sessions_since = time.monotonic()
+        if self.socket_count():
+            self.push('Sessions', self.get_sessions(), feed='Sessions')
+
+    def get_sessions(self):
+        """Current sessions, positions of unpaused playback advance in real time"""
+        with self._lock:
+            sessions, since = list(self._sessions), self._sessions_since
+        elapsed = int((time.monotonic() - since) * fixtures.TICKS_PER_SECOND)
+        result = []
+        for session in sessions:
+            play_state = session.get('PlayState') or {}
+            if 'PositionTicks' in play_state and not play_state.get('IsPaused'):
+                runtime = (session.get('NowPlayingItem') or {}).get('RunTimeTicks') or 1
+                play_state = dict(play_state, PositionTicks=(play_state['PositionTicks'] + elapsed) % runtime)
+                session = dict(session, PlayState=play_state)
+            result.append(session)
+        return result
+
+    def snapshot(self):
+        """Request and response byte counters for delta computations"""
+        return {
+            'requests': sum(self.hits.values()),
+            'bytes': self.bytes_sent,
+            'endpoints': dict(self.hits),
+            'sockets': self.socket_count(),
+        }
+
+    # ------------------------------------------------------------------
+    # Event stream (/socket)
+    # ------------------------------------------------------------------
+
+    def socket_count(self):
+        with self._lock:
+            return len(self._sockets)
+
+    def push(self, message_type, data=None, feed=None):
+        """Send a message to every socket (that started feed), returns how many got it"""
+        with self._lock:
+            sockets = [s for s in self._sockets if feed is None or feed in s.feeds]
+        return sum(s.send(message_type, data) for s in sockets)
+
+    def close_sockets(self):
+        """Close all event stream connections, returns how many were open"""
+        with self._lock:
+            sockets = list(self._sockets)
+        for ws in sockets:
+            ws.close()
+        return len(sockets)
+
+    def _feed(self, name):
+        """Current payload of a periodic feed, None for feeds the fake does not serve"""
+        if name == 'Sessions':
+            return self.get_sessions()
+        if name == 'ScheduledTasksInfo':
+            return self.tasks
+        return None
+
+    def _on_socket_message(self, ws, message):
+        message_type = message.get('MessageType') or ''
+        self.socket_messages.append((message_type, message.get('Data')))
+        if message_type.endswith('Start'):
+            name = message_type[:-len('Start')]
+            ws.feeds.add(name)
+            data = self._feed(name)
+            if data is not None:
+                ws.send(name, data)
+        elif message_type.endswith('Stop'):
+            ws.feeds.discard(message_type[:-len('Stop')])
+
+    def _serve_socket(self, handler):
+        """Upgrade the request to a WebSocket and serve it until either side closes"""
+        key = handler.headers.get('Sec-WebSocket-Key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode('ascii')).digest()).decode('ascii')
+        handler.send_response(101, 'Switching Protocols')
+        handler.send_header('Upgrade', 'websocket')
+        handler.send_header('Connection', 'Upgrade')
+        handler.send_header('Sec-WebSocket-Accept', accept)
+        handler.end_headers()
+        handler.close_connection = True
+
+        ws = _EventSocket(handler)
+        with self._lock:
+            self._sockets.add(ws)
+        try:
+            ws.send('ForceKeepAlive', self.keepalive_timeout)
+            while True:
+                frame = _ws_read_frame(handler.rfile)
+                if frame is None:
+                    break
+                opcode, payload = frame
+                if opcode == WS_CLOSE:
+                    ws.send_frame(WS_CLOSE, payload[:2])
+                    break
+                if opcode == WS_PING:
+                    ws.send_frame(WS_PONG, payload)
+                elif opcode == WS_TEXT:
+                    try:
+                        self._on_socket_message(ws, json.loads(payload))
+                    except ValueError:
+                        logger.debug("Fake Jellyfin: invalid socket message %r", payload[:200])
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._sockets.discard(ws)
+
+    def _item(self, index):
+        item = self._items.get(index)
+        if item is None:
+            item = self._items[index] = fixtures.make_item(index, 'Episode' if index % 3 else 'Movie')
+        return item
+
+    def _page(self, query, total, make):
+        start = max(0, _query_int(query, 'startIndex', 0))
+        limit = _query_int(query, 'limit', 100)
+        limit = max(0, min(limit, total - start))
+        return {
+            'Items': [make(i) for i in range(start, start + limit)],
+            'TotalRecordCount': total,
+            'StartIndex': start,
+        }
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def route(self, method, path, query):
+        """Return (status, payload) for a request"""
+        if method != 'GET':
+            return 204, None
+        if path == '/System/Ping':
+            return 200, 'Jellyfin Server'
+        if path in ('/System/Info', '/System/Info/Public'):
+            return 200, self.system_info
+        if path == '/Sessions':
+            return 200, self.get_sessions()
+        if path == '/ScheduledTasks':
+            return 200, self.tasks
+        if path == '/Users':
+            return 200, self.users
+        if path == '/Library/VirtualFolders':
+            return 200, self.libraries
+        if path == '/Items':
+            return 200, self._page(query, self.library_size, self._item)
+        if path == '/Persons':
+            return 200, self._page(query, self.persons, fixtures.make_person)
+        if path in ('/Items/Latest',):
+            return 200, [self._item(i) for i in range(min(_query_int(query, 'limit', 20), self.library_size))]
+        if path in ('/UserItems/Resume', '/Shows/NextUp'):
+            return 200, self._page(query, min(50, self.library_size), self._item)
+        if path == '/Items/Counts':
+            return 200, {'MovieCount': self.library_size // 3, 'EpisodeCount': self.library_size - self.library_size // 3,
+                         'SeriesCount': self.library_size // 60, 'SongCount': 0, 'AlbumCount': 0, 'ArtistCount': 0}
+        if path == '/QuickConnect/Enabled':
+            return 200, False
+        if path in LIST_ENDPOINTS:
+            return 200, []
+        return 200, EMPTY_RESULT
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately, avoid delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def _serve(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                server.hits[url.path] += 1
+                if url.path == '/socket' and self.headers.get('Upgrade', '').lower() == 'websocket':
+                    server._serve_socket(self)
+                    return
+                if server.latency_ms or server.jitter_ms:
+                    time.sleep((server.latency_ms + server.rng.uniform(0, server.jitter_ms)) / 1000)
+                status, payload = server.route(self.command, url.path, parse_qs(url.query))
+                body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+                server.bytes_sent += len(body)
+
+            do_GET = do_POST = do_DELETE = _serve
+
+            def log_message(self, format, *args):
+                logger.debug("Fake Jellyfin: " + format, *args)
+
+        return Handler
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-jellyfin', daemon=True)
+        self._thread.start()
+        logger.info("Fake Jellyfin on %s (%d sessions, %d items)", self.url, len(self._sessions), self.library_size)
+        return self
+
+    def stop(self):
+        self.close_sockets()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark Fixtures
+Deterministic, realistically shaped Jellyfin API payloads
+"""
+
+import random
+import hashlib
+
+TICKS_PER_SECOND = 10_000_000
+
+CLIENTS = [
+    ('Jellyfin Web', 'Firefox', '10.9.11'),
+    ('Jellyfin Android', 'Pixel 8', '2.6.1'),
+    ('Jellyfin Media Player', 'Living Room PC', '1.11.1'),
+    ('Infuse', 'Apple TV', '7.8.2'),
+    ('Swiftfin', 'iPad', '1.1'),
+    ('Kodi', 'Bedroom Kodi', '0.7.11'),
+]
+
+TRANSCODE_PROFILES = [
+    ('h264', 'aac', 'ts', 'NVENC', 8_000_000, 1920, 1080),
+    ('hevc', 'aac', 'mp4', 'NVENC', 12_000_000, 3840, 2160),
+    ('h264', 'mp3', 'ts', None, 4_000_000, 1280, 720),
+]
+
+
+def make_id(*parts):
+    """Stable 32 hex char id like Jellyfin's N-formatted GUIDs"""
+    return hashlib.md5('/'.join(str(p) for p in parts).encode()).hexdigest()
+
+
+def make_item(index, item_type='Movie', server_id='benchserver'):
+    """BaseItemDto as returned by /Items"""
+    rng = random.Random(index)
+    runtime = rng.randint(20, 180) * 60 * TICKS_PER_SECOND
+    item = {
+        'Name': f"{item_type} {index}",
+        'ServerId': server_id,
+        'Id': make_id('item', index),
+        'Path': f"/media/{item_type.lower()}s/{item_type} {index}/{item_type} {index}.mkv",
+        'Container': 'mkv',
+        'Type': item_type,
+        'MediaType': 'Video',
+        'IsFolder': False,
+        'RunTimeTicks': runtime,
+        'ProductionYear': 1970 + index % 55,
+        'CommunityRating': round(rng.uniform(4, 9), 1),
+        'OfficialRating': rng.choice(['PG', 'PG-13', 'R', 'TV-MA']),
+        'HasSubtitles': rng.random() < 0.6,
+        'ImageTags': {'Primary': make_id('img', index)},
+        'BackdropImageTags': [make_id('backdrop', index)],
+        'LocationType': 'FileSystem',
+        'UserData': {
+            'PlaybackPositionTicks': 0,
+            'PlayCount': rng.randint(0, 5),
+            'IsFavorite': rng.random() < 0.1,
+            'Played': rng.random() < 0.4,
+            'Key': make_id('key', index),
+        },
+    }
+    if item_type == 'Episode':
+        item.update({
+            'SeriesName': f"Series {index // 20}",
+            'SeriesId': make_id('series', index // 20),
+            'ParentIndexNumber': index % 20 // 10 + 1,
+            'IndexNumber': index % 10 + 1,
+        })
+    return item
+
+
+def make_session(index, playing=True, paused=False, transcoding=False, position_ratio=0.3):
+    """SessionInfo as returned by /Sessions"""
+    client, device, version = CLIENTS[index % len(CLIENTS)]
+    user_index = index % 7
+    session = {
+        'Id': make_id('session', index),
+        'UserId': make_id('user', user_index),
+        'UserName': f"user{user_index}",
+        'Client': client,
+        'DeviceName': f"{device} {index}",
+        'DeviceId': make_id('device', index),
+        'ApplicationVersion': version,
+        'LastActivityDate': '2024-01-01T12:00:00.0000000Z',
+        'LastPlaybackCheckIn': '2024-01-01T12:00:00.0000000Z',
+        'IsActive': True,
+        'SupportsMediaControl': True,
+        'SupportsRemoteControl': True,
+        'PlayableMediaTypes': ['Audio', 'Video'],
+        'ServerId': 'benchserver',
+        'PlayState': {
+            'CanSeek': True,
+            'IsPaused': paused,
+            'IsMuted': False,
+            'VolumeLevel': 100,
+            'RepeatMode': 'RepeatNone',
+            'PlaybackOrder': 'Default',
+        },
+        'Capabilities': {'PlayableMediaTypes': ['Audio', 'Video'], 'SupportsMediaControl': True},
+        'AdditionalUsers': [],
+    }
+    if playing:
+        item = make_item(index, 'Episode' if index % 2 else 'Movie')
+        session['NowPlayingItem'] = item
+        session['PlayState'].update({
+            'PositionTicks': int(item['RunTimeTicks'] * position_ratio),
+            'AudioStreamIndex': 1,
+            'SubtitleStreamIndex': -1,
+            'MediaSourceId': item['Id'],
+            'PlayMethod': 'Transcode' if transcoding else 'DirectPlay',
+        })
+    if playing and transcoding:
+        video, audio, container, hw, bitrate, width, height = TRANSCODE_PROFILES[index % len(TRANSCODE_PROFILES)]
+        session['TranscodingInfo'] = {
+            'AudioCodec': audio,
+            'VideoCodec': video,
+            'Container': container,
+            'IsVideoDirect': False,
+            'IsAudioDirect': False,
+            'Bitrate': bitrate,
+            'Framerate': 23.976,
+            'CompletionPercentage': round(position_ratio * 100 + 5, 1),
+            'Width': width,
+            'Height': height,
+            'AudioChannels': 2,
+            'HardwareAccelerationType': hw,
+            'TranscodeReasons': ['VideoCodecNotSupported'],
+        }
+    return session
+
+
+def make_task(index, running=False, progress=0.0):
+    """TaskInfo as returned by /ScheduledTasks"""
+    names = ['Scan Media Library', 'Extract Chapter Images', 'Refresh People', 'Clean Cache Directory',
+             'Clean Log Directory', 'Download missing subtitles', 'Optimize database', 'Generate Trickplay Images',
+             'Refresh Guide', 'Update Plugins', 'Clean Transcode Directory', 'Keyframe Extractor']
+    name = names[index % len(names)] + (f" {index // len(names)}" if index >= len(names) else '')
+    task = {
+        'Name': name,
+        'State': 'Running' if running else 'Idle',
+        'Id': make_id('task', index),
+        'Key': name.replace(' ', ''),
+        'Category': 'Library' if index % 3 else 'Maintenance',
+        'Description': f"{name} task",
+        'IsHidden': False,
+        'LastExecutionResult': {
+            'StartTimeUtc': '2024-01-01T03:00:00.0000000Z',
+            'EndTimeUtc': '2024-01-01T03:05:00.0000000Z',
+            'Status': 'Completed',
+            'Name': name,
+            'Key': name.replace(' ', ''),
+            'Id': make_id('task', index),
+        },
+        'Triggers': [{'Type': 'IntervalTrigger', 'IntervalTicks': 864000000000}],
+    }
+    if running:
+        task['CurrentProgressPercentage'] = progress
+    return task
+
+
+def make_person(index):
+    """BaseItemDto of a person as returned by /Persons"""
+    return {
+        'Name': f"Person {index}",
+        'ServerId': 'benchserver',
+        'Id': make_id('person', index),
+        'Type': 'Person',
+        'ImageTags': {'Primary': make_id('person-img', index)},
+        'LocationType': 'FileSystem',
+    }
+
+
+def make_user(index):
+    """UserDto as returned by /Users"""
+    return {
+        'Name': f"user{index}",
+        'ServerId': 'benchserver',
+        'Id': make_id('user', index),
+        'HasPassword': True,
+        'LastLoginDate': '2024-01-01T12:00:00.0000000Z',
+        'LastActivityDate': '2024-01-01T12:00:00.0000000Z',
+        'Policy': {'IsAdministrator': index == 0, 'IsDisabled': False, 'EnableRemoteAccess': True},
+        'Configuration': {'PlayDefaultAudioTrack': True, 'SubtitleMode': 'Default'},
+    }
+
+
+def make_library(index):
+    """VirtualFolderInfo as returned by /Library/VirtualFolders"""
+    kinds = ['movies', 'tvshows', 'music', 'books', 'homevideos']
+    kind = kinds[index % len(kinds)]
+    return {
+        'Name': f"{kind.title()} {index}",
+        'Locations': [f"/media/{kind}{index}"],
+        'CollectionType': kind,
+        'ItemId': make_id('library', index),
+        'RefreshStatus': 'Idle',
+        'LibraryOptions': {'EnablePhotos': True, 'EnableRealtimeMonitor': True},
+    }
+
+
+def make_system_info():
+    """SystemInfo as returned by /System/Info"""
+    return {
+        'ServerName': 'bench',
+        'Version': '10.9.11',
+        'Id': 'benchserver',
+        'OperatingSystem': 'Linux',
+        'ProductName': 'Jellyfin Server',
+        'HasPendingRestart': False,
+        'IsShuttingDown': False,
+        'SupportsLibraryMonitor': True,
+        'WebSocketPortNumber': 8096,
+        'CanSelfRestart': True,
+        'CanLaunchWebBrowser': False,
+        'HasUpdateAvailable': False,
+        'TranscodingTempPath': '/config/transcodes',
+        'LogPath': '/config/log',
+        'InternalMetadataPath': '/config/metadata',
+        'CachePath': '/cache',
+    }
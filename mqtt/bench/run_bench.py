@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+End-to-end Benchmark
+Runs MQTTBridge against a fake Jellyfin server and a fake MQTT broker and
+reports cycle latency, messages and bytes per cycle, CPU and RSS
+
+Usage (from the mqtt/ directory):
+    python -m bench.run_bench --sessions 50 --duration 20
+    python -m bench.run_bench --scenario churn --sessions 200
+    python -m bench.run_bench --scenario churn --events
+    python -m bench.run_bench --baseline bench/baseline.json
+    python -m bench.run_bench --save-baseline bench/baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import resource
+import tempfile
+import threading
+import multiprocessing
+
+logger = logging.getLogger('bench')
+
+# Metrics compared against the baseline (all lower-is-better)
+COMPARED_METRICS = (
+    'poll_ms_per_cycle',
+    'messages_per_cycle',
+    'bytes_per_cycle',
+    'requests_per_cycle',
+    'cpu_ms_per_cycle',
+    'rss_mb',
+    'startup_messages',
+    'discovery_per_cycle',
+    'state_latency_p95_ms',
+)
+
+# Absolute slack so tiny values (e.g. 0.4ms) do not fail on noise
+ABSOLUTE_SLACK = {
+    'poll_ms_per_cycle': 5.0,
+    'cpu_ms_per_cycle': 5.0,
+    'rss_mb': 2.0,
+    'messages_per_cycle': 1.0,
+    'bytes_per_cycle': 256,
+    'requests_per_cycle': 1.0,
+    'startup_messages': 5,
+    'discovery_per_cycle': 1.0,
+    'state_latency_p95_ms': 250,
+}
+
+# Default population per scenario
+DEFAULT_SESSIONS = {'steady': 20, 'churn': 200}
+
+
+# =============================================================================
+# FAKE SERVERS (child process)
+# =============================================================================
+
+def _serve(conn, jellyfin_options, churn_options):
+    """Child process: run fake Jellyfin and broker, answer calls over the pipe"""
+    from bench.fake_broker import FakeBroker
+    from bench.fake_jellyfin import FakeJellyfin
+
+    targets = {
+        'jellyfin': FakeJellyfin(**jellyfin_options).start(),
+        'broker': FakeBroker().start(),
+    }
+    targets['broker_stats'] = targets['broker'].stats
+    if churn_options is not None:
+        from bench.scenarios import SessionChurn
+        targets['scenario'] = SessionChurn(targets['jellyfin'], targets['broker'], **churn_options)
+    conn.send((targets['jellyfin'].url, targets['broker'].port))
+
+    while True:
+        try:
+            target, method, args = conn.recv()
+        except EOFError:
+            break
+        if target is None:
+            break
+        try:
+            conn.send((True, getattr(targets[target], method)(*args)))
+        except Exception as e:
+            conn.send((False, repr(e)))
+
+    if 'scenario' in targets:
+        targets['scenario'].stop()
+    for name in ('jellyfin', 'broker'):
+        targets[name].stop()
+
+
+class ServerProcess:
+    """
+    Runs FakeJellyfin and FakeBroker (and the churn scenario, if any) in a
+    child process so that their CPU time and memory stay out of the
+    bridge's numbers
+    """
+
+    def __init__(self, jellyfin_options, churn_options=None):
+        self.jellyfin_options = jellyfin_options
+        self.churn_options = churn_options
+        self.jellyfin_url = None
+        self.broker_port = None
+        self._conn = None
+        self._process = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(child, self.jellyfin_options, self.churn_options),
+            name='bench-servers', daemon=True
+        )
+        self._process.start()
+        self.jellyfin_url, self.broker_port = self._conn.recv()
+        return self
+
+    def call(self, target, method, *args):
+        """Call a method of 'jellyfin', 'broker', 'broker_stats' or 'scenario' in the child"""
+        with self._lock:
+            self._conn.send((target, method, args))
+            ok, result = self._conn.recv()
+        if not ok:
+            raise RuntimeError(f"{target}.{method} failed: {result}")
+        return result
+
+    def stop(self):
+        if self._process:
+            with self._lock:
+                self._conn.send((None, None, None))
+            self._process.join(timeout=5)
+            self._process = None
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def _rss_mb():
+    """Current resident set size of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def bridge_state(bridge):
+    """Sizes of the bridge's per-entity bookkeeping (grows with session churn)"""
+    state = {'last_sessions': len(bridge.last_sessions)}
+    for name, value in list(vars(bridge).items()):
+        if name.startswith('registered_') and isinstance(value, (set, dict)):
+            state[name] = len(value)
+    if bridge.discovery:
+        state['discovery_sessions'] = len(bridge.discovery.sessions.registered_sessions)
+        state['discovery_slots'] = len(bridge.discovery.sessions.registered_slots)
+        state['discovery_hashes'] = len(bridge.discovery.config_cache.hashes)
+        for name, value in list(vars(bridge.discovery.misc).items()):
+            if name.startswith('registered_'):
+                state[name] = len(value)
+    if bridge.publish_cache:
+        state['publish_cache_topics'] = bridge.publish_cache.get_stats()['topics']
+    if bridge.session_slots:
+        state['slots_used'] = bridge.session_slots.get_stats()['used']
+    return state
+
+
+class Snapshot:
+    """Counters of the bridge, the fake servers and this process at one instant"""
+
+    def __init__(self, bridge, servers):
+        self.time = time.monotonic()
+        self.cpu = time.process_time()
+        self.rss_mb = _rss_mb()
+        self.state = bridge_state(bridge)
+        self.interval = bridge.scheduler.interval
+        self.broker = servers.call('broker_stats', 'snapshot')
+        self.jellyfin = servers.call('jellyfin', 'snapshot')
+        self.jobs = {
+            name: (job.runs, job.latency.count, job.latency.sum, job.publishes)
+            for name, job in bridge.scheduler.jobs.items()
+        }
+
+
+def compute_report(start, end):
+    """Per-cycle figures from two snapshots (one cycle = MQTT_POLL_INTERVAL)"""
+    elapsed = end.time - start.time
+    cycles = round(elapsed / end.interval)
+    per_cycle = max(cycles, 1)
+
+    groups = {}
+    poll_seconds = 0.0
+    for name, (runs, count, total, publishes) in end.jobs.items():
+        _, count0, total0, publishes0 = start.jobs.get(name, (0, 0, 0.0, 0))
+        if count - count0:
+            groups[name] = {
+                'runs': count - count0,
+                'avg_ms': round((total - total0) / (count - count0) * 1000, 2),
+                'publishes_per_run': round((publishes - publishes0) / (count - count0), 1),
+            }
+            poll_seconds += total - total0
+
+    return {
+        'cycles': cycles,
+        'duration_s': round(elapsed, 1),
+        'poll_ms_per_cycle': round(poll_seconds / per_cycle * 1000, 2),
+        'messages_per_cycle': round((end.broker['publishes'] - start.broker['publishes']) / per_cycle, 1),
+        'bytes_per_cycle': round((end.broker['bytes'] - start.broker['bytes']) / per_cycle),
+        'wire_bytes_per_cycle': round((end.broker['wire_bytes'] - start.broker['wire_bytes']) / per_cycle),
+        'aliased_per_cycle': round((end.broker['aliased'] - start.broker['aliased']) / per_cycle, 1),
+        'discovery_per_cycle': round((end.broker['discovery'] - start.broker['discovery']) / per_cycle, 2),
+        'discovery_removed_per_cycle': round(
+            (end.broker['discovery_removed'] - start.broker['discovery_removed']) / per_cycle, 2),
+        'requests_per_cycle': round((end.jellyfin['requests'] - start.jellyfin['requests']) / per_cycle, 1),
+        'response_bytes_per_cycle': round((end.jellyfin['bytes'] - start.jellyfin['bytes']) / per_cycle),
+        'cpu_percent': round((end.cpu - start.cpu) / elapsed * 100, 1) if elapsed else 0,
+        'cpu_ms_per_cycle': round((end.cpu - start.cpu) / per_cycle * 1000, 2),
+        'rss_mb': round(end.rss_mb, 1),
+        'rss_growth_mb': round(end.rss_mb - start.rss_mb, 2),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'startup_messages': start.broker['publishes'],
+        'startup_discovery': start.broker['discovery'],
+        'topics': end.broker['topics'],
+        'groups': groups,
+        'bridge_state': {key: [start.state.get(key, 0), value] for key, value in end.state.items()},
+    }
+
+
+class Benchmark:
+    """Drives one bridge run: warm up, measure, stop"""
+
+    def __init__(self, bridge, servers, warmup=5.0, duration=20.0,
+                 on_start=None, on_tick=None, on_finish=None):
+        self.bridge = bridge
+        self.servers = servers
+        self.warmup = warmup
+        self.duration = duration
+        self.on_start = on_start
+        self.on_tick = on_tick
+        self.on_finish = on_finish
+        self.report = None
+        self.error = None
+
+    def _wait_ready(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            scheduler = self.bridge.scheduler
+            if self.bridge.running and scheduler and scheduler.jobs.get('sessions') and \
+                    scheduler.jobs['sessions'].runs:
+                return True
+            time.sleep(0.1)
+        return False
+
+    def measure(self):
+        try:
+            if not self._wait_ready():
+                self.error = "bridge did not start polling"
+                return
+            time.sleep(self.warmup)
+            start = Snapshot(self.bridge, self.servers)
+            if self.on_start:
+                self.on_start(self)
+            end_time = time.monotonic() + self.duration
+            while time.monotonic() < end_time:
+                if self.on_tick:
+                    self.on_tick(self)
+                time.sleep(min(0.5, max(0, end_time - time.monotonic())))
+            report = compute_report(start, Snapshot(self.bridge, self.servers))
+            if self.on_finish:
+                self.on_finish(self, report)
+            self.report = report
+        except Exception as e:
+            self.error = repr(e)
+        finally:
+            self.bridge.running = False
+
+    def start(self):
+        thread = threading.Thread(target=self.measure, name='bench', daemon=True)
+        thread.start()
+        return thread
+
+
+def configure_environment(servers, poll_interval, events=False):
+    """Point the bridge at the fake servers (events: subscribe to the fake /socket)"""
+    os.environ.update({
+        'MQTT_ENABLE': 'true',
+        'MQTT_HOST': '127.0.0.1',
+        'MQTT_PORT': str(servers.broker_port),
+        'MQTT_CLIENT_ID': 'jellyfin-bench',
+        'MQTT_POLL_INTERVAL': str(poll_interval),
+        'MQTT_DISCOVERY_CACHE': '',
+        'MQTT_DISCOVERY_SYNC_WAIT': '0.5',
+        'JELLYFIN_HOST': servers.jellyfin_url,
+        'JELLYFIN_API_KEY': 'bench',
+        'JELLYFIN_EVENTS_ENABLE': 'true' if events else 'false',
+        'METRICS_ENABLE': 'false',
+        'GPU_SAMPLER_ENABLE': 'false',
+        'GPU_SMI_BINARY': os.path.join(tempfile.gettempdir(), 'bench-no-nvidia-smi'),
+    })
+
+
+def _start_churn(benchmark):
+    benchmark.servers.call('scenario', 'start')
+
+
+def _finish_churn(benchmark, report):
+    benchmark.servers.call('scenario', 'stop')
+    churn = benchmark.servers.call('scenario', 'snapshot')
+    report['state_latency_avg_ms'] = churn['state_latency']['avg_ms']
+    report['state_latency_p95_ms'] = churn['state_latency']['p95_ms']
+    report['state_latency_max_ms'] = churn['state_latency']['max_ms']
+    report['churn'] = churn
+
+
+def run_bridge(servers, options):
+    """Run the bridge in this process until the benchmark stops it"""
+    configure_environment(servers, options.poll_interval, options.events)
+    from api import JellyfinAPI
+    from mqtt_bridge import MQTTBridge
+
+    topic = os.environ.get('MQTT_TOPIC', 'jellyfin')
+    groups = options.groups.split(',') if options.groups else list(JellyfinAPI.GROUPS)
+    for group in groups:
+        servers.call('broker', 'inject', f"{topic}/groups/{group}/set", 'ON', True)
+
+    bridge = MQTTBridge()
+    hooks = {}
+    if options.scenario == 'churn':
+        hooks = {'on_start': _start_churn, 'on_finish': _finish_churn}
+    benchmark = Benchmark(bridge, servers, warmup=options.warmup, duration=options.duration, **hooks)
+    benchmark.start()
+    rc = bridge.run()
+    if benchmark.report is None:
+        raise RuntimeError(benchmark.error or f"bridge exited with {rc}")
+    benchmark.report['groups_enabled'] = len(groups)
+    return benchmark.report
+
+
+# =============================================================================
+# BASELINE
+# =============================================================================
+
+def compare(report, baseline, tolerance):
+    """List of (metric, baseline, current) that regressed"""
+    regressions = []
+    for metric in COMPARED_METRICS:
+        if metric not in baseline or metric not in report:
+            continue
+        limit = baseline[metric] * (1 + tolerance) + ABSOLUTE_SLACK.get(metric, 0)
+        if report[metric] > limit:
+            regressions.append((metric, baseline[metric], report[metric]))
+    return regressions
+
+
+def print_report(report, baseline=None):
+    print(f"{'metric':<28}{'value':>14}{'baseline':>14}")
+    for key, value in report.items():
+        if isinstance(value, dict):
+            continue
+        reference = baseline.get(key, '') if baseline else ''
+        print(f"{key:<28}{value:>14}{reference:>14}")
+    print()
+    print(f"{'group':<14}{'runs':>8}{'avg_ms':>10}{'pub/run':>10}")
+    for name, group in sorted(report['groups'].items()):
+        print(f"{name:<14}{group['runs']:>8}{group['avg_ms']:>10}{group['publishes_per_run']:>10}")
+    print()
+    print(f"{'bridge state':<28}{'start':>14}{'end':>14}")
+    for name, (before, after) in sorted(report['bridge_state'].items()):
+        print(f"{name:<28}{before:>14}{after:>14}")
+    churn = report.get('churn')
+    if churn:
+        print()
+        print(f"population {churn['population']}, sessions seen {churn['sessions_seen']}, "
+              f"pending {churn['pending']} (stale {churn['stale']}), superseded {churn['superseded']}")
+        print("events: " + ', '.join(f"{k}={v}" for k, v in sorted(churn['events'].items())))
+        print(f"{'latency':<14}{'count':>8}{'avg_ms':>10}{'p50_ms':>10}{'p95_ms':>10}{'max_ms':>10}")
+        for kind, summary in sorted(churn['latency'].items()):
+            print(f"{kind:<14}{summary['count']:>8}{summary['avg_ms']:>10}{summary['p50_ms']:>10}"
+                  f"{summary['p95_ms']:>10}{summary['max_ms']:>10}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the MQTT bridge against fake servers")
+    parser.add_argument('--scenario', choices=('steady', 'churn'), default='steady',
+                        help="steady: fixed sessions, churn: scripted arrivals/departures/state changes")
+    parser.add_argument('--sessions', type=int, help="active sessions on /Sessions (default 20, churn 200)")
+    parser.add_argument('--items', type=int, default=5000, help="library size on /Items")
+    parser.add_argument('--persons', type=int, default=2000, help="entries on /Persons")
+    parser.add_argument('--tasks', type=int, default=20, help="scheduled tasks")
+    parser.add_argument('--transcode-ratio', type=float, default=0.3, help="share of transcoding sessions")
+    parser.add_argument('--latency-ms', type=float, default=0, help="injected latency per request")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="random extra latency per request")
+    parser.add_argument('--arrivals-per-min', type=float, default=60, help="churn: session arrivals")
+    parser.add_argument('--pauses-per-min', type=float, default=60, help="churn: pause/resume toggles")
+    parser.add_argument('--seeks-per-min', type=float, default=60, help="churn: seeks")
+    parser.add_argument('--transcodes-per-min', type=float, default=30, help="churn: transcode start/stop")
+    parser.add_argument('--events', action='store_true', help="push sessions/tasks over the fake /socket")
+    parser.add_argument('--groups', default='', help="comma separated groups to enable (default: all)")
+    parser.add_argument('--poll-interval', type=int, default=1, help="MQTT_POLL_INTERVAL for the bridge")
+    parser.add_argument('--warmup', type=float, default=5, help="seconds before measuring")
+    parser.add_argument('--duration', type=float, default=20, help="seconds to measure")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', help="compare against this baseline JSON, exit 1 on regression")
+    parser.add_argument('--save-baseline', help="write the report to this baseline JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    parser.add_argument('--verbose', action='store_true', help="show bridge logs")
+    return parser
+
+
+def server_options(options):
+    """FakeJellyfin arguments (the churn scenario brings its own sessions)"""
+    return {
+        'sessions': 0 if options.scenario == 'churn' else options.sessions,
+        'library_size': options.items,
+        'persons': options.persons,
+        'tasks': options.tasks,
+        'transcode_ratio': options.transcode_ratio,
+        'latency_ms': options.latency_ms,
+        'jitter_ms': options.jitter_ms,
+        'seed': options.seed,
+    }
+
+
+def churn_options(options):
+    """SessionChurn arguments, None without a churn scenario"""
+    if options.scenario != 'churn':
+        return None
+    return {
+        'sessions': options.sessions,
+        'arrivals_per_min': options.arrivals_per_min,
+        'pauses_per_min': options.pauses_per_min,
+        'seeks_per_min': options.seeks_per_min,
+        'transcodes_per_min': options.transcodes_per_min,
+        'seed': options.seed,
+    }
+
+
+def bench_options(options):
+    """Everything that makes two reports comparable"""
+    result = server_options(options)
+    churn = churn_options(options)
+    if churn:
+        result['churn'] = churn
+    if options.events:
+        result['events'] = True
+    return result
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.sessions is None:
+        options.sessions = DEFAULT_SESSIONS[options.scenario]
+    logging.basicConfig(
+        level=logging.INFO if options.verbose else logging.WARNING,
+        format='[Bench] %(asctime)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stderr)]
+    )
+
+    servers = ServerProcess(server_options(options), churn_options(options)).start()
+    try:
+        report = run_bridge(servers, options)
+    finally:
+        servers.stop()
+
+    baseline = None
+    if options.baseline:
+        with open(options.baseline) as f:
+            stored = json.load(f)
+        if stored.get('options') != bench_options(options):
+            logger.warning("Baseline was recorded with different options: %s", stored.get('options'))
+        baseline = stored['report']
+
+    if options.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, baseline)
+
+    if options.save_baseline:
+        with open(options.save_baseline, 'w') as f:
+            json.dump({'options': bench_options(options), 'report': report}, f, indent=2)
+            f.write('\n')
+
+    if baseline:
+        regressions = compare(report, baseline, options.tolerance)
+        for metric, before, after in regressions:
+            print(f"REGRESSION {metric}: {before} -> {after}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
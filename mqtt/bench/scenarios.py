@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Benchmark Scenarios
+Scripted session churn on the fake /Sessions endpoint: arrivals and
+departures, play/pause, seeks and transcode start/stop, with end-to-end
+state latency measured on the broker side
+"""
+
+import json
+import math
+import time
+import random
+import logging
+import threading
+import collections
+
+from api.request_stats import Histogram
+from bench import fixtures
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, polls run every second or slower
+LATENCY_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.25, 1.5, 2.0, 3.0, 5.0, 10.0, 30.0)
+
+
+def _poisson(rng, expected):
+    """Number of events of a Poisson process with the given mean"""
+    if expected <= 0:
+        return 0
+    limit, count, product = math.exp(-expected), 0, rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def _time_to_seconds(value):
+    """Parse HH:MM:SS as published by the bridge"""
+    try:
+        hours, minutes, seconds = (int(p) for p in value.split(':'))
+    except ValueError:
+        return None
+    return hours * 3600 + minutes * 60 + seconds
+
+
+class ChurnSession:
+    """Scripted state of one session"""
+
+    def __init__(self, index, runtime, position, paused, transcoding):
+        self.index = index
+        self.id = fixtures.make_id('session', index)
+        self.runtime = runtime
+        self.position = position
+        self.paused = paused
+        self.transcoding = transcoding
+        self.base = fixtures.make_session(index, playing=True, transcoding=True)
+
+    def advance(self, ticks):
+        if not self.paused:
+            self.position = (self.position + ticks) % self.runtime
+
+    def payload(self):
+        """SessionInfo dict for the current state"""
+        session = dict(self.base)
+        now_playing = dict(session['NowPlayingItem'], RunTimeTicks=self.runtime)
+        session['NowPlayingItem'] = now_playing
+        session['PlayState'] = dict(
+            session['PlayState'],
+            PositionTicks=self.position,
+            IsPaused=self.paused,
+            PlayMethod='Transcode' if self.transcoding else 'DirectPlay',
+        )
+        if not self.transcoding:
+            del session['TranscodingInfo']
+        return session
+
+
+class SessionChurn:
+    """
+    Session population around a target size on a FakeJellyfin
+    Arrivals and departures are Poisson processes (departures scale with
+    the population so it stays near the target). Every event that changes
+    a published state registers an expectation; the broker listener
+    records the time until the bridge published it
+    """
+
+    def __init__(self, jellyfin, broker=None, sessions=200, arrivals_per_min=60, pauses_per_min=60,
+                 seeks_per_min=60, transcodes_per_min=30, tick=0.25, seed=1, topic='jellyfin'):
+        self.jellyfin = jellyfin
+        self.target = sessions
+        self.rates = {
+            'arrive': arrivals_per_min / 60,
+            'pause': pauses_per_min / 60,
+            'seek': seeks_per_min / 60,
+            'transcode': transcodes_per_min / 60,
+        }
+        self.tick_interval = tick
+        self.topic = topic
+        self.rng = random.Random(seed)
+        self.sessions = {}
+        self.next_index = 0
+        self.events = collections.Counter()
+        self.latency = collections.defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.pending = {}
+        self.aliases = {}
+        self.superseded = 0
+        self.seen_sessions = 0
+        self._lock = threading.Lock()
+        self._last = time.monotonic()
+        self._running = False
+        self._thread = None
+
+        for _ in range(sessions):
+            self._arrive(expect=False)
+        self._push()
+        if broker is not None:
+            broker.listeners.append(self.on_publish)
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def _expect(self, topic, kind, check):
+        """Register that topic must eventually be published with a value passing check"""
+        now = time.monotonic()
+        if topic in self.pending:
+            self.superseded += 1
+        self.pending[topic] = (kind, now, check)
+
+    def _state_topic(self, session):
+        return f"{self.topic}/sessions/{session.id}/state"
+
+    def _arrive(self, expect=True):
+        rng = self.rng
+        runtime = rng.randint(20, 180) * 60 * fixtures.TICKS_PER_SECOND
+        session = ChurnSession(self.next_index, runtime, int(runtime * rng.random()),
+                               paused=rng.random() < 0.15, transcoding=rng.random() < 0.3)
+        self.next_index += 1
+        self.sessions[session.id] = session
+        self.seen_sessions += 1
+        if expect:
+            self.events['arrive'] += 1
+            state = 'paused' if session.paused else 'playing'
+            self._expect(self._state_topic(session), 'arrive', lambda value: value == state)
+
+    def _depart(self, session):
+        del self.sessions[session.id]
+        self.events['depart'] += 1
+        for topic in [t for t in self.pending if f"/{session.id}/" in t]:
+            del self.pending[topic]
+
+    def _toggle_pause(self, session):
+        session.paused = not session.paused
+        self.events['resume' if not session.paused else 'pause'] += 1
+        state = 'paused' if session.paused else 'playing'
+        self._expect(self._state_topic(session), 'pause', lambda value: value == state)
+
+    def _seek(self, session):
+        session.position = int(session.runtime * self.rng.random())
+        self.events['seek'] += 1
+        target = session.position // fixtures.TICKS_PER_SECOND
+        start = time.monotonic()
+        paused = session.paused
+
+        def check(value):
+            seconds = _time_to_seconds(value)
+            if seconds is None:
+                return False
+            expected = target if paused else target + (time.monotonic() - start)
+            return abs(seconds - expected) <= 2
+
+        self._expect(f"{self.topic}/sessions/{session.id}/position", 'seek', check)
+
+    def _toggle_transcode(self, session):
+        session.transcoding = not session.transcoding
+        self.events['transcode_start' if session.transcoding else 'transcode_stop'] += 1
+
+    def _pick(self):
+        return self.sessions[self.rng.choice(list(self.sessions))] if self.sessions else None
+
+    def step(self, elapsed):
+        """Advance the script by elapsed seconds"""
+        rng = self.rng
+        with self._lock:
+            ticks = int(elapsed * fixtures.TICKS_PER_SECOND)
+            for session in self.sessions.values():
+                session.advance(ticks)
+
+            arrival_rate = self.rates['arrive']
+            for _ in range(_poisson(rng, arrival_rate * elapsed * len(self.sessions) / max(self.target, 1))):
+                session = self._pick()
+                if session:
+                    self._depart(session)
+            for _ in range(_poisson(rng, arrival_rate * elapsed)):
+                self._arrive()
+            for kind, action in (('pause', self._toggle_pause), ('seek', self._seek),
+                                 ('transcode', self._toggle_transcode)):
+                for _ in range(_poisson(rng, self.rates[kind] * elapsed)):
+                    session = self._pick()
+                    if session:
+                        action(session)
+            self._push()
+
+    def _push(self):
+        self.jellyfin.set_sessions([s.payload() for s in self.sessions.values()])
+
+    # ------------------------------------------------------------------
+    # Broker side
+    # ------------------------------------------------------------------
+
+    def on_publish(self, topic, payload):
+        """Broker listener: resolve expectations on the published topic"""
+        parts = topic.split('/')
+        # MQTT_STATE_JSON: one document per session, check each field
+        if len(parts) == 4 and parts[1] == 'sessions' and parts[3] == 'json':
+            try:
+                fields = json.loads(payload)
+            except ValueError:
+                return
+            prefix = topic[:-len('/json')]
+            if 'Id' in fields:
+                self.on_publish(f"{prefix}/Id", str(fields['Id']).encode('utf-8'))
+            for field, value in fields.items():
+                if field != 'Id':
+                    self.on_publish(f"{prefix}/{field}", str(value).encode('utf-8'))
+            return
+        if len(parts) >= 4 and parts[1] == 'sessions':
+            # Slot mode publishes under sessions/slot_N, its Id topic names the session
+            if parts[3] == 'Id' and len(parts) == 4:
+                self.aliases[parts[2]] = payload.decode('utf-8', errors='replace')
+                return
+            session_id = self.aliases.get(parts[2])
+            if session_id:
+                parts[2] = session_id
+                topic = '/'.join(parts)
+        if topic not in self.pending:
+            return
+        with self._lock:
+            expectation = self.pending.get(topic)
+            if expectation is None:
+                return
+            kind, since, check = expectation
+            if check(payload.decode('utf-8', errors='replace')):
+                del self.pending[topic]
+                self.latency[kind].observe(time.monotonic() - since)
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while self._running:
+            time.sleep(self.tick_interval)
+            now = time.monotonic()
+            self.step(now - self._last)
+            self._last = now
+
+    def start(self):
+        """Start scripting in a background thread"""
+        if self._running:
+            return
+        self._running = True
+        self._last = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='churn', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def snapshot(self):
+        """Event counts and state latency summaries"""
+        with self._lock:
+            combined = Histogram(LATENCY_BUCKETS)
+            for histogram in self.latency.values():
+                for i, count in enumerate(histogram.counts):
+                    combined.counts[i] += count
+                combined.count += histogram.count
+                combined.sum += histogram.sum
+                combined.max = max(combined.max, histogram.max)
+            now = time.monotonic()
+            return {
+                'population': len(self.sessions),
+                'sessions_seen': self.seen_sessions,
+                'events': dict(self.events),
+                'latency': {kind: h.summary() for kind, h in self.latency.items()},
+                'state_latency': combined.summary(),
+                'pending': len(self.pending),
+                'stale': sum(1 for _, since, _ in self.pending.values() if now - since > 10),
+                'superseded': self.superseded,
+            }
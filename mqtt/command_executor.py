@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Command Executor
+Runs MQTT commands off the paho network thread on a small worker pool
+"""
+
+import time
+import queue
+import logging
+import itertools
+import threading
+import collections
+
+logger = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITY_PLAYBACK = 0
+PRIORITY_DEFAULT = 5
+
+
+class CommandJob:
+    """Queued command with its deadline and ordering key"""
+
+    def __init__(self, name, func, args, deadline, key=None):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.key = key
+        self.queued = time.monotonic()
+        self.expires = self.queued + deadline
+
+
+class CommandExecutor:
+    """
+    Bounded priority queue drained by worker threads
+    Commands have their own workers, so they never wait behind group polls;
+    playback commands additionally jump ahead of other queued commands.
+    Commands with the same key (e.g. one session) run one at a time in
+    submission order, so a pause followed by an unpause cannot reach
+    Jellyfin swapped; different keys run in parallel. Commands still
+    queued after their deadline are dropped; the deadline does not bound
+    a command that has started (its HTTP call has its own timeout)
+    """
+
+    def __init__(self, workers=2, max_queue=100, deadline=10):
+        self.workers = workers
+        self.deadline = deadline
+        self._queue = queue.PriorityQueue(maxsize=max_queue)
+        self._seq = itertools.count()
+        self._threads = []
+        self._lanes = {}   # key -> commands waiting while a worker runs one with that key
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.expired = 0
+        self.rejected = 0
+        self.latency_last = 0.0
+        self.latency_max = 0.0
+        self._latency_total = 0.0
+
+    def start(self):
+        """Start worker threads"""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f'command-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        """Let workers finish current commands and exit"""
+        for _ in self._threads:
+            # Sentinels sort after every real command
+            try:
+                self._queue.put((float('inf'), next(self._seq), None), timeout=timeout)
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def submit(self, name, func, *args, priority=PRIORITY_DEFAULT, deadline=None, key=None):
+        """Queue a command (serialized with others of the same key), returns False if the queue is full"""
+        job = CommandJob(name, func, args, deadline or self.deadline, key)
+        try:
+            self._queue.put_nowait((priority, next(self._seq), job))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            logger.warning("Command queue full, dropped '%s'", name)
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                break
+
+            if job.key is not None:
+                with self._lock:
+                    waiting = self._lanes.get(job.key)
+                    if waiting is not None:
+                        # Another worker runs this key, it takes the job next
+                        waiting.append(job)
+                        continue
+                    self._lanes[job.key] = collections.deque()
+
+            while job is not None:
+                self._run(job)
+                job = self._next_in_lane(job.key)
+
+    def _next_in_lane(self, key):
+        """Next waiting command of key, or None after releasing the key"""
+        if key is None:
+            return None
+        with self._lock:
+            waiting = self._lanes[key]
+            if waiting:
+                return waiting.popleft()
+            del self._lanes[key]
+            return None
+
+    def _run(self, job):
+        if time.monotonic() > job.expires:
+            with self._lock:
+                self.expired += 1
+            logger.warning("Command '%s' expired after %.1fs in queue",
+                           job.name, time.monotonic() - job.queued)
+            return
+
+        try:
+            job.func(*job.args)
+            ok = True
+        except Exception as e:
+            logger.error("Command error (%s): %s", job.name, str(e))
+            ok = False
+
+        latency = time.monotonic() - job.queued
+        with self._lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.latency_last = latency
+            self.latency_max = max(self.latency_max, latency)
+            self._latency_total += latency
+
+    def get_stats(self):
+        """Get queue depth, counters and latency (ms)"""
+        with self._lock:
+            done = self.completed + self.failed
+            return {
+                'queue_depth': self._queue.qsize() + sum(len(waiting) for waiting in self._lanes.values()),
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'expired': self.expired,
+                'rejected': self.rejected,
+                'latency_last_ms': round(self.latency_last * 1000, 1),
+                'latency_avg_ms': round(self._latency_total / done * 1000, 1) if done else 0,
+                'latency_max_ms': round(self.latency_max * 1000, 1),
+            }
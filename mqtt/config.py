@@ -10,6 +10,20 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Default poll priorities (0 = highest); groups not listed use 5
+DEFAULT_POLL_PRIORITIES = {
+    'sessions': 0,
+    'hardware': 0,
+    'tasks': 1,
+    'system': 2,
+    'users': 2,
+    'items': 3,
+    'library': 3,
+    'syncplay': 3,
+    'livetv': 4,
+    'devices': 4,
+}
+
 
 class MQTTConfig:
     """Configuration from environment variables"""
@@ -23,12 +37,53 @@ class MQTTConfig:
         self.mqtt_password = os.getenv('MQTT_PASSWORD', '')
         self.mqtt_topic = os.getenv('MQTT_TOPIC', 'jellyfin')
         self.mqtt_discovery_prefix = os.getenv('MQTT_DISCOVERY_PREFIX', 'homeassistant')
+        self.mqtt_discovery_cache = os.getenv('MQTT_DISCOVERY_CACHE', '/config/mqtt_discovery_cache.json')
+        self.mqtt_discovery_sync_wait = float(os.getenv('MQTT_DISCOVERY_SYNC_WAIT', '2'))
         self.mqtt_client_id = os.getenv('MQTT_CLIENT_ID', 'jellyfin-mqtt')
+        self.mqtt_protocol = os.getenv('MQTT_PROTOCOL', '3.1.1')
+        self.mqtt_topic_aliases = int(os.getenv('MQTT_TOPIC_ALIASES', '100'))
+        self.mqtt_message_expiry = int(os.getenv('MQTT_MESSAGE_EXPIRY', '60'))
+        self.mqtt_session_expiry = int(os.getenv('MQTT_SESSION_EXPIRY', '0'))
         self.mqtt_poll_interval = int(os.getenv('MQTT_POLL_INTERVAL', '5'))
+        self.mqtt_poll_concurrency = int(os.getenv('MQTT_POLL_CONCURRENCY', '4'))
+        self.mqtt_command_workers = int(os.getenv('MQTT_COMMAND_WORKERS', '2'))
+        self.mqtt_command_queue = int(os.getenv('MQTT_COMMAND_QUEUE', '100'))
+        self.mqtt_command_deadline = float(os.getenv('MQTT_COMMAND_DEADLINE', '10'))
+        self.mqtt_publish_changes_only = os.getenv('MQTT_PUBLISH_CHANGES_ONLY', 'true').lower() == 'true'
+        self.mqtt_publish_refresh = int(os.getenv('MQTT_PUBLISH_REFRESH', '300'))
+        self.mqtt_stats_interval = int(os.getenv('MQTT_STATS_INTERVAL', '60'))
+        self.mqtt_stats_discovery = os.getenv('MQTT_STATS_DISCOVERY', 'false').lower() == 'true'
+        self.mqtt_publish_bypass = [t.strip() for t in os.getenv('MQTT_PUBLISH_BYPASS', '').split(',') if t.strip()]
+        self.mqtt_session_slots = int(os.getenv('MQTT_SESSION_SLOTS', '0'))
+        self.mqtt_session_slots_by_device = os.getenv('MQTT_SESSION_SLOTS_BY_DEVICE', 'true').lower() == 'true'
+        self.mqtt_position_tick = int(os.getenv('MQTT_POSITION_TICK', '0'))
+        self.mqtt_state_json = os.getenv('MQTT_STATE_JSON', 'false').lower() == 'true'
+        self.mqtt_outbound_queue = int(os.getenv('MQTT_OUTBOUND_QUEUE', '10000'))
+        self.mqtt_outbound_rate = int(os.getenv('MQTT_OUTBOUND_RATE', '500'))
         
         # Jellyfin Settings
         self.jellyfin_api_key = os.getenv('JELLYFIN_API_KEY', '')
         self.jellyfin_host = os.getenv('JELLYFIN_HOST', 'http://localhost:8096')
+        self.jellyfin_events_enable = os.getenv('JELLYFIN_EVENTS_ENABLE', 'true').lower() == 'true'
+        self.jellyfin_events_reconcile = int(os.getenv('JELLYFIN_EVENTS_RECONCILE', '60'))
+        self.jellyfin_http_pool_size = int(os.getenv('JELLYFIN_HTTP_POOL_SIZE', '4'))
+        self.jellyfin_http_max_per_host = int(os.getenv('JELLYFIN_HTTP_MAX_PER_HOST', '10'))
+        self.jellyfin_cache_enable = os.getenv('JELLYFIN_CACHE_ENABLE', 'true').lower() == 'true'
+        self.jellyfin_cache_ttl = float(os.getenv('JELLYFIN_CACHE_TTL', '0.5'))
+        self.jellyfin_cache_max_kb = int(os.getenv('JELLYFIN_CACHE_MAX_KB', '2048'))
+        
+        # Prometheus Exporter
+        self.metrics_enable = os.getenv('METRICS_ENABLE', 'false').lower() == 'true'
+        self.metrics_host = os.getenv('METRICS_HOST', '0.0.0.0')
+        self.metrics_port = int(os.getenv('METRICS_PORT', '9877'))
+        
+        # Container Settings
+        self.container_cgroup_root = os.getenv('CONTAINER_CGROUP_ROOT', '/sys/fs/cgroup')
+        
+        # GPU Settings
+        self.gpu_smi_binary = os.getenv('GPU_SMI_BINARY', 'nvidia-smi')
+        self.gpu_sampler_enable = os.getenv('GPU_SAMPLER_ENABLE', 'true').lower() == 'true'
+        self.gpu_sample_interval_ms = int(os.getenv('GPU_SAMPLE_INTERVAL_MS', '1000'))
         
         # Derived settings
         self.server_id = self._generate_server_id()
@@ -38,6 +93,24 @@ class MQTTConfig:
         # Use client_id as base for server identifier
         return self.mqtt_client_id.replace('-', '_')
     
+    def get_poll_interval(self, group):
+        """Poll interval for a group: MQTT_POLL_INTERVAL_<GROUP>, else MQTT_POLL_INTERVAL"""
+        value = os.getenv(f'MQTT_POLL_INTERVAL_{group.upper()}')
+        try:
+            return max(int(value), 1) if value else self.mqtt_poll_interval
+        except ValueError:
+            logger.warning("Invalid MQTT_POLL_INTERVAL_%s: %s", group.upper(), value)
+            return self.mqtt_poll_interval
+    
+    def get_poll_priority(self, group):
+        """Poll priority for a group: MQTT_POLL_PRIORITY_<GROUP>, else built-in default"""
+        value = os.getenv(f'MQTT_POLL_PRIORITY_{group.upper()}')
+        try:
+            return int(value) if value else DEFAULT_POLL_PRIORITIES.get(group, 5)
+        except ValueError:
+            logger.warning("Invalid MQTT_POLL_PRIORITY_%s: %s", group.upper(), value)
+            return DEFAULT_POLL_PRIORITIES.get(group, 5)
+    
     def validate(self):
         """
         Validate configuration.
@@ -52,9 +125,42 @@ class MQTTConfig:
         if not self.jellyfin_api_key:
             return False, "JELLYFIN_API_KEY is required when MQTT is enabled"
         
+        if self.mqtt_protocol not in ('3.1.1', '5'):
+            return False, "MQTT_PROTOCOL must be '3.1.1' or '5'"
+        
+        if self.mqtt_topic_aliases < 0 or self.mqtt_message_expiry < 0 or self.mqtt_session_expiry < 0:
+            return False, "MQTT_TOPIC_ALIASES, MQTT_MESSAGE_EXPIRY and MQTT_SESSION_EXPIRY must be 0 (off) or more"
+        
         if self.mqtt_poll_interval < 1:
             return False, "MQTT_POLL_INTERVAL must be at least 1 second"
         
+        if self.mqtt_poll_concurrency < 1:
+            return False, "MQTT_POLL_CONCURRENCY must be at least 1"
+        
+        if self.mqtt_command_workers < 1 or self.mqtt_command_queue < 1:
+            return False, "MQTT_COMMAND_WORKERS and MQTT_COMMAND_QUEUE must be at least 1"
+        
+        if self.mqtt_session_slots < 0:
+            return False, "MQTT_SESSION_SLOTS must be 0 (per-session entities) or more"
+        
+        if self.mqtt_position_tick < 0:
+            return False, "MQTT_POSITION_TICK must be 0 (off) or at least 1 second"
+        
+        if self.mqtt_outbound_queue < 0 or self.mqtt_outbound_rate < 1:
+            return False, "MQTT_OUTBOUND_QUEUE must be 0 (off) or more and MQTT_OUTBOUND_RATE at least 1"
+        
+        if self.jellyfin_events_reconcile < 1:
+            return False, "JELLYFIN_EVENTS_RECONCILE must be at least 1 second"
+        
+        if self.jellyfin_http_pool_size < 1 or self.jellyfin_http_max_per_host < 1:
+            return False, "JELLYFIN_HTTP_POOL_SIZE and JELLYFIN_HTTP_MAX_PER_HOST must be at least 1"
+        
+        if self.jellyfin_cache_ttl < 0 or self.jellyfin_cache_max_kb < 1:
+            return False, "JELLYFIN_CACHE_TTL must be 0 or more and JELLYFIN_CACHE_MAX_KB at least 1"
+        
+        if self.gpu_sample_interval_ms < 100:
+            return False, "GPU_SAMPLE_INTERVAL_MS must be at least 100"
+        
         if self.mqtt_poll_interval > 60:
             logger.warning("MQTT_POLL_INTERVAL is set to %d seconds, this is quite high", 
                           self.mqtt_poll_interval)
@@ -70,9 +176,44 @@ class MQTTConfig:
         logger.info("  MQTT_PASSWORD: %s", "****" if self.mqtt_password else "(none)")
         logger.info("  MQTT_TOPIC: %s", self.mqtt_topic)
         logger.info("  MQTT_DISCOVERY_PREFIX: %s", self.mqtt_discovery_prefix)
+        logger.info("  MQTT_DISCOVERY_CACHE: %s (read-back wait %.1fs)",
+                    self.mqtt_discovery_cache or "(disabled)", self.mqtt_discovery_sync_wait)
         logger.info("  MQTT_CLIENT_ID: %s", self.mqtt_client_id)
+        if self.mqtt_protocol == '5':
+            logger.info("  MQTT_PROTOCOL: 5 (topic aliases %d, message expiry %ds, session expiry %ds)",
+                        self.mqtt_topic_aliases, self.mqtt_message_expiry, self.mqtt_session_expiry)
+        else:
+            logger.info("  MQTT_PROTOCOL: 3.1.1")
         logger.info("  MQTT_POLL_INTERVAL: %d seconds", self.mqtt_poll_interval)
+        logger.info("  MQTT_POLL_CONCURRENCY: %d", self.mqtt_poll_concurrency)
+        logger.info("  MQTT_COMMAND_WORKERS: %d (queue %d, deadline %.0fs)",
+                    self.mqtt_command_workers, self.mqtt_command_queue, self.mqtt_command_deadline)
+        logger.info("  MQTT_PUBLISH_CHANGES_ONLY: %s (refresh every %ds, bypass: %s)",
+                    self.mqtt_publish_changes_only, self.mqtt_publish_refresh,
+                    ', '.join(self.mqtt_publish_bypass) or "(none)")
+        logger.info("  MQTT_STATS_INTERVAL: %ds (discovery: %s)",
+                    self.mqtt_stats_interval, self.mqtt_stats_discovery)
+        logger.info("  MQTT_SESSION_SLOTS: %s",
+                    f"{self.mqtt_session_slots} (by device: {self.mqtt_session_slots_by_device})"
+                    if self.mqtt_session_slots else "off (entities per session)")
+        logger.info("  MQTT_POSITION_TICK: %s",
+                    f"every {self.mqtt_position_tick}s" if self.mqtt_position_tick else "off")
+        logger.info("  MQTT_STATE_JSON: %s", "one JSON document per object" if self.mqtt_state_json else "off (topic per field)")
+        logger.info("  MQTT_OUTBOUND_QUEUE: %s",
+                    f"{self.mqtt_outbound_queue} messages (flush {self.mqtt_outbound_rate}/s)"
+                    if self.mqtt_outbound_queue else "off")
         logger.info("  JELLYFIN_HOST: %s", self.jellyfin_host)
+        logger.info("  JELLYFIN_EVENTS_ENABLE: %s (reconcile every %ds)",
+                    self.jellyfin_events_enable, self.jellyfin_events_reconcile)
+        logger.info("  JELLYFIN_HTTP_POOL_SIZE: %d (max %d per host)",
+                    self.jellyfin_http_pool_size, self.jellyfin_http_max_per_host)
+        logger.info("  JELLYFIN_CACHE_ENABLE: %s (TTL %ss, max %d KB)",
+                    self.jellyfin_cache_enable, self.jellyfin_cache_ttl, self.jellyfin_cache_max_kb)
+        logger.info("  METRICS_ENABLE: %s (%s:%d/metrics)",
+                    self.metrics_enable, self.metrics_host, self.metrics_port)
+        logger.info("  CONTAINER_CGROUP_ROOT: %s", self.container_cgroup_root)
+        logger.info("  GPU_SAMPLER_ENABLE: %s (%s every %dms)",
+                    self.gpu_sampler_enable, self.gpu_smi_binary, self.gpu_sample_interval_ms)
         logger.info("  JELLYFIN_API_KEY: %s", "****" if self.jellyfin_api_key else "(none)")
 
 
@@ -5,32 +5,84 @@ Collects container resource usage metrics
 """
 
 import os
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class RateTracker:
+    """
+    Turns cumulative counters into per-second rates
+    Keeps the previous value and monotonic timestamp per key plus an
+    exponentially weighted moving average of the rate
+    """
+    
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self._last = {}
+        self._ewma = {}
+    
+    def update(self, key, value, now=None):
+        """
+        Record a counter value
+        Returns (rate, ewma) or None for the first sample / after a counter reset
+        """
+        now = time.monotonic() if now is None else now
+        last = self._last.get(key)
+        self._last[key] = (value, now)
+        
+        if last is None or now <= last[1] or value < last[0]:
+            self._ewma.pop(key, None)
+            return None
+        
+        rate = (value - last[0]) / (now - last[1])
+        ewma = self._ewma.get(key)
+        ewma = rate if ewma is None else self.alpha * rate + (1 - self.alpha) * ewma
+        self._ewma[key] = ewma
+        return rate, ewma
+    
+    def forget(self, key):
+        """Drop state of a counter that disappeared"""
+        self._last.pop(key, None)
+        self._ewma.pop(key, None)
+
+
 class ContainerStats:
     """Container resource monitoring"""
     
-    def __init__(self):
-        self.cgroup_v2 = os.path.exists('/sys/fs/cgroup/cgroup.controllers')
+    PRESSURE_RESOURCES = ('cpu', 'memory', 'io')
+    MEMORY_STAT_KEYS = ('anon', 'file', 'kernel', 'shmem')
+    
+    def __init__(self, root='/sys/fs/cgroup', proc_root='/proc', sys_root=None, rate_alpha=0.3):
+        self.root = root
+        self.proc_root = proc_root
+        # sysfs is two levels above the cgroup mount (/sys/fs/cgroup -> /sys)
+        self.sys_root = sys_root or os.path.normpath(os.path.join(root, os.pardir, os.pardir))
+        self.cgroup_v2 = os.path.exists(os.path.join(root, 'cgroup.controllers'))
         self.cgroup_path = self._find_cgroup_path()
+        self.rates = RateTracker(rate_alpha)
+        self._interfaces = set()
+        self._devices = set()
     
     def _find_cgroup_path(self):
         """Find the cgroup path for this container"""
         if self.cgroup_v2:
-            return '/sys/fs/cgroup'
+            return self.root
         else:
             # cgroup v1
-            return '/sys/fs/cgroup/memory'
+            return os.path.join(self.root, 'memory')
+    
+    def _path(self, *parts):
+        """Path below the cgroup root"""
+        return os.path.join(self.root, *parts)
     
     def _read_file(self, path):
         """Read a file and return content"""
         try:
             with open(path, 'r') as f:
                 return f.read().strip()
-        except (FileNotFoundError, PermissionError):
+        except (FileNotFoundError, PermissionError, OSError):
             return None
     
     def get_memory_stats(self):
@@ -38,30 +90,34 @@ class ContainerStats:
         try:
             if self.cgroup_v2:
                 # cgroup v2
-                current = self._read_file('/sys/fs/cgroup/memory.current')
-                max_mem = self._read_file('/sys/fs/cgroup/memory.max')
+                current = self._read_file(self._path('memory.current'))
+                max_mem = self._read_file(self._path('memory.max'))
                 
-                if current and max_mem and max_mem != 'max':
+                if current and max_mem:
                     used = int(current)
-                    limit = int(max_mem)
+                    # No limit set: report against host memory
+                    limited = max_mem != 'max'
+                    limit = int(max_mem) if limited else self._get_host_memory()
                     percent = int((used / limit * 100)) if limit > 0 else 0
                     return {
                         'used_bytes': used,
                         'used_mb': used // (1024 * 1024),
                         'limit_bytes': limit,
                         'limit_mb': limit // (1024 * 1024),
+                        'limited': limited,
                         'percent': percent
                     }
             else:
                 # cgroup v1
-                usage = self._read_file('/sys/fs/cgroup/memory/memory.usage_in_bytes')
-                limit = self._read_file('/sys/fs/cgroup/memory/memory.limit_in_bytes')
+                usage = self._read_file(self._path('memory', 'memory.usage_in_bytes'))
+                limit = self._read_file(self._path('memory', 'memory.limit_in_bytes'))
                 
                 if usage and limit:
                     used = int(usage)
                     lim = int(limit)
                     # Check for "unlimited" (very large number)
-                    if lim > 10**15:
+                    limited = lim <= 10**15
+                    if not limited:
                         lim = self._get_host_memory()
                     percent = int((used / lim * 100)) if lim > 0 else 0
                     return {
@@ -69,6 +125,7 @@ class ContainerStats:
                         'used_mb': used // (1024 * 1024),
                         'limit_bytes': lim,
                         'limit_mb': lim // (1024 * 1024),
+                        'limited': limited,
                         'percent': percent
                     }
         except Exception as e:
@@ -79,7 +136,7 @@ class ContainerStats:
     def _get_host_memory(self):
         """Get total host memory from /proc/meminfo"""
         try:
-            with open('/proc/meminfo', 'r') as f:
+            with open(os.path.join(self.proc_root, 'meminfo'), 'r') as f:
                 for line in f:
                     if line.startswith('MemTotal:'):
                         # Value is in kB
@@ -89,62 +146,232 @@ class ContainerStats:
             pass
         return 0
     
+    def get_cpu_limit(self):
+        """
+        Number of CPUs the container may use
+        From the CFS quota (cpu.max / cpu.cfs_quota_us) if set, else the online CPUs
+        """
+        quota = period = None
+        if self.cgroup_v2:
+            cpu_max = self._read_file(self._path('cpu.max'))
+            if cpu_max:
+                parts = cpu_max.split()
+                if len(parts) == 2 and parts[0] != 'max':
+                    quota, period = int(parts[0]), int(parts[1])
+        else:
+            cfs_quota = self._read_file(self._path('cpu', 'cpu.cfs_quota_us'))
+            cfs_period = self._read_file(self._path('cpu', 'cpu.cfs_period_us'))
+            if cfs_quota and cfs_period and int(cfs_quota) > 0:
+                quota, period = int(cfs_quota), int(cfs_period)
+        
+        if quota and period:
+            return quota / period
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            return os.cpu_count() or 1
+    
     def get_cpu_stats(self):
         """
         Get container CPU usage
-        Note: This is a point-in-time snapshot, not a percentage
-        For accurate CPU %, need to calculate delta between two readings
+        percent is relative to get_cpu_limit() (100 = quota fully used) and
+        needs two readings, it is missing on the first call
         """
         try:
+            usage_usec = None
             if self.cgroup_v2:
-                stat = self._read_file('/sys/fs/cgroup/cpu.stat')
+                stat = self._read_file(self._path('cpu.stat'))
                 if stat:
                     for line in stat.split('\n'):
                         if line.startswith('usage_usec'):
-                            return {'usage_usec': int(line.split()[1])}
+                            usage_usec = int(line.split()[1])
+                            break
             else:
-                usage = self._read_file('/sys/fs/cgroup/cpu/cpuacct.usage')
+                usage = self._read_file(self._path('cpu', 'cpuacct.usage'))
                 if usage:
-                    return {'usage_ns': int(usage)}
+                    usage_usec = int(usage) // 1000
+            
+            if usage_usec is None:
+                return None
+            
+            cpus = self.get_cpu_limit()
+            stats = {'usage_usec': usage_usec, 'cpus': round(cpus, 2)}
+            rate = self.rates.update('cpu', usage_usec)
+            if rate:
+                # usage_usec per second / 1e6 = CPUs busy
+                stats['percent'] = round(rate[0] / 1e6 / cpus * 100, 1)
+                stats['percent_avg'] = round(rate[1] / 1e6 / cpus * 100, 1)
+            return stats
         except Exception as e:
             logger.debug("CPU stats error: %s", str(e))
         
         return None
     
     def get_network_stats(self):
-        """Get container network stats from /proc/net/dev"""
+        """
+        Get container network stats from /proc/net/dev
+        Totals plus per-interface counters; *_rate (bytes/s) and *_rate_avg
+        (EWMA) appear from the second call on
+        """
         try:
-            with open('/proc/net/dev', 'r') as f:
+            with open(os.path.join(self.proc_root, 'net', 'dev'), 'r') as f:
                 lines = f.readlines()
             
+            now = time.monotonic()
             rx_bytes = 0
             tx_bytes = 0
+            interfaces = {}
             
             for line in lines[2:]:  # Skip header lines
-                parts = line.split()
-                if len(parts) >= 10:
-                    iface = parts[0].rstrip(':')
-                    # Skip loopback
-                    if iface != 'lo':
-                        rx_bytes += int(parts[1])
-                        tx_bytes += int(parts[9])
+                # "eth0: 123 ..." may have no space after the colon
+                name, _, counters = line.partition(':')
+                parts = counters.split()
+                iface = name.strip()
+                # Skip loopback
+                if len(parts) < 9 or iface == 'lo':
+                    continue
+                
+                rx, tx = int(parts[0]), int(parts[8])
+                rx_bytes += rx
+                tx_bytes += tx
+                stats = {'rx_bytes': rx, 'tx_bytes': tx}
+                for direction, value in (('rx', rx), ('tx', tx)):
+                    rate = self.rates.update(f"net/{iface}/{direction}", value, now)
+                    if rate:
+                        stats[f'{direction}_rate'] = int(rate[0])
+                        stats[f'{direction}_rate_avg'] = int(rate[1])
+                interfaces[iface] = stats
+            
+            for iface in self._interfaces - set(interfaces):
+                self.rates.forget(f"net/{iface}/rx")
+                self.rates.forget(f"net/{iface}/tx")
+            self._interfaces = set(interfaces)
             
-            return {
+            result = {
                 'rx_bytes': rx_bytes,
                 'rx_mb': rx_bytes // (1024 * 1024),
                 'tx_bytes': tx_bytes,
-                'tx_mb': tx_bytes // (1024 * 1024)
+                'tx_mb': tx_bytes // (1024 * 1024),
+                'interfaces': interfaces
             }
+            for direction in ('rx', 'tx'):
+                rates = [i[f'{direction}_rate'] for i in interfaces.values() if f'{direction}_rate' in i]
+                if rates:
+                    result[f'{direction}_rate'] = sum(rates)
+                    result[f'{direction}_rate_avg'] = sum(i[f'{direction}_rate_avg'] for i in interfaces.values()
+                                                          if f'{direction}_rate_avg' in i)
+            return result
         except Exception as e:
             logger.debug("Network stats error: %s", str(e))
         
         return None
     
+    def get_pressure_stats(self):
+        """
+        Get pressure stall information (cgroup v2 only)
+        Returns {resource: {'some'|'full': {'avg10', 'avg60', 'avg300', 'total'}}}
+        """
+        if not self.cgroup_v2:
+            return None
+        
+        pressure = {}
+        for resource in self.PRESSURE_RESOURCES:
+            content = self._read_file(self._path(f'{resource}.pressure'))
+            if not content:
+                continue
+            lines = {}
+            for line in content.split('\n'):
+                # some avg10=0.00 avg60=0.00 avg300=0.00 total=0
+                kind, _, fields = line.partition(' ')
+                values = dict(f.split('=', 1) for f in fields.split() if '=' in f)
+                try:
+                    lines[kind] = {
+                        'avg10': float(values['avg10']),
+                        'avg60': float(values['avg60']),
+                        'avg300': float(values['avg300']),
+                        'total': int(values['total']),
+                    }
+                except (KeyError, ValueError):
+                    logger.debug("Unexpected %s.pressure line: %s", resource, line)
+            pressure[resource] = lines
+        
+        return pressure or None
+    
+    def get_memory_breakdown(self):
+        """Get anon/file/kernel/shmem bytes from memory.stat (cgroup v2 only)"""
+        if not self.cgroup_v2:
+            return None
+        
+        content = self._read_file(self._path('memory.stat'))
+        if not content:
+            return None
+        
+        stat = {}
+        for line in content.split('\n'):
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                stat[parts[0]] = int(parts[1])
+        
+        if 'kernel' not in stat:
+            # Kernels before 5.18 have no aggregated "kernel" entry
+            stat['kernel'] = sum(stat.get(k, 0) for k in ('kernel_stack', 'pagetables', 'percpu', 'sock', 'slab'))
+        
+        return {key: stat.get(key, 0) for key in self.MEMORY_STAT_KEYS}
+    
+    def _device_name(self, device):
+        """Resolve "major:minor" to a block device name (sda, nvme0n1, ...)"""
+        link = os.path.join(self.sys_root, 'dev', 'block', device)
+        if os.path.exists(link):
+            return os.path.basename(os.path.realpath(link))
+        return device.replace(':', '_')
+    
+    def get_io_stats(self):
+        """
+        Get per-device block I/O from io.stat (cgroup v2 only)
+        Counters plus read/write bytes per second from the second call on
+        """
+        if not self.cgroup_v2:
+            return None
+        
+        content = self._read_file(self._path('io.stat'))
+        if content is None:
+            return None
+        
+        now = time.monotonic()
+        devices = {}
+        for line in content.split('\n'):
+            # 8:0 rbytes=1 wbytes=2 rios=3 wios=4 dbytes=0 dios=0
+            device, _, fields = line.partition(' ')
+            if not device:
+                continue
+            values = dict(f.split('=', 1) for f in fields.split() if '=' in f)
+            stats = {key: int(values.get(key, 0)) for key in ('rbytes', 'wbytes', 'rios', 'wios')}
+            name = self._device_name(device)
+            for key, rate_key in (('rbytes', 'read_rate'), ('wbytes', 'write_rate')):
+                rate = self.rates.update(f"io/{name}/{key}", stats[key], now)
+                if rate:
+                    stats[rate_key] = int(rate[0])
+            devices[name] = stats
+        
+        for name in self._devices - set(devices):
+            self.rates.forget(f"io/{name}/rbytes")
+            self.rates.forget(f"io/{name}/wbytes")
+        self._devices = set(devices)
+        
+        return {
+            'read_bytes': sum(d['rbytes'] for d in devices.values()),
+            'write_bytes': sum(d['wbytes'] for d in devices.values()),
+            'devices': devices
+        }
+    
     def get_all_stats(self):
         """Get all available container stats"""
         return {
             'memory': self.get_memory_stats(),
+            'memory_stat': self.get_memory_breakdown(),
             'cpu': self.get_cpu_stats(),
+            'pressure': self.get_pressure_stats(),
+            'io': self.get_io_stats(),
             'network': self.get_network_stats()
         }
 
@@ -152,9 +379,9 @@ class ContainerStats:
 # Singleton instance
 _stats = None
 
-def get_container_stats():
+def get_container_stats(root='/sys/fs/cgroup'):
     """Get container stats singleton"""
     global _stats
     if _stats is None:
-        _stats = ContainerStats()
+        _stats = ContainerStats(root)
     return _stats
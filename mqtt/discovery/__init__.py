@@ -8,6 +8,7 @@ import logging
 from config import get_config
 
 from .base import DiscoveryBase
+from .config_cache import DiscoveryConfigCache
 from .system import SystemDiscovery
 from .sessions import SessionsDiscovery
 from .library import LibraryDiscovery
@@ -38,11 +39,15 @@ class DiscoveryManager:
         self.server_id = self.config.server_id
         self.server_info = server_info
         
+        # Content hashes of published configs (persisted across restarts)
+        self.config_cache = DiscoveryConfigCache(self.config.mqtt_discovery_cache or None)
+        
         # Build device info
         self.device_info = self._build_device_info()
         
         # Initialize all discovery modules
-        args = (mqtt_client, self.base_topic, self.discovery_prefix, self.server_id, self.device_info)
+        args = (mqtt_client, self.base_topic, self.discovery_prefix, self.server_id, self.device_info,
+                self.config_cache, self.config.mqtt_state_json)
         
         self.system = SystemDiscovery(*args)
         self.sessions = SessionsDiscovery(*args)
@@ -103,21 +108,50 @@ class DiscoveryManager:
         for module in self.modules.values():
             module.device_info = self.device_info
     
+    # === Retained Config Read-back ===
+    
+    def begin_sync(self):
+        """Subscribe to retained discovery configs to compare against the broker"""
+        self.config_cache.begin_readback()
+        self.mqtt.subscribe(f"{self.discovery_prefix}/+/+/config")
+    
+    def handle_retained(self, topic, payload, retain):
+        """Handle a message on the discovery prefix, returns True if consumed"""
+        if not topic.startswith(f"{self.discovery_prefix}/"):
+            return False
+        if retain and f"/jellyfin_{self.server_id}_" in topic:
+            self.config_cache.record_retained(topic, payload)
+        return True
+    
+    def end_sync(self):
+        """Stop reading back retained configs"""
+        self.mqtt.unsubscribe(f"{self.discovery_prefix}/+/+/config")
+        count = self.config_cache.end_readback()
+        logger.info("Read back %d retained discovery configs from broker", count)
+    
     def register_all_static(self):
-        """Register all static entities from all modules"""
+        """Register all static entities from all modules (only changed or missing configs are sent)"""
+        before = self.config_cache.get_stats()
         total = 0
         for name, module in self.modules.items():
+            module.entity_count = 0
             count = module.register_all()
             logger.debug("Registered %d entities for %s", count, name)
             total += count
         
-        logger.info("Published discovery for %d static entities", total)
+        after = self.config_cache.get_stats()
+        logger.info("Discovery for %d static entities: %d published, %d unchanged",
+                    total, after['published'] - before['published'], after['skipped'] - before['skipped'])
         return total
     
+    def save_cache(self):
+        """Persist discovery config hashes"""
+        self.config_cache.save()
+    
     def register_group_switches(self, groups):
         """Register switches for API group enable/disable"""
         base = DiscoveryBase(self.mqtt, self.base_topic, self.discovery_prefix, 
-                            self.server_id, self.device_info)
+                            self.server_id, self.device_info, self.config_cache)
         
         for group_name, description in groups.items():
             base.switch(
@@ -131,16 +165,67 @@ class DiscoveryManager:
         logger.info("Published discovery for %d group switches", len(groups))
         return len(groups)
     
+    def register_group_intervals(self, groups):
+        """Register number entities for per-group poll intervals"""
+        base = DiscoveryBase(self.mqtt, self.base_topic, self.discovery_prefix, 
+                            self.server_id, self.device_info, self.config_cache)
+        
+        for group_name in groups:
+            base.number(
+                f"group_{group_name}_interval",
+                f"Jellyfin {group_name.title()} Poll Interval",
+                f"groups/{group_name}/interval",
+                f"groups/{group_name}/interval/set",
+                1, 86400, 1, "mdi:timer-cog", unit="s"
+            )
+        
+        logger.info("Published discovery for %d poll interval numbers", len(groups))
+        return len(groups)
+    
+    def register_bridge_stats(self, groups):
+        """Register sensors for the bridge's own poll and request stats"""
+        base = DiscoveryBase(self.mqtt, self.base_topic, self.discovery_prefix, 
+                            self.server_id, self.device_info, self.config_cache)
+        
+        base.sensor("bridge_poll_overruns", "Bridge Poll Overruns", "bridge/stats/overruns", "mdi:timer-alert", state_class="total_increasing")
+        base.sensor("bridge_requests", "Bridge API Requests", "bridge/stats/requests/count", "mdi:api", state_class="total_increasing")
+        base.sensor("bridge_request_errors", "Bridge API Errors", "bridge/stats/requests/errors", "mdi:alert", state_class="total_increasing")
+        base.sensor("bridge_request_timeouts", "Bridge API Timeouts", "bridge/stats/requests/timeouts", "mdi:timer-off", state_class="total_increasing")
+        base.sensor("bridge_request_latency", "Bridge API Latency", "bridge/stats/requests/avg_ms", "mdi:timer", unit="ms")
+        base.sensor("bridge_request_bytes", "Bridge API Bytes", "bridge/stats/requests/bytes", "mdi:download", unit="B", state_class="total_increasing")
+        base.sensor("bridge_command_queue", "Bridge Command Queue", "bridge/stats/commands/queue_depth", "mdi:tray-full")
+        base.sensor("bridge_publish_suppressed", "Bridge Publishes Suppressed", "bridge/stats/publish/suppressed", "mdi:filter", state_class="total_increasing")
+        
+        for group_name in groups:
+            base.sensor(f"bridge_poll_{group_name}_duration", f"Bridge {group_name.title()} Poll Duration",
+                        f"bridge/stats/polls/{group_name}/p95_ms", "mdi:timer", unit="ms")
+            base.sensor(f"bridge_poll_{group_name}_overruns", f"Bridge {group_name.title()} Poll Overruns",
+                        f"bridge/stats/polls/{group_name}/overruns", "mdi:timer-alert", state_class="total_increasing")
+        
+        logger.info("Published discovery for bridge stats (%d groups)", len(groups))
+        return 8 + 2 * len(groups)
+    
+    def document_fields(self, group):
+        """Fields the entities of a group's objects read from their state documents (MQTT_STATE_JSON)"""
+        module = self.modules.get(group)
+        return list(module.document_fields) if module else []
+    
     # === Dynamic Registration Methods ===
     
     def register_session(self, session_id, device_name, user_name, client_name):
         """Register a specific session"""
-        return self.sessions.register_session(session_id, device_name, user_name, client_name)
+        with self.sessions.state_document(f"sessions/{session_id}", 'state'):
+            return self.sessions.register_session(session_id, device_name, user_name, client_name)
     
     def unregister_session(self, session_id):
         """Unregister a session"""
         return self.sessions.unregister_session(session_id)
     
+    def register_session_slot(self, slot_key, slot_name):
+        """Register a reusable session slot"""
+        with self.sessions.state_document(f"sessions/{slot_key}", 'state'):
+            return self.sessions.register_slot(slot_key, slot_name)
+    
     def cleanup_stale_sessions(self, active_session_ids):
         """Cleanup stale sessions"""
         return self.sessions.cleanup_stale_sessions(active_session_ids)
@@ -151,19 +236,35 @@ class DiscoveryManager:
     
     def register_user(self, user_id, user_name, is_admin=False):
         """Register a specific user"""
-        return self.users.register_user(user_id, user_name, is_admin)
+        with self.users.state_document(f"users/{user_id}", 'Name'):
+            return self.users.register_user(user_id, user_name, is_admin)
     
     def register_task(self, task_id, task_name, task_key):
         """Register a specific task"""
-        return self.tasks.register_task(task_id, task_name, task_key)
+        with self.tasks.state_document(f"tasks/{task_id}", 'State'):
+            return self.tasks.register_task(task_id, task_name, task_key)
     
     def register_device(self, device_id, device_name, app_name):
         """Register a specific device"""
-        return self.devices.register_device(device_id, device_name, app_name)
+        with self.devices.state_document(f"devices/{device_id}", 'Name'):
+            return self.devices.register_device(device_id, device_name, app_name)
     
     def register_plugin(self, plugin_id, plugin_name, version):
         """Register a specific plugin"""
-        return self.plugins.register_plugin(plugin_id, plugin_name, version)
+        with self.plugins.state_document(f"plugins/{plugin_id}", 'Name'):
+            return self.plugins.register_plugin(plugin_id, plugin_name, version)
+    
+    def register_gpu(self, index, gpu_name):
+        """Register a specific GPU card"""
+        return self.misc.register_gpu(index, gpu_name)
+    
+    def register_network_interface(self, iface):
+        """Register a specific network interface"""
+        return self.misc.register_network_interface(iface)
+    
+    def register_block_device(self, device):
+        """Register a specific block device"""
+        return self.misc.register_block_device(device)
     
     def register_playlist(self, playlist_id, playlist_name, media_type):
         """Register a specific playlist"""
@@ -5,6 +5,8 @@ Discovery Base - Helper methods for creating HA entities
 
 import json
 import logging
+import threading
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
@@ -12,23 +14,62 @@ logger = logging.getLogger(__name__)
 class DiscoveryBase:
     """Base class for discovery modules"""
     
-    def __init__(self, mqtt_client, base_topic, discovery_prefix, server_id, device_info):
+    def __init__(self, mqtt_client, base_topic, discovery_prefix, server_id, device_info, config_cache=None,
+                 json_state=False):
         self.mqtt = mqtt_client
         self.base_topic = base_topic
         self.discovery_prefix = discovery_prefix
         self.server_id = server_id
         self.device_info = device_info
+        self.config_cache = config_cache
+        self.json_state = json_state
         self.entity_count = 0
+        self.document_fields = {}   # fields read from state documents, in registration order
+        self._document = threading.local()
+    
+    @contextmanager
+    def state_document(self, object_topic, attributes_field=None):
+        """
+        Entities created inside read object_topic/<field> from the object's
+        JSON document object_topic/json (MQTT_STATE_JSON); the entity of
+        attributes_field also gets all fields as attributes
+        """
+        self._document.current = (object_topic, attributes_field) if self.json_state else None
+        try:
+            yield
+        finally:
+            self._document.current = None
+    
+    def _state(self, state_topic):
+        """state_topic, or JSON document topic + value_template inside state_document()"""
+        document = getattr(self._document, 'current', None)
+        if document and state_topic.startswith(document[0] + '/'):
+            field = state_topic[len(document[0]) + 1:]
+            self.document_fields[field] = None
+            topic = f"{self.base_topic}/{document[0]}/json"
+            state = {
+                "state_topic": topic,
+                "value_template": "{{ value_json['%s'] | default(None) }}" % field,
+            }
+            if field == document[1]:
+                state["json_attributes_topic"] = topic
+            return state
+        return {"state_topic": f"{self.base_topic}/{state_topic}"}
     
     def _publish(self, component, object_id, payload):
-        """Publish discovery config"""
+        """Publish discovery config (skipped if unchanged on the broker)"""
         topic = f"{self.discovery_prefix}/{component}/jellyfin_{self.server_id}_{object_id}/config"
-        self.mqtt.publish(topic, json.dumps(payload), retain=True)
+        message = json.dumps(payload)
         self.entity_count += 1
+        if self.config_cache and not self.config_cache.needs_publish(topic, message):
+            return
+        self.mqtt.publish(topic, message, retain=True)
     
     def _remove(self, component, object_id):
         """Remove discovery config"""
         topic = f"{self.discovery_prefix}/{component}/jellyfin_{self.server_id}_{object_id}/config"
+        if self.config_cache:
+            self.config_cache.remove(topic)
         self.mqtt.publish(topic, "", retain=True)
     
     def sensor(self, object_id, name, state_topic, icon="mdi:information", unit=None, device_class=None, state_class=None, extra=None):
@@ -36,7 +77,7 @@ class DiscoveryBase:
         payload = {
             "name": name,
             "unique_id": f"jellyfin_{self.server_id}_{object_id}",
-            "state_topic": f"{self.base_topic}/{state_topic}",
+            **self._state(state_topic),
             "icon": icon,
             "device": self.device_info
         }
@@ -55,7 +96,7 @@ class DiscoveryBase:
         payload = {
             "name": name,
             "unique_id": f"jellyfin_{self.server_id}_{object_id}",
-            "state_topic": f"{self.base_topic}/{state_topic}",
+            **self._state(state_topic),
             "payload_on": payload_on,
             "payload_off": payload_off,
             "device": self.device_info
@@ -82,7 +123,7 @@ class DiscoveryBase:
         self._publish("switch", object_id, {
             "name": name,
             "unique_id": f"jellyfin_{self.server_id}_{object_id}",
-            "state_topic": f"{self.base_topic}/{state_topic}",
+            **self._state(state_topic),
             "command_topic": f"{self.base_topic}/{command_topic}",
             "payload_on": "ON",
             "payload_off": "OFF",
@@ -95,7 +136,7 @@ class DiscoveryBase:
         payload = {
             "name": name,
             "unique_id": f"jellyfin_{self.server_id}_{object_id}",
-            "state_topic": f"{self.base_topic}/{state_topic}",
+            **self._state(state_topic),
             "command_topic": f"{self.base_topic}/{command_topic}",
             "min": min_val,
             "max": max_val,
@@ -112,7 +153,7 @@ class DiscoveryBase:
         self._publish("select", object_id, {
             "name": name,
             "unique_id": f"jellyfin_{self.server_id}_{object_id}",
-            "state_topic": f"{self.base_topic}/{state_topic}",
+            **self._state(state_topic),
             "command_topic": f"{self.base_topic}/{command_topic}",
             "options": options,
             "icon": icon,
@@ -124,7 +165,7 @@ class DiscoveryBase:
         payload = {
             "name": name,
             "unique_id": f"jellyfin_{self.server_id}_{object_id}",
-            "state_topic": f"{self.base_topic}/{state_topic}",
+            **self._state(state_topic),
             "icon": icon,
             "mode": mode,
             "device": self.device_info
@@ -138,7 +179,7 @@ class DiscoveryBase:
         self._publish("media_player", object_id, {
             "name": name,
             "unique_id": f"jellyfin_{self.server_id}_{object_id}",
-            "state_topic": f"{self.base_topic}/{state_topic}",
+            **self._state(state_topic),
             "command_topic": f"{self.base_topic}/{command_topic}",
             "icon": icon,
             "device": self.device_info
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Discovery Config Cache
+Content hash per discovery topic, persisted to disk and checked against
+the retained configs read back from the broker
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(payload):
+    if isinstance(payload, bytes):
+        payload = payload.decode('utf-8', errors='replace')
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class DiscoveryConfigCache:
+    """Decides which discovery configs actually need to be (re)published"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.hashes = {}
+        self.retained = None
+        self.published = 0
+        self.skipped = 0
+        self._readback = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load persisted hashes"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.hashes = json.load(f)
+            logger.debug("Loaded %d discovery hashes from %s", len(self.hashes), self.path)
+        except (OSError, ValueError) as e:
+            logger.warning("Discovery cache unreadable, starting empty: %s", str(e))
+            self.hashes = {}
+
+    def save(self):
+        """Persist hashes (atomic replace)"""
+        if not self.path:
+            return
+        with self._lock:
+            data = dict(self.hashes)
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Could not save discovery cache: %s", str(e))
+
+    # === Broker read-back ===
+
+    def begin_readback(self):
+        """Start collecting retained configs from the broker"""
+        with self._lock:
+            self.retained = {}
+            self._readback = True
+
+    def record_retained(self, topic, payload):
+        """Store hash of a retained config delivered by the broker"""
+        with self._lock:
+            if self._readback and payload:
+                self.retained[topic] = _hash(payload)
+
+    def end_readback(self):
+        """Stop collecting, retained map is now authoritative"""
+        with self._lock:
+            self._readback = False
+            return len(self.retained or {})
+
+    # === Publish decisions ===
+
+    def needs_publish(self, topic, message):
+        """Record message hash and return True if it must be published"""
+        digest = _hash(message)
+        with self._lock:
+            unchanged = self.hashes.get(topic) == digest
+            if self.retained is not None:
+                unchanged = unchanged and self.retained.get(topic) == digest
+            self.hashes[topic] = digest
+            if unchanged:
+                self.skipped += 1
+                return False
+            if self.retained is not None:
+                self.retained[topic] = digest
+            self.published += 1
+            return True
+
+    def remove(self, topic):
+        """Forget a removed config"""
+        with self._lock:
+            self.hashes.pop(topic, None)
+            if self.retained is not None:
+                self.retained.pop(topic, None)
+
+    def get_stats(self):
+        """Get published/skipped counters"""
+        with self._lock:
+            return {
+                'published': self.published,
+                'skipped': self.skipped,
+                'topics': len(self.hashes),
+            }
@@ -11,6 +11,12 @@ class MiscDiscovery(DiscoveryBase):
     
     GROUP_NAME = 'misc'
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.registered_gpus = set()
+        self.registered_interfaces = set()
+        self.registered_block_devices = set()
+    
     def register_all(self):
         """Register ALLE misc entities"""
         
@@ -345,6 +351,16 @@ class MiscDiscovery(DiscoveryBase):
         self.sensor("gpu_pcie_link_width", "GPU PCIe Width", "gpu/pcie_width", "mdi:expansion-card-variant")
         self.sensor("gpu_processes_count", "GPU Processes Count", "gpu/processes_count", "mdi:application")
         
+        # Totals across all cards (per-card entities: register_gpu)
+        self.sensor("gpu_count", "GPU Count", "gpu/total/count", "mdi:expansion-card")
+        self.sensor("gpu_total_encoder", "GPU Total Encoder", "gpu/total/encoder", "mdi:video", unit="%")
+        self.sensor("gpu_total_decoder", "GPU Total Decoder", "gpu/total/decoder", "mdi:video-outline", unit="%")
+        self.sensor("gpu_total_utilization", "GPU Average Utilization", "gpu/total/utilization", "mdi:gauge", unit="%")
+        self.sensor("gpu_total_memory_total", "GPU Total Memory", "gpu/total/memory_total", "mdi:memory", unit="MB")
+        self.sensor("gpu_total_memory_used", "GPU Total Memory Used", "gpu/total/memory_used", "mdi:memory", unit="MB")
+        self.sensor("gpu_total_memory_percent", "GPU Total Memory %", "gpu/total/memory_percent", "mdi:memory", unit="%")
+        self.sensor("gpu_total_power", "GPU Total Power Draw", "gpu/total/power", "mdi:flash", unit="W", device_class="power")
+        
         # =====================================================================
         # CONTAINER STATS
         # =====================================================================
@@ -353,6 +369,8 @@ class MiscDiscovery(DiscoveryBase):
         self.sensor("container_status", "Container Status", "container/status", "mdi:checkbox-marked-circle")
         self.sensor("container_uptime", "Container Uptime", "container/uptime", "mdi:clock-outline")
         self.sensor("container_cpu_percent", "Container CPU %", "container/cpu_percent", "mdi:cpu-64-bit", unit="%")
+        self.sensor("container_cpu_percent_avg", "Container CPU % (smoothed)", "container/cpu_percent_avg", "mdi:cpu-64-bit", unit="%")
+        self.sensor("container_cpus", "Container CPU Limit", "container/cpus", "mdi:cpu-64-bit")
         self.sensor("container_memory_usage", "Container Memory Usage", "container/memory_used", "mdi:memory", unit="MB")
         self.sensor("container_memory_limit", "Container Memory Limit", "container/memory_limit", "mdi:memory", unit="MB")
         self.sensor("container_memory_percent", "Container Memory %", "container/memory_percent", "mdi:memory", unit="%")
@@ -360,8 +378,81 @@ class MiscDiscovery(DiscoveryBase):
         self.sensor("container_network_tx_bytes", "Container Network TX", "container/network_tx", "mdi:upload", unit="B")
         self.sensor("container_network_rx_rate", "Container Network RX Rate", "container/network_rx_rate", "mdi:download-network", unit="B/s")
         self.sensor("container_network_tx_rate", "Container Network TX Rate", "container/network_tx_rate", "mdi:upload-network", unit="B/s")
+        self.sensor("container_network_rx_rate_avg", "Container Network RX Rate (smoothed)", "container/network_rx_rate_avg", "mdi:download-network", unit="B/s")
+        self.sensor("container_network_tx_rate_avg", "Container Network TX Rate (smoothed)", "container/network_tx_rate_avg", "mdi:upload-network", unit="B/s")
         self.sensor("container_block_read", "Container Block Read", "container/block_read", "mdi:harddisk", unit="B")
         self.sensor("container_block_write", "Container Block Write", "container/block_write", "mdi:harddisk", unit="B")
         self.sensor("container_pids", "Container PIDs", "container/pids", "mdi:application-cog")
         
+        # Memory breakdown (memory.stat)
+        for key in ('anon', 'file', 'kernel', 'shmem'):
+            self.sensor(f"container_memory_{key}", f"Container Memory {key.title()}", f"container/memory/{key}", "mdi:memory", unit="MB")
+        
+        # Pressure stall information (cgroup v2 PSI)
+        for resource in ('cpu', 'memory', 'io'):
+            for kind in ('some', 'full'):
+                for window in ('avg10', 'avg60', 'avg300'):
+                    self.sensor(
+                        f"container_pressure_{resource}_{kind}_{window}",
+                        f"Container {resource.upper() if resource != 'memory' else 'Memory'} Pressure {kind.title()} {window}",
+                        f"container/pressure/{resource}/{kind}/{window}",
+                        "mdi:gauge-full", unit="%"
+                    )
+        
+        return self.entity_count
+    
+    def register_gpu(self, index, gpu_name):
+        """Register entities for one GPU card"""
+        if index in self.registered_gpus:
+            return 0
+        
+        prefix = f"gpu{index}"
+        base_topic = f"gpu/{index}"
+        label = f"GPU {index} ({gpu_name})"
+        
+        self.sensor(f"{prefix}_name", f"{label} Name", f"{base_topic}/name", "mdi:expansion-card")
+        self.sensor(f"{prefix}_uuid", f"{label} UUID", f"{base_topic}/uuid", "mdi:identifier")
+        self.sensor(f"{prefix}_utilization", f"{label} Utilization", f"{base_topic}/utilization", "mdi:gauge", unit="%")
+        self.sensor(f"{prefix}_temperature", f"{label} Temperature", f"{base_topic}/temperature", "mdi:thermometer", unit="°C", device_class="temperature")
+        self.sensor(f"{prefix}_fan_speed", f"{label} Fan Speed", f"{base_topic}/fan_speed", "mdi:fan", unit="%")
+        self.sensor(f"{prefix}_memory_total", f"{label} Memory Total", f"{base_topic}/memory_total", "mdi:memory", unit="MB")
+        self.sensor(f"{prefix}_memory_used", f"{label} Memory Used", f"{base_topic}/memory_used", "mdi:memory", unit="MB")
+        self.sensor(f"{prefix}_memory_percent", f"{label} Memory %", f"{base_topic}/memory_percent", "mdi:memory", unit="%")
+        self.sensor(f"{prefix}_encoder", f"{label} Encoder", f"{base_topic}/encoder", "mdi:video", unit="%")
+        self.sensor(f"{prefix}_decoder", f"{label} Decoder", f"{base_topic}/decoder", "mdi:video-outline", unit="%")
+        self.sensor(f"{prefix}_power", f"{label} Power Draw", f"{base_topic}/power", "mdi:flash", unit="W", device_class="power")
+        
+        self.registered_gpus.add(index)
+        return self.entity_count
+    
+    def register_network_interface(self, iface):
+        """Register throughput entities for one network interface"""
+        if iface in self.registered_interfaces:
+            return 0
+        
+        prefix = f"container_net_{iface.replace('-', '_').replace('.', '_').lower()}"
+        base_topic = f"container/network/{iface}"
+        
+        self.sensor(f"{prefix}_rx_rate", f"Network {iface} RX Rate", f"{base_topic}/rx_rate", "mdi:download-network", unit="B/s")
+        self.sensor(f"{prefix}_tx_rate", f"Network {iface} TX Rate", f"{base_topic}/tx_rate", "mdi:upload-network", unit="B/s")
+        self.sensor(f"{prefix}_rx_rate_avg", f"Network {iface} RX Rate (smoothed)", f"{base_topic}/rx_rate_avg", "mdi:download-network", unit="B/s")
+        self.sensor(f"{prefix}_tx_rate_avg", f"Network {iface} TX Rate (smoothed)", f"{base_topic}/tx_rate_avg", "mdi:upload-network", unit="B/s")
+        
+        self.registered_interfaces.add(iface)
+        return self.entity_count
+    
+    def register_block_device(self, device):
+        """Register I/O entities for one block device"""
+        if device in self.registered_block_devices:
+            return 0
+        
+        prefix = f"container_io_{device.replace('-', '_').replace('.', '_').lower()}"
+        base_topic = f"container/io/{device}"
+        
+        self.sensor(f"{prefix}_read_rate", f"Disk {device} Read Rate", f"{base_topic}/read_rate", "mdi:harddisk", unit="B/s")
+        self.sensor(f"{prefix}_write_rate", f"Disk {device} Write Rate", f"{base_topic}/write_rate", "mdi:harddisk", unit="B/s")
+        self.sensor(f"{prefix}_rios", f"Disk {device} Read Ops", f"{base_topic}/rios", "mdi:harddisk", state_class="total_increasing")
+        self.sensor(f"{prefix}_wios", f"Disk {device} Write Ops", f"{base_topic}/wios", "mdi:harddisk", state_class="total_increasing")
+        
+        self.registered_block_devices.add(device)
         return self.entity_count
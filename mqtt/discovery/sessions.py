@@ -15,6 +15,7 @@ class SessionsDiscovery(DiscoveryBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.registered_sessions = set()
+        self.registered_slots = set()
     
     def register_all(self):
         """Register ALLE session entities"""
@@ -51,10 +52,21 @@ class SessionsDiscovery(DiscoveryBase):
         if session_id in self.registered_sessions:
             return 0
         
-        short_id = session_id[:8]
-        prefix = f"session_{short_id}"
-        base_topic = f"sessions/{session_id}"
+        self._register_session_entities(f"session_{session_id[:8]}", device_name, f"sessions/{session_id}")
+        self.registered_sessions.add(session_id)
+        return self.entity_count
+    
+    def register_slot(self, slot_key, slot_name):
+        """Register the session entities of a reusable slot (MQTT_SESSION_SLOTS)"""
+        if slot_key in self.registered_slots:
+            return 0
         
+        self._register_session_entities(f"session_{slot_key}", slot_name, f"sessions/{slot_key}")
+        self.registered_slots.add(slot_key)
+        return self.entity_count
+    
+    def _register_session_entities(self, prefix, device_name, base_topic):
+        """Entities of one session or slot"""
         # =====================================================================
         # Session Basic Info
         # =====================================================================
@@ -132,6 +144,11 @@ class SessionsDiscovery(DiscoveryBase):
         self.sensor(f"{prefix}_transcode_hw_type", f"{device_name} HW Accel Type", f"{base_topic}/TranscodingInfo/HardwareAccelerationType", "mdi:expansion-card")
         self.sensor(f"{prefix}_transcode_reasons", f"{device_name} Transcode Reasons", f"{base_topic}/TranscodingInfo/TranscodeReasons", "mdi:information")
         
+        # ffmpeg process of this transcode (/proc)
+        self.sensor(f"{prefix}_transcode_cpu", f"{device_name} Transcode CPU", f"{base_topic}/transcode/cpu_percent", "mdi:cpu-64-bit", unit="%")
+        self.sensor(f"{prefix}_transcode_rss", f"{device_name} Transcode Memory", f"{base_topic}/transcode/rss_mb", "mdi:memory", unit="MB")
+        self.sensor(f"{prefix}_transcode_hwaccel", f"{device_name} Transcode HW Accel", f"{base_topic}/transcode/hwaccel", "mdi:expansion-card")
+        
         # =====================================================================
         # Session Control Buttons
         # =====================================================================
@@ -166,18 +183,17 @@ class SessionsDiscovery(DiscoveryBase):
         # =====================================================================
         self.text(f"{prefix}_message", f"{device_name} Send Message", f"{base_topic}/message/text",
                  f"{base_topic}/message/send", "mdi:message-text")
-        
-        self.registered_sessions.add(session_id)
-        return self.entity_count
     
     def unregister_session(self, session_id):
         """Remove ALL session entities"""
         if session_id not in self.registered_sessions:
             return
         
-        short_id = session_id[:8]
-        prefix = f"session_{short_id}"
-        
+        self._remove_session_entities(f"session_{session_id[:8]}")
+        self.registered_sessions.discard(session_id)
+    
+    def _remove_session_entities(self, prefix):
+        """Remove the entities of one session or slot"""
         # ALL entity suffixes
         entities = [
             ('sensor', 'id'), ('sensor', 'user_id'), ('sensor', 'user_name'), ('sensor', 'client'),
@@ -199,6 +215,7 @@ class SessionsDiscovery(DiscoveryBase):
             ('sensor', 'transcode_bitrate'), ('sensor', 'transcode_framerate'), ('sensor', 'transcode_completion'),
             ('sensor', 'transcode_width'), ('sensor', 'transcode_height'), ('sensor', 'transcode_audio_channels'),
             ('sensor', 'transcode_hw_type'), ('sensor', 'transcode_reasons'),
+            ('sensor', 'transcode_cpu'), ('sensor', 'transcode_rss'), ('sensor', 'transcode_hwaccel'),
             ('button', 'play'), ('button', 'pause'), ('button', 'playpause'), ('button', 'stop'),
             ('button', 'next'), ('button', 'previous'), ('button', 'seek_forward'), ('button', 'seek_backward'),
             ('button', 'mute'), ('button', 'unmute'), ('button', 'toggle_mute'), ('button', 'volume_up'), ('button', 'volume_down'),
@@ -207,8 +224,6 @@ class SessionsDiscovery(DiscoveryBase):
         
         for component, suffix in entities:
             self._remove(component, f"{prefix}_{suffix}")
-        
-        self.registered_sessions.discard(session_id)
     
     def cleanup_stale_sessions(self, active_session_ids):
         """Cleanup sessions that are no longer active"""
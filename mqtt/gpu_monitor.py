@@ -1,19 +1,202 @@
 #!/usr/bin/env python3
 """
 GPU Monitor using nvidia-smi
-Collects NVIDIA GPU metrics
+Collects NVIDIA GPU metrics from a streaming sampler or one-shot calls
 """
 
-import subprocess
+import time
 import logging
+import threading
+import subprocess
+from collections import deque
+
+from transcode_inspector import get_transcode_inspector
 
 logger = logging.getLogger(__name__)
 
 
+QUERY_FIELDS = (
+    'index,uuid,name,driver_version,temperature.gpu,utilization.gpu,'
+    'memory.total,memory.used,memory.free,utilization.encoder,'
+    'utilization.decoder,power.draw,fan.speed'
+)
+
+
+def _parse_int(val):
+    try:
+        return int(val)
+    except (ValueError, TypeError):
+        return 0
+
+
+def _parse_float(val):
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def parse_metrics_line(line):
+    """
+    Parse one CSV row (one GPU) of nvidia-smi --query-gpu output
+    Returns dict with metrics or None if the row is malformed
+    """
+    values = [v.strip() for v in line.strip().split(',')]
+    
+    if len(values) < 11 or not values[0].isdigit():
+        return None
+    
+    memory_total = _parse_int(values[6])
+    memory_used = _parse_int(values[7])
+    memory_percent = int((memory_used / memory_total * 100)) if memory_total > 0 else 0
+    
+    return {
+        'index': int(values[0]),
+        'uuid': values[1],
+        'name': values[2],
+        'driver_version': values[3],
+        'temperature': _parse_int(values[4]),
+        'utilization': _parse_int(values[5]),
+        'memory_total': memory_total,
+        'memory_used': memory_used,
+        'memory_free': _parse_int(values[8]),
+        'memory_percent': memory_percent,
+        'encoder': _parse_int(values[9]),
+        'decoder': _parse_int(values[10]),
+        'power': _parse_float(values[11]) if len(values) > 11 else 0.0,
+        'fan_speed': _parse_int(values[12]) if len(values) > 12 else 0,
+    }
+
+
+def parse_metrics_output(output):
+    """Parse every GPU row, returns dict keyed by GPU index"""
+    gpus = {}
+    for line in output.splitlines():
+        metrics = parse_metrics_line(line)
+        if metrics:
+            gpus[metrics['index']] = metrics
+    return gpus
+
+
+def aggregate_metrics(gpus):
+    """Totals across all cards (NVENC/NVDEC load, VRAM, power)"""
+    memory_total = sum(g['memory_total'] for g in gpus.values())
+    memory_used = sum(g['memory_used'] for g in gpus.values())
+    return {
+        'count': len(gpus),
+        'encoder': sum(g['encoder'] for g in gpus.values()),
+        'decoder': sum(g['decoder'] for g in gpus.values()),
+        'utilization': int(sum(g['utilization'] for g in gpus.values()) / len(gpus)) if gpus else 0,
+        'memory_total': memory_total,
+        'memory_used': memory_used,
+        'memory_free': sum(g['memory_free'] for g in gpus.values()),
+        'memory_percent': int(memory_used / memory_total * 100) if memory_total > 0 else 0,
+        'power': round(sum(g['power'] for g in gpus.values()), 1),
+    }
+
+
+class GPUSampler:
+    """
+    Keeps one nvidia-smi process streaming CSV rows (--loop-ms) and parses them
+    into a ring buffer, so reading metrics never forks a process
+    nvidia-smi emits one row per GPU per interval, the latest row of each
+    card is kept by index
+    """
+    
+    def __init__(self, binary='nvidia-smi', interval_ms=1000, history=120, restart_delay=5):
+        self.binary = binary
+        self.interval_ms = interval_ms
+        self.restart_delay = restart_delay
+        self.samples = deque(maxlen=history)
+        self.restarts = 0
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._process = None
+        self._running = False
+        self._thread = None
+    
+    def start(self):
+        """Start the streaming process and reader thread"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='gpu-sampler', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Terminate the streaming process"""
+        self._running = False
+        process = self._process
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if self._thread:
+            self._thread.join(timeout=5)
+    
+    def _run(self):
+        """Read streamed rows, restart the process if it exits"""
+        while self._running:
+            try:
+                self._process = subprocess.Popen(
+                    [
+                        self.binary,
+                        f'--query-gpu={QUERY_FIELDS}',
+                        '--format=csv,noheader,nounits',
+                        f'--loop-ms={self.interval_ms}'
+                    ],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1
+                )
+            except OSError as e:
+                logger.error("GPU sampler could not start %s: %s", self.binary, str(e))
+                self._running = False
+                return
+            
+            for line in self._process.stdout:
+                metrics = parse_metrics_line(line)
+                if metrics is None:
+                    logger.debug("Unexpected nvidia-smi output: %s", line.strip())
+                    continue
+                now = time.monotonic()
+                with self._lock:
+                    self._latest[metrics['index']] = (now, metrics)
+                    self.samples.append((now, metrics))
+            
+            self._process.wait()
+            self._process.stdout.close()
+            if self._running:
+                self.restarts += 1
+                logger.warning("nvidia-smi sampler exited (code %s), restarting in %ds",
+                               self._process.returncode, self.restart_delay)
+                time.sleep(self.restart_delay)
+    
+    def get_latest(self, max_age=None):
+        """Latest sample per GPU index, cards without a sample newer than max_age seconds are left out"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                index: dict(metrics)
+                for index, (sampled, metrics) in self._latest.items()
+                if max_age is None or now - sampled <= max_age
+            }
+    
+    def get_history(self):
+        """All buffered samples as (monotonic_time, metrics) tuples"""
+        with self._lock:
+            return list(self.samples)
+
+
 class GPUMonitor:
     """NVIDIA GPU monitoring via nvidia-smi"""
     
-    def __init__(self):
+    def __init__(self, binary='nvidia-smi'):
+        self.binary = binary
+        self.sampler = None
         self.available = self._check_nvidia_smi()
         if not self.available:
             logger.warning("nvidia-smi not available, GPU metrics disabled")
@@ -22,7 +205,7 @@ class GPUMonitor:
         """Check if nvidia-smi is available"""
         try:
             result = subprocess.run(
-                ['nvidia-smi', '--version'],
+                [self.binary, '--version'],
                 capture_output=True,
                 timeout=5
             )
@@ -30,22 +213,50 @@ class GPUMonitor:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
     
+    def start_sampler(self, interval_ms=1000):
+        """Start streaming sampler, get_metrics() then reads its ring buffer"""
+        if not self.available:
+            return False
+        self.sampler = GPUSampler(self.binary, interval_ms)
+        self.sampler.start()
+        logger.info("GPU sampler started (every %dms)", interval_ms)
+        return True
+    
+    def stop_sampler(self):
+        """Stop streaming sampler"""
+        if self.sampler:
+            self.sampler.stop()
+            self.sampler = None
+    
     def get_metrics(self):
         """
-        Get GPU metrics from nvidia-smi
+        Get metrics of the first GPU (kept for the single-card gpu/* topics)
         Returns dict with metrics or None if unavailable
         """
+        gpus = self.get_all_metrics()
+        return gpus[min(gpus)] if gpus else None
+    
+    def get_all_metrics(self):
+        """
+        Get metrics of every GPU keyed by index
+        Served from the streaming sampler when it has fresh samples,
+        otherwise from a one-shot nvidia-smi call
+        Returns dict (empty if unavailable)
+        """
         if not self.available:
-            return None
+            return {}
+        
+        if self.sampler:
+            gpus = self.sampler.get_latest(max_age=max(self.sampler.interval_ms * 3 / 1000, 5))
+            if gpus:
+                return gpus
         
         try:
             # Query comprehensive GPU stats
             result = subprocess.run(
                 [
-                    'nvidia-smi',
-                    '--query-gpu=name,driver_version,temperature.gpu,utilization.gpu,'
-                    'memory.total,memory.used,memory.free,utilization.encoder,'
-                    'utilization.decoder,power.draw,fan.speed',
+                    self.binary,
+                    f'--query-gpu={QUERY_FIELDS}',
                     '--format=csv,noheader,nounits'
                 ],
                 capture_output=True,
@@ -55,76 +266,32 @@ class GPUMonitor:
             
             if result.returncode != 0:
                 logger.error("nvidia-smi failed: %s", result.stderr)
-                return None
-            
-            # Parse CSV output
-            values = [v.strip() for v in result.stdout.strip().split(',')]
+                return {}
             
-            if len(values) < 9:
+            # Parse CSV output, one row per GPU
+            gpus = parse_metrics_output(result.stdout)
+            if not gpus:
                 logger.error("Unexpected nvidia-smi output: %s", result.stdout)
-                return None
-            
-            # Parse values (handle [N/A] values)
-            def parse_int(val):
-                try:
-                    return int(val)
-                except (ValueError, TypeError):
-                    return 0
-            
-            def parse_float(val):
-                try:
-                    return float(val)
-                except (ValueError, TypeError):
-                    return 0.0
-            
-            memory_total = parse_int(values[4])
-            memory_used = parse_int(values[5])
-            memory_percent = int((memory_used / memory_total * 100)) if memory_total > 0 else 0
-            
-            metrics = {
-                'name': values[0],
-                'driver_version': values[1],
-                'temperature': parse_int(values[2]),
-                'utilization': parse_int(values[3]),
-                'memory_total': memory_total,
-                'memory_used': memory_used,
-                'memory_free': parse_int(values[6]),
-                'memory_percent': memory_percent,
-                'encoder': parse_int(values[7]) if len(values) > 7 else 0,
-                'decoder': parse_int(values[8]) if len(values) > 8 else 0,
-                'power': parse_float(values[9]) if len(values) > 9 else 0.0,
-                'fan_speed': parse_int(values[10]) if len(values) > 10 else 0,
-            }
-            
-            return metrics
+            return gpus
             
         except subprocess.TimeoutExpired:
             logger.error("nvidia-smi timeout")
-            return None
+            return {}
         except Exception as e:
             logger.error("GPU metrics error: %s", str(e))
-            return None
+            return {}
     
     def get_ffmpeg_processes(self):
-        """Count active FFmpeg transcoding processes"""
-        try:
-            result = subprocess.run(
-                ['pgrep', '-c', '-f', 'ffmpeg.*jellyfin'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return int(result.stdout.strip()) if result.returncode == 0 else 0
-        except:
-            return 0
+        """Count active FFmpeg transcoding processes (/proc scan, no fork)"""
+        return len(get_transcode_inspector().scan())
 
 
 # Singleton instance
 _monitor = None
 
-def get_gpu_monitor():
+def get_gpu_monitor(binary='nvidia-smi'):
     """Get GPU monitor singleton"""
     global _monitor
     if _monitor is None:
-        _monitor = GPUMonitor()
+        _monitor = GPUMonitor(binary)
     return _monitor
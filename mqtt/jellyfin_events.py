@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Jellyfin Event Stream
+Keeps one WebSocket to Jellyfin's /socket endpoint open and dispatches
+pushed messages (Sessions, ScheduledTasksInfo, ActivityLogEntry, ...)
+"""
+
+import json
+import time
+import logging
+import threading
+from urllib.parse import urlsplit, urlunsplit, urlencode
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+logger = logging.getLogger(__name__)
+
+
+class JellyfinEventStream:
+    """WebSocket subscription to Jellyfin server events"""
+
+    # Periodic feeds that must be requested with "<Name>Start" messages
+    SUBSCRIPTIONS = ('Sessions', 'ScheduledTasksInfo', 'ActivityLogEntry')
+
+    def __init__(self, base_url, api_key, device_id='jellyfin-mqtt',
+                 interval_ms=1000, reconnect_delay=5, url=None):
+        self.url = url or self._build_url(base_url, api_key, device_id)
+        self.interval_ms = interval_ms
+        self.reconnect_delay = reconnect_delay
+        self.available = websocket is not None
+        if not self.available:
+            logger.warning("websocket-client not installed, event stream disabled")
+
+        self.handlers = {}
+        self.connected = False
+        self.message_count = 0
+        self.last_message = None
+
+        self._ws = None
+        self._running = False
+        self._thread = None
+        self._keepalive_interval = None
+
+    @staticmethod
+    def _build_url(base_url, api_key, device_id):
+        """Derive ws(s)://host/socket URL from the HTTP base URL"""
+        parts = urlsplit(base_url.rstrip('/'))
+        scheme = 'wss' if parts.scheme == 'https' else 'ws'
+        query = urlencode({'api_key': api_key, 'deviceId': device_id})
+        return urlunsplit((scheme, parts.netloc, f"{parts.path}/socket", query, ''))
+
+    def on(self, message_type, callback):
+        """Register callback(data) for a MessageType"""
+        self.handlers.setdefault(message_type, []).append(callback)
+
+    def is_live(self):
+        """True while the socket is connected"""
+        return self.connected
+
+    def start(self):
+        """Start background connection thread"""
+        if not self.available or self._running:
+            return False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='jellyfin-events', daemon=True)
+        self._thread.start()
+        threading.Thread(target=self._keepalive_loop, name='jellyfin-events-keepalive', daemon=True).start()
+        return True
+
+    def stop(self):
+        """Close socket and stop reconnecting"""
+        self._running = False
+        if self._ws:
+            self._ws.close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        """Connect, run until closed, reconnect after a delay"""
+        while self._running:
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close
+            )
+            # Without ping_interval no pings are sent, ping_timeout only bounds the
+            # dispatcher's select so a close() from stop() is noticed within a second
+            self._ws.run_forever(ping_timeout=1)
+            self.connected = False
+
+            for _ in range(int(self.reconnect_delay * 10)):
+                if not self._running:
+                    break
+                time.sleep(0.1)
+
+    def _send(self, message_type, data=None):
+        """Send a message to the server"""
+        message = {'MessageType': message_type}
+        if data is not None:
+            message['Data'] = data
+        try:
+            self._ws.send(json.dumps(message))
+        except Exception as e:
+            logger.debug("WebSocket send failed: %s", str(e))
+
+    def _keepalive_loop(self):
+        """Answer ForceKeepAlive with periodic KeepAlive messages"""
+        while self._running:
+            interval = self._keepalive_interval
+            if self.connected and interval:
+                self._send('KeepAlive')
+                time.sleep(interval)
+            else:
+                time.sleep(1)
+
+    def _on_open(self, ws):
+        if not self._running:
+            # stop() came before this socket existed and could not close it
+            ws.close()
+            return
+        logger.info("Jellyfin event stream connected")
+        self.connected = True
+        for name in self.SUBSCRIPTIONS:
+            self._send(f"{name}Start", f"0,{self.interval_ms}")
+
+    def _on_message(self, ws, message):
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            logger.debug("Invalid WebSocket message: %s", message[:200])
+            return
+
+        message_type = msg.get('MessageType')
+        data = msg.get('Data')
+        self.message_count += 1
+        self.last_message = time.monotonic()
+
+        if message_type == 'ForceKeepAlive':
+            # Data is the server timeout in seconds, answer at half of it
+            self._keepalive_interval = max(float(data or 60) / 2, 1)
+            self._send('KeepAlive')
+            return
+        if message_type == 'KeepAlive':
+            return
+
+        for callback in self.handlers.get(message_type, []):
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error("Event handler error (%s): %s", message_type, str(e))
+
+    def _on_error(self, ws, error):
+        logger.warning("Jellyfin event stream error: %s", str(error))
+
+    def _on_close(self, ws, status_code, reason):
+        if self.connected:
+            logger.warning("Jellyfin event stream closed, falling back to polling")
+        self.connected = False
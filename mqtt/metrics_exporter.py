@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Prometheus Exporter
+Serves the bridge's cached state in Prometheus text format on /metrics
+Scrapes only render what polls already stored, they never call Jellyfin
+"""
+
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if value is None:
+        return 'NaN'
+    return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return '{' + pairs + '}'
+
+
+class MetricFamily:
+    """One metric name with its type, help text and labelled samples"""
+
+    def __init__(self, name, metric_type, help_text):
+        self.name = name
+        self.type = metric_type
+        self.help = help_text
+        self.samples = {}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for labels, value in self.samples.values():
+            if self.type == 'histogram':
+                # value = (cumulative buckets [(le, count)], sum, count)
+                buckets, total, count = value
+                for bound, seen in buckets:
+                    le = '+Inf' if bound == float('inf') else repr(float(bound))
+                    lines.append(f"{self.name}_bucket{_format_labels(dict(labels, le=le))} {seen}")
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(float(total))}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+            else:
+                lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of the latest metric values
+    Polls write into it, the HTTP handler only reads
+    """
+
+    def __init__(self, prefix='jellyfin'):
+        self.prefix = prefix
+        self._families = {}
+        self._lock = threading.Lock()
+
+    def _family(self, name, metric_type, help_text):
+        full_name = f"{self.prefix}_{name}" if self.prefix else name
+        family = self._families.get(full_name)
+        if family is None:
+            family = self._families[full_name] = MetricFamily(full_name, metric_type, help_text)
+        return family
+
+    def set(self, name, value, labels=None, metric_type='gauge', help_text=''):
+        """Set a single sample"""
+        labels = labels or {}
+        with self._lock:
+            family = self._family(name, metric_type, help_text)
+            family.samples[tuple(sorted(labels.items()))] = (labels, value)
+
+    def set_family(self, name, samples, metric_type='gauge', help_text=''):
+        """
+        Replace all samples of a metric with [(labels, value), ...]
+        Label sets missing from samples disappear (e.g. ended sessions)
+        Histogram values are (cumulative buckets, sum, count)
+        """
+        with self._lock:
+            family = self._family(name, metric_type, help_text)
+            family.samples = {tuple(sorted(l.items())): (l, v) for l, v in samples}
+
+    def remove(self, name):
+        """Drop a metric entirely"""
+        full_name = f"{self.prefix}_{name}" if self.prefix else name
+        with self._lock:
+            self._families.pop(full_name, None)
+
+    def render(self):
+        """Prometheus text exposition of every metric"""
+        with self._lock:
+            lines = []
+            for name in sorted(self._families):
+                lines.extend(self._families[name].render())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """Embedded HTTP server for /metrics"""
+
+    def __init__(self, registry, host='0.0.0.0', port=9877):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.scrapes = 0
+        self._server = None
+        self._thread = None
+
+    def _handler(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                exporter.scrapes += 1
+                exporter.registry.set('exporter_scrapes_total', exporter.scrapes, metric_type='counter',
+                                      help_text='Number of /metrics scrapes')
+                body = exporter.registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("Metrics request: " + format, *args)
+
+        return Handler
+
+    def start(self):
+        """Start serving in a background thread"""
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        except OSError as e:
+            logger.error("Could not start metrics exporter on %s:%d: %s", self.host, self.port, str(e))
+            return False
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics', daemon=True)
+        self._thread.start()
+        logger.info("Prometheus metrics on http://%s:%d/metrics", self.host, self.port)
+        return True
+
+    def stop(self):
+        """Stop the HTTP server"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+MQTT 5 Transport
+Topic aliases and message expiry for bridge publishes (MQTT_PROTOCOL=5),
+and detection of brokers that only speak 3.1.1
+"""
+
+import time
+import logging
+import threading
+import collections
+import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
+
+logger = logging.getLogger(__name__)
+
+# CONNACK reason of a broker that refused the v5 CONNECT (3.1.1 code 1)
+UNSUPPORTED_PROTOCOL = 132
+
+
+def connect_properties(session_expiry):
+    """CONNECT properties, None if the session ends with the connection"""
+    if session_expiry <= 0:
+        return None
+    properties = Properties(PacketTypes.CONNECT)
+    properties.SessionExpiryInterval = session_expiry
+    return properties
+
+
+def probe_v5(host, port, client_id, username=None, password=None, timeout=5.0):
+    """
+    Connect once with MQTT 5 and return False if the broker refuses the
+    protocol version; other errors return True and surface on the real connect
+    """
+    result = {}
+    done = threading.Event()
+
+    def on_connect(client, userdata, flags, rc, properties=None):
+        result['rc'] = rc
+        done.set()
+
+    probe = mqtt.Client(client_id=f"{client_id}-probe", protocol=mqtt.MQTTv5)
+    if username:
+        probe.username_pw_set(username, password)
+    probe.on_connect = on_connect
+    try:
+        probe.connect(host, port, keepalive=10)
+    except Exception as e:
+        logger.debug("MQTT 5 probe failed: %s", str(e))
+        return True
+    probe.loop_start()
+    try:
+        done.wait(timeout)
+    finally:
+        probe.disconnect()
+        probe.loop_stop()
+    return result.get('rc') != UNSUPPORTED_PROTOCOL
+
+
+class TopicAliases:
+    """
+    Client-to-broker topic aliases of one connection
+    A topic gets an alias on its min_uses-th publish, so they go to the
+    topics that repeat every cycle. Once all are taken, the alias of the
+    topic idle for longest is reassigned if it was unused for idle_timeout
+    seconds (e.g. an ended session). The first publish with an alias
+    carries the full topic, later ones an empty topic. Aliases are only
+    valid until the next reconnect
+    """
+
+    def __init__(self, limit=100, min_uses=2, idle_timeout=30):
+        self.limit = limit
+        self.min_uses = min_uses
+        self.idle_timeout = idle_timeout
+        self.maximum = 0
+        self._aliases = collections.OrderedDict()   # topic -> [alias, established, last use], oldest use first
+        self._uses = {}
+        self.assigned = 0
+        self.reassigned = 0
+        self.hits = 0
+        self.saved_bytes = 0
+
+    def reset(self, broker_maximum):
+        """New connection (broker's TopicAliasMaximum) or disconnect (0)"""
+        self.maximum = min(self.limit, broker_maximum)
+        self._aliases.clear()
+        self._uses.clear()
+
+    def lookup(self, topic):
+        """(topic to send, alias or None, established)"""
+        now = time.monotonic()
+        entry = self._aliases.get(topic)
+        if entry is not None:
+            entry[2] = now
+            self._aliases.move_to_end(topic)
+            return ('' if entry[1] else topic), entry[0], entry[1]
+        if not self.maximum:
+            return topic, None, False
+        uses = self._uses.get(topic, 0) + 1
+        if uses < self.min_uses:
+            if len(self._uses) >= 8 * self.maximum:
+                self._uses.clear()
+            self._uses[topic] = uses
+            return topic, None, False
+        if len(self._aliases) < self.maximum:
+            alias = len(self._aliases) + 1
+        else:
+            idle_topic, (alias, _, last_use) = next(iter(self._aliases.items()))
+            if now - last_use < self.idle_timeout:
+                return topic, None, False
+            del self._aliases[idle_topic]
+            self.reassigned += 1
+        self._uses.pop(topic, None)
+        self._aliases[topic] = [alias, False, now]
+        self.assigned += 1
+        return topic, alias, False
+
+    def sent(self, topic, alias, established):
+        """Record a successful publish with an alias"""
+        if established:
+            self.hits += 1
+            self.saved_bytes += len(topic.encode('utf-8'))
+        else:
+            self._aliases[topic][1] = True
+
+
+class MQTT5Publisher:
+    """
+    Publishes through a v5 client with topic aliases on repeated topics and
+    a message expiry on non-retained messages, so brokers drop playback
+    state that could not be delivered in time instead of delivering it late.
+    Retained messages never expire, they are the state Home Assistant reads
+    after a restart. Same publish() signature as the paho client
+    """
+
+    def __init__(self, client, topic_aliases=100, message_expiry=60):
+        self.client = client
+        self.aliases = TopicAliases(topic_aliases)
+        self.message_expiry = message_expiry
+        self.expiring = 0
+        self._properties = {}   # (alias, expiring) -> Properties, packed per publish so they can be shared
+        self._lock = threading.Lock()
+
+    def on_connect(self, properties):
+        """Apply the broker's CONNACK properties"""
+        with self._lock:
+            self.aliases.reset(getattr(properties, 'TopicAliasMaximum', 0))
+            maximum = self.aliases.maximum
+        logger.info("MQTT 5: %d topic aliases, message expiry %s", maximum,
+                    f"{self.message_expiry}s" if self.message_expiry else "off")
+
+    def on_disconnect(self):
+        with self._lock:
+            self.aliases.reset(0)
+
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        """Publish like paho's Client.publish"""
+        # Held across the publish so an alias is queued before its first empty-topic use
+        with self._lock:
+            send_topic, alias, established = self.aliases.lookup(topic)
+            expiring = bool(self.message_expiry) and not retain
+            self.expiring += expiring
+            info = self.client.publish(send_topic, payload, qos=qos, retain=retain,
+                                       properties=self._publish_properties(alias, expiring))
+            if alias and info.rc == mqtt.MQTT_ERR_SUCCESS:
+                self.aliases.sent(topic, alias, established)
+            return info
+
+    def _publish_properties(self, alias, expiring):
+        """Shared PUBLISH properties (caller locks)"""
+        if not alias and not expiring:
+            return None
+        properties = self._properties.get((alias, expiring))
+        if properties is None:
+            properties = Properties(PacketTypes.PUBLISH)
+            if alias:
+                properties.TopicAlias = alias
+            if expiring:
+                properties.MessageExpiryInterval = self.message_expiry
+            self._properties[(alias, expiring)] = properties
+        return properties
+
+    def get_stats(self):
+        """Alias use and expiring messages"""
+        with self._lock:
+            return {
+                'alias_maximum': self.aliases.maximum,
+                'aliases': self.aliases.assigned,
+                'reassigned': self.aliases.reassigned,
+                'alias_hits': self.aliases.hits,
+                'saved_bytes': self.aliases.saved_bytes,
+                'expiring': self.expiring,
+            }
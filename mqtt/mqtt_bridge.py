@@ -6,16 +6,30 @@ Main entry point - Modular API with ALL entities
 
 import sys
 import time
-import json
+import asyncio
 import signal
 import logging
+import threading
 import paho.mqtt.client as mqtt
 
 from config import get_config
 from discovery import DiscoveryManager
 from api import JellyfinAPI
-from gpu_monitor import get_gpu_monitor
+from api.async_client import AsyncJellyfinAPI
+from scheduler import PollScheduler
+from jellyfin_events import JellyfinEventStream
+from publish_cache import LastValueCache, StateDocuments, format_payload, pick_fields
+from outbound_queue import OutboundQueue
+from mqtt5_transport import MQTT5Publisher, connect_properties, probe_v5
+from session_slots import SessionSlots
+from session_index import SessionIndex
+from position_ticker import PositionTicker
+from topic_router import TopicRouter
+from command_executor import CommandExecutor, PRIORITY_PLAYBACK, PRIORITY_DEFAULT
+from transcode_inspector import get_transcode_inspector
+from gpu_monitor import get_gpu_monitor, aggregate_metrics
 from container_stats import get_container_stats
+from metrics_exporter import MetricsRegistry, MetricsExporter
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +39,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Values a released session slot is reset to (everything else is cleared)
+SLOT_DEFAULTS = {'state': 'idle', 'is_transcoding': False, 'progress': 0, 'position': '00:00:00',
+                 'duration': '00:00:00'}
+SLOT_TOPICS = ('Id', 'state', 'is_transcoding', 'user', 'client', 'device', 'media/title', 'media/type',
+               'media/series', 'progress', 'position', 'duration')
+TRANSCODE_TOPICS = ('pid', 'cpu_percent', 'cpu_seconds', 'rss_mb', 'read_bytes', 'write_bytes', 'hwaccel',
+                    'video_codec', 'audio_codec', 'bitrate', 'input', 'output_dir')
+# Process fields for transcoding/processes; usage counters change every scan and go to sessions/<id>/transcode/*
+PROCESS_FIELDS = ('pid', 'hwaccel', 'video_codec', 'audio_codec', 'bitrate', 'input', 'output_dir')
+
 
 class MQTTBridge:
     """Main MQTT Bridge class"""
@@ -33,25 +57,47 @@ class MQTTBridge:
         self.config = get_config()
         self.running = False
         self.mqtt_client = None
+        self.publisher = None
         self.discovery = None
         self.jellyfin = None
+        self.jellyfin_async = None
+        self.scheduler = None
+        self.events = None
+        self.publish_cache = None
+        self.state_docs = None
+        self.outbound = None
+        self.session_slots = None
+        self.positions = None
+        self.commands = None
+        self.router = None
         self.gpu = None
+        self.transcodes = None
+        self.metrics = None
+        self.metrics_exporter = None
         self.container = None
         
         # State tracking
         self.server_info = None
         self.last_sessions = {}
+        self.transcode_keys = set()   # session topic keys with transcode/* fields published
+        self.session_index = SessionIndex()
         self.registered_users = set()
         self.registered_libraries = set()
         self.registered_tasks = set()
         self.registered_devices = set()
         self.registered_plugins = set()
+        self.task_ids_by_key = {}
+        
+        # Event stream: sessions/tasks are pushed, polling only reconciles
+        self._sessions_lock = threading.Lock()
+        self._tasks_lock = threading.Lock()
+        self._last_reconcile = {}
 
-    def setup_mqtt(self):
-        """Initialize MQTT client"""
+    def setup_mqtt(self, v5=False):
+        """Initialize MQTT client (MQTT 5 with topic aliases and message expiry, or 3.1.1)"""
         self.mqtt_client = mqtt.Client(
             client_id=self.config.mqtt_client_id,
-            protocol=mqtt.MQTTv311
+            protocol=mqtt.MQTTv5 if v5 else mqtt.MQTTv311
         )
         
         if self.config.mqtt_user:
@@ -61,80 +107,132 @@ class MQTTBridge:
         self.mqtt_client.on_connect = self._on_connect
         self.mqtt_client.on_disconnect = self._on_disconnect
         self.mqtt_client.on_message = self._on_message
+        self.router = self._build_router()
+        self.publisher = self.mqtt_client
+        if v5:
+            self.publisher = MQTT5Publisher(
+                self.mqtt_client,
+                topic_aliases=self.config.mqtt_topic_aliases,
+                message_expiry=self.config.mqtt_message_expiry
+            )
+        if self.config.mqtt_outbound_queue > 0:
+            self.outbound = OutboundQueue(
+                self.publisher,
+                max_messages=self.config.mqtt_outbound_queue,
+                rate=self.config.mqtt_outbound_rate,
+                on_drop=self._on_outbound_drop
+            )
         
         return self.mqtt_client
     
-    def _on_connect(self, client, userdata, flags, rc):
-        """MQTT connection callback"""
+    def _build_router(self):
+        """Command routes, one subscription each (patterns must not overlap)"""
+        router = TopicRouter(self.config.mqtt_topic)
+        router.add('groups/+/interval/set', self._handle_group_interval)
+        router.add('groups/+/set', self._handle_group_command)
+        router.add('sessions/+/command', lambda session_id, payload: self._dispatch_command(
+            'session', self._handle_session_command, session_id, payload,
+            priority=PRIORITY_PLAYBACK, key=f"sessions/{session_id}"))
+        router.add('sessions/+/volume/set', lambda session_id, payload: self._dispatch_command(
+            'volume', self._handle_volume_set, session_id, payload,
+            priority=PRIORITY_PLAYBACK, key=f"sessions/{session_id}"))
+        router.add('system/command', lambda payload: self._dispatch_command(
+            'system', self._handle_system_command, payload, key='system'))
+        for pattern in ('library/command', 'library/+/command'):
+            router.add(pattern, lambda *args: self._dispatch_command(
+                'library', self._handle_library_command, args[-1], key='library'))
+        router.add('tasks/command', lambda payload: self._dispatch_command(
+            'task', self._handle_task_command, None, payload, key='tasks'))
+        router.add('tasks/+/command', lambda task_id, payload: self._dispatch_command(
+            'task', self._handle_task_command, task_id, payload, key=f"tasks/{task_id}"))
+        return router
+    
+    def _on_connect(self, client, userdata, flags, rc, properties=None):
+        """MQTT connection callback (properties only with MQTT 5)"""
         if rc == 0:
             logger.info("Connected to MQTT broker at %s:%d", self.config.mqtt_host, self.config.mqtt_port)
+            if isinstance(self.publisher, MQTT5Publisher):
+                self.publisher.on_connect(properties)
+            if self.outbound:
+                # Resend last values paced through the queue, polls then only publish changes
+                if self.publish_cache:
+                    for topic in self.outbound.resync(self.publish_cache.items()):
+                        self._on_outbound_drop(topic)
+                self.outbound.set_connected(True)
+            elif self.publish_cache:
+                self.publish_cache.clear()
             client.publish(f"{self.config.mqtt_topic}/status", "online", qos=1, retain=True)
             
-            # Subscribe to command topics
-            base = self.config.mqtt_topic
-            client.subscribe(f"{base}/+/command")
-            client.subscribe(f"{base}/+/+/command")
-            client.subscribe(f"{base}/groups/+/set")
-            client.subscribe(f"{base}/sessions/+/command")
-            client.subscribe(f"{base}/sessions/+/+/set")
-            logger.info("Subscribed to command topics")
+            # Subscribe to command topics, QoS 1 lets a persistent MQTT 5 session queue commands
+            qos = 1 if self._persistent_session() else 0
+            client.subscribe([(topic, qos) for topic in self.router.subscriptions()])
+            logger.info("Subscribed to %d command topics", len(self.router.subscriptions()))
             
-            # Publish discovery
+            # Read back retained discovery configs, then publish only changed ones
             if self.discovery:
-                self.discovery.register_all_static()
-                self.discovery.register_group_switches(self.jellyfin.GROUPS)
-                self._publish_group_states()
+                self.discovery.begin_sync()
+                timer = threading.Timer(self.config.mqtt_discovery_sync_wait, self._publish_discovery)
+                timer.daemon = True
+                timer.start()
         else:
-            logger.error("MQTT connection failed with code: %d", rc)
+            logger.error("MQTT connection failed with code: %s", rc)
+    
+    def _publish_discovery(self):
+        """Publish discovery configs after the retained read-back window"""
+        try:
+            self.discovery.end_sync()
+            self.discovery.register_all_static()
+            self.discovery.register_group_switches(self.jellyfin.GROUPS)
+            self.discovery.register_group_intervals(self.scheduler.jobs)
+            if self.session_slots:
+                for slot in range(self.session_slots.size):
+                    self.discovery.register_session_slot(SessionSlots.key(slot), f"Session {slot + 1}")
+            if self.config.mqtt_stats_discovery:
+                self.discovery.register_bridge_stats(self.scheduler.jobs)
+            self.discovery.save_cache()
+            self._publish_group_states()
+            self._publish_group_intervals()
+        except Exception as e:
+            logger.error("Discovery publish error: %s", str(e))
     
-    def _on_disconnect(self, client, userdata, rc):
+    def _on_outbound_drop(self, topic):
+        """A buffered update was evicted, let the next poll publish the topic again"""
+        if self.publish_cache:
+            self.publish_cache.forget(topic)
+    
+    def _on_disconnect(self, client, userdata, rc, properties=None):
+        if self.outbound:
+            self.outbound.set_connected(False)
+        if isinstance(self.publisher, MQTT5Publisher):
+            self.publisher.on_disconnect()
         if rc != 0:
-            logger.warning("Unexpected MQTT disconnect (code: %d)", rc)
+            logger.warning("Unexpected MQTT disconnect (code: %s)", rc)
+
+    def _persistent_session(self):
+        """True if the broker keeps subscriptions across reconnects (MQTT 5 session expiry)"""
+        return isinstance(self.publisher, MQTT5Publisher) and self.config.mqtt_session_expiry > 0
 
     def _on_message(self, client, userdata, msg):
         """Handle incoming MQTT messages"""
         topic = msg.topic
+        if self.discovery and self.discovery.handle_retained(topic, msg.payload, msg.retain):
+            return
+        
         payload = msg.payload.decode('utf-8')
         logger.info("Command: %s = %s", topic, payload)
         
         try:
-            parts = topic.split('/')
-            
-            # Group switches
-            if '/groups/' in topic and topic.endswith('/set'):
-                group_name = parts[parts.index('groups') + 1]
-                self._handle_group_command(group_name, payload)
-            
-            # Session commands
-            elif '/sessions/' in topic and topic.endswith('/command'):
-                session_id = parts[parts.index('sessions') + 1]
-                self._handle_session_command(session_id, payload)
-            
-            # Volume set
-            elif '/sessions/' in topic and '/volume/set' in topic:
-                session_id = parts[parts.index('sessions') + 1]
-                self._handle_volume_set(session_id, payload)
-            
-            # System commands
-            elif topic.endswith('/system/command'):
-                self._handle_system_command(payload)
-            
-            # Library commands
-            elif '/library/' in topic and topic.endswith('/command'):
-                self._handle_library_command(payload)
-            
-            # Task commands
-            elif '/tasks/' in topic and topic.endswith('/command'):
-                task_id = None
-                if 'tasks' in parts:
-                    idx = parts.index('tasks')
-                    if idx + 1 < len(parts) and parts[idx + 1] != 'command':
-                        task_id = parts[idx + 1]
-                self._handle_task_command(task_id, payload)
-                
+            self.router.route(topic, payload, dup=bool(msg.dup))
         except Exception as e:
             logger.error("Command error: %s", str(e))
 
+    def _dispatch_command(self, name, handler, *args, priority=PRIORITY_DEFAULT, key=None):
+        """Run a command handler on the command executor (inline if there is none), in order per key"""
+        if self.commands:
+            self.commands.submit(name, handler, *args, priority=priority, key=key)
+        else:
+            handler(*args)
+    
     def _handle_group_command(self, group_name, payload):
         """Handle group enable/disable"""
         if group_name in self.jellyfin.GROUPS:
@@ -143,6 +241,17 @@ class MQTTBridge:
             logger.info("Group '%s' %s", group_name, "enabled" if enabled else "disabled")
             self.publish(f"groups/{group_name}/state", "ON" if enabled else "OFF", retain=True)
     
+    def _handle_group_interval(self, group_name, payload):
+        """Handle poll interval change for a group"""
+        try:
+            interval = int(float(payload))
+        except ValueError:
+            logger.warning("Invalid poll interval for '%s': %s", group_name, payload)
+            return
+        if self.scheduler.set_interval(group_name, interval):
+            logger.info("Group '%s' poll interval set to %ds", group_name, self.scheduler.get_interval(group_name))
+            self.publish(f"groups/{group_name}/interval", self.scheduler.get_interval(group_name), retain=True)
+    
     def _handle_system_command(self, payload):
         """Handle system commands"""
         if payload == "restart":
@@ -150,13 +259,17 @@ class MQTTBridge:
         elif payload == "shutdown":
             self.jellyfin.system.shutdown_server()
     
+    def _resolve_session(self, session_key):
+        """Full session id from a command topic key (session id, 8+ char prefix, DeviceId or slot_N)"""
+        if self.session_slots:
+            slot = SessionSlots.parse_key(session_key)
+            if slot is not None:
+                return self.session_slots.get_session(slot)
+        return self.session_index.resolve(session_key)
+    
     def _handle_session_command(self, session_id, command):
         """Handle session playback commands"""
-        full_id = None
-        for sid in self.last_sessions.keys():
-            if sid.startswith(session_id) or session_id in sid:
-                full_id = sid
-                break
+        full_id = self._resolve_session(session_id)
         
         if not full_id:
             logger.warning("Session not found: %s", session_id)
@@ -179,11 +292,7 @@ class MQTTBridge:
     
     def _handle_volume_set(self, session_id, payload):
         """Handle volume set command"""
-        full_id = None
-        for sid in self.last_sessions.keys():
-            if sid.startswith(session_id) or session_id in sid:
-                full_id = sid
-                break
+        full_id = self._resolve_session(session_id)
         
         if full_id:
             try:
@@ -204,12 +313,14 @@ class MQTTBridge:
         elif task_id and payload == "stop":
             self.jellyfin.tasks.stop_scheduled_task(task_id)
         elif payload in ['RefreshLibrary', 'DeleteCache', 'DeleteTranscode', 'RefreshPeople', 'OptimizeDatabase']:
-            tasks = self.jellyfin.tasks.get_scheduled_tasks()
-            if tasks:
-                for task in tasks:
-                    if task.get('Key') == payload:
-                        self.jellyfin.tasks.start_scheduled_task(task.get('Id'))
-                        break
+            # Key -> Id map is kept by publish_tasks, only fetch if unknown
+            task_id = self.task_ids_by_key.get(payload)
+            if not task_id:
+                tasks = self.jellyfin.tasks.get_scheduled_tasks() or []
+                self.task_ids_by_key = {t.get('Key'): t.get('Id') for t in tasks if t.get('Key')}
+                task_id = self.task_ids_by_key.get(payload)
+            if task_id:
+                self.jellyfin.tasks.start_scheduled_task(task_id)
     
     def _publish_group_states(self):
         """Publish current state of all groups"""
@@ -217,18 +328,48 @@ class MQTTBridge:
             enabled = self.jellyfin.is_group_enabled(group_name)
             self.publish(f"groups/{group_name}/state", "ON" if enabled else "OFF", retain=True)
     
-    def publish(self, topic_suffix, payload, retain=False):
-        """Publish message to MQTT"""
+    def _publish_group_intervals(self):
+        """Publish current poll interval of all groups"""
+        for group_name, schedule in self.scheduler.get_schedule().items():
+            self.publish(f"groups/{group_name}/interval", schedule['interval'], retain=True)
+    
+    def publish(self, topic_suffix, payload, retain=False, force=False):
+        """Publish message to MQTT (unchanged payloads are suppressed unless force)"""
         topic = f"{self.config.mqtt_topic}/{topic_suffix}"
-        if isinstance(payload, (dict, list)):
-            payload = json.dumps(payload)
-        elif isinstance(payload, bool):
-            payload = "true" if payload else "false"
-        elif payload is None:
-            payload = ""
-        else:
-            payload = str(payload)
-        self.mqtt_client.publish(topic, payload, retain=retain)
+        payload = format_payload(payload)
+        job = self.scheduler.current_job() if self.scheduler else None
+        if not force and self.publish_cache and not self.publish_cache.should_publish(topic, payload, retain):
+            if job:
+                job.suppressed += 1
+            return
+        if job:
+            job.publishes += 1
+        if self.outbound:
+            self.outbound.publish(topic, payload, retain=retain)
+            return
+        info = self.publisher.publish(topic, payload, retain=retain)
+        if info.rc != mqtt.MQTT_ERR_SUCCESS:
+            logger.debug("Publish to %s failed (rc=%d)", topic, info.rc)
+            if self.publish_cache:
+                self.publish_cache.forget(topic)
+    
+    def publish_fields(self, prefix, fields, replace=False, source=None):
+        """
+        Publish fields of one object: a topic each, or merged into prefix/json
+        (MQTT_STATE_JSON). The document also gets the fields of source (the
+        Jellyfin object) that the group's discovery entities read from it
+        """
+        if not self.state_docs:
+            for field, value in fields.items():
+                self.publish(f"{prefix}/{field}", value)
+            return
+        if source:
+            paths = self.discovery.document_fields(prefix.split('/')[0])
+            # Jellyfin fields (PascalCase) the object no longer has are blanked, not kept
+            picked = {path: '' for path in paths if path[:1].isupper()}
+            picked.update(pick_fields(source, paths))
+            fields = {**picked, **fields}
+        self.publish(f"{prefix}/json", self.state_docs.update(prefix, fields, replace))
     
     def _ticks_to_time(self, ticks):
         """Convert ticks to HH:MM:SS"""
@@ -277,17 +418,34 @@ class MQTTBridge:
             self.publish("system/logs/count", len(logs))
 
     def poll_sessions(self):
-        """Poll sessions group data"""
+        """Poll sessions group data (reconcile pass while event stream is live)"""
         if not self.jellyfin.is_group_enabled('sessions'):
             return
+        if self._event_driven('sessions'):
+            return
         
         # api/sessions.py: get_sessions()
         sessions = self.jellyfin.sessions.get_sessions()
+        self.publish_sessions(sessions)
+    
+    def publish_sessions(self, sessions):
+        """Publish session state from /Sessions poll or Sessions event"""
+        with self._sessions_lock:
+            self._publish_sessions(sessions)
+    
+    def _publish_sessions(self, sessions):
+        """Publish sessions (caller holds _sessions_lock)"""
         current_sessions = {}
         playing = 0
         paused = 0
         transcoding = 0
         
+        # Reset freed slots first, a new session may take one over right away
+        if self.session_slots and sessions is not None:
+            _, released = self.session_slots.update(sessions)
+            for slot in released:
+                self._clear_slot(slot)
+        
         if sessions:
             for session in sessions:
                 session_id = session.get('Id', '')
@@ -299,8 +457,8 @@ class MQTTBridge:
                 user_name = session.get('UserName', 'Unknown')
                 client = session.get('Client', '')
                 
-                # Register new session
-                if session_id not in self.last_sessions:
+                # Register new session (slots are registered once at startup)
+                if session_id not in self.last_sessions and not self.session_slots:
                     self.discovery.register_session(session_id, device_name, user_name, client)
                 
                 # Parse session state
@@ -324,31 +482,131 @@ class MQTTBridge:
                     transcoding += 1
                 
                 # Publish session data
-                prefix = f"sessions/{session_id}"
-                self.publish(f"{prefix}/state", state)
-                self.publish(f"{prefix}/user", user_name)
-                self.publish(f"{prefix}/client", client)
-                self.publish(f"{prefix}/device", device_name)
+                key = self._session_key(session_id)
+                if key is None:
+                    continue
+                fields = {
+                    'Id': session_id,
+                    'state': state,
+                    'is_transcoding': is_transcoding,
+                    'user': user_name,
+                    'client': client,
+                    'device': device_name,
+                }
 
                 if now_playing:
-                    self.publish(f"{prefix}/media/title", now_playing.get('Name', ''))
-                    self.publish(f"{prefix}/media/type", now_playing.get('Type', ''))
-                    self.publish(f"{prefix}/media/series", now_playing.get('SeriesName', ''))
+                    fields['media/title'] = now_playing.get('Name', '')
+                    fields['media/type'] = now_playing.get('Type', '')
+                    fields['media/series'] = now_playing.get('SeriesName', '')
                     
                     duration = now_playing.get('RunTimeTicks', 0)
                     position = session.get('PlayState', {}).get('PositionTicks', 0)
                     progress = (position / duration * 100) if duration > 0 else 0
+                    if self.positions:
+                        rate = session.get('PlayState', {}).get('PlaybackRate') or 1.0
+                        self.positions.resync(key, position, duration, is_paused, rate)
                     
-                    self.publish(f"{prefix}/progress", round(progress, 1))
-                    self.publish(f"{prefix}/position", self._ticks_to_time(position))
-                    self.publish(f"{prefix}/duration", self._ticks_to_time(duration))
+                    fields['progress'] = round(progress, 1)
+                    fields['position'] = self._ticks_to_time(position)
+                    if self.config.mqtt_state_json:
+                        # Seek number state; as its own topic it would double the per-second position traffic
+                        fields['position_seconds'] = int(position // 10_000_000)
+                    fields['duration'] = self._ticks_to_time(duration)
+                elif self.positions:
+                    self.positions.forget(key)
+                self.publish_fields(f"sessions/{key}", fields, source=session)
             
             self.publish("sessions/playing_count", playing)
             self.publish("sessions/paused_count", paused)
             self.publish("sessions/transcoding_count", transcoding)
             self.publish("sessions/total_count", len(sessions))
         
+        self._publish_transcodes(sessions or [])
+        self._record_session_metrics(current_sessions, playing, paused, transcoding)
+        
+        if not self.session_slots and sessions is not None:
+            for session_id in self.last_sessions.keys() - current_sessions.keys():
+                self.discovery.unregister_session(session_id)
+                if self.positions:
+                    self.positions.forget(session_id)
+                if self.publish_cache:
+                    self.publish_cache.forget(f"{self.config.mqtt_topic}/sessions/{session_id}/")
+                if self.state_docs:
+                    self.state_docs.forget(f"sessions/{session_id}")
+        
         self.last_sessions = current_sessions
+        self.session_index.update(current_sessions)
+    
+    def _session_key(self, session_id):
+        """Topic key of a session: its id, or slot_N with MQTT_SESSION_SLOTS (None = pool full)"""
+        if not self.session_slots:
+            return session_id
+        slot = self.session_slots.get_slot(session_id)
+        return SessionSlots.key(slot) if slot is not None else None
+    
+    def _clear_slot(self, slot):
+        """Reset the topics of a slot whose session ended"""
+        prefix = f"sessions/{SessionSlots.key(slot)}"
+        if self.positions:
+            self.positions.forget(SessionSlots.key(slot))
+        fields = {topic: SLOT_DEFAULTS.get(topic, '') for topic in SLOT_TOPICS}
+        if self.config.mqtt_state_json:
+            fields['position_seconds'] = 0
+        fields.update({f"transcode/{topic}": '' for topic in TRANSCODE_TOPICS})
+        self.publish_fields(prefix, fields, replace=True)
+    
+    def publish_positions(self):
+        """Publish extrapolated position/progress of playing sessions between polls"""
+        if not self.jellyfin.is_group_enabled('sessions'):
+            return
+        with self._sessions_lock:
+            for key, (position, duration) in self.positions.positions().items():
+                progress = (position / duration * 100) if duration > 0 else 0
+                fields = {
+                    'progress': round(progress, 1),
+                    'position': self._ticks_to_time(position),
+                }
+                if self.config.mqtt_state_json:
+                    fields['position_seconds'] = int(position // 10_000_000)
+                self.publish_fields(f"sessions/{key}", fields)
+    
+    def _publish_transcodes(self, sessions):
+        """Publish ffmpeg processes and attach them to transcoding sessions"""
+        processes = self.transcodes.scan()
+        matched = self.transcodes.correlate(processes, sessions)
+        
+        self.publish("transcoding/count", len(processes))
+        self.publish("transcoding/active", "true" if processes else "false")
+        self.publish("transcoding/processes",
+                     [{field: p.get(field) for field in PROCESS_FIELDS} for p in processes])
+        
+        self._record_transcode_metrics(processes, matched, sessions)
+        
+        # Sessions still here whose transcode ended (ended sessions are cleaned up with the rest of their topics)
+        keys = {self._session_key(s.get('Id')) for s in sessions if s.get('Id')} - {None}
+        matched_keys = {self._session_key(session_id) for session_id in matched} - {None}
+        for key in (self.transcode_keys & keys) - matched_keys:
+            self.publish_fields(f"sessions/{key}", {f"transcode/{topic}": '' for topic in TRANSCODE_TOPICS})
+        self.transcode_keys = matched_keys
+        
+        for session_id, process in matched.items():
+            key = self._session_key(session_id)
+            if key is None:
+                continue
+            self.publish_fields(f"sessions/{key}", {
+                'transcode/pid': process['pid'],
+                'transcode/cpu_percent': process.get('cpu_percent', 0),
+                'transcode/cpu_seconds': process['cpu_seconds'],
+                'transcode/rss_mb': process['rss_bytes'] // (1024 * 1024),
+                'transcode/read_bytes': process.get('read_bytes', 0),
+                'transcode/write_bytes': process.get('write_bytes', 0),
+                'transcode/hwaccel': process.get('hwaccel') or 'none',
+                'transcode/video_codec': process.get('video_codec') or '',
+                'transcode/audio_codec': process.get('audio_codec') or '',
+                'transcode/bitrate': process.get('bitrate') or 0,
+                'transcode/input': process.get('input') or '',
+                'transcode/output_dir': process.get('output_dir') or '',
+            })
     
     def poll_library(self):
         """Poll library group data"""
@@ -371,6 +629,13 @@ class MQTTBridge:
                 if lib_id:
                     self.publish(f"library/{lib_id}/name", lib_name)
                     self.publish(f"library/{lib_id}/type", lib_type)
+            
+            if self.metrics:
+                self.metrics.set_family('library_info', [
+                    ({'library': f.get('Name', ''), 'library_id': f.get('ItemId', ''),
+                      'type': f.get('CollectionType', 'mixed')}, 1)
+                    for f in folders if f.get('ItemId')
+                ], help_text='Library folders')
         
         # api/library.py: get_media_folders()
         media_folders = self.jellyfin.library.get_media_folders()
@@ -413,7 +678,7 @@ class MQTTBridge:
                 user_name = user.get('Name', '')
                 is_admin = user.get('Policy', {}).get('IsAdministrator', False)
                 
-                is_online = any(s.get('UserId') == user_id for s in self.last_sessions.values())
+                is_online = self.session_index.is_user_online(user_id)
                 if is_online:
                     online_count += 1
                 
@@ -422,11 +687,17 @@ class MQTTBridge:
                     self.registered_users.add(user_id)
                 
                 if user_id:
-                    self.publish(f"users/{user_id}/name", user_name)
-                    self.publish(f"users/{user_id}/online", is_online)
-                    self.publish(f"users/{user_id}/is_admin", is_admin)
+                    self.publish_fields(f"users/{user_id}", {
+                        'name': user_name,
+                        'online': is_online,
+                        'is_admin': is_admin,
+                    }, source=user)
             
             self.publish("users/online_count", online_count)
+            
+            if self.metrics:
+                self.metrics.set('users', len(users), help_text='Number of users')
+                self.metrics.set('users_online', online_count, help_text='Users with an active session')
         
         # api/users.py: get_public_users()
         public = self.jellyfin.users.get_public_users()
@@ -441,13 +712,25 @@ class MQTTBridge:
         pass
     
     def poll_tasks(self):
-        """Poll tasks group data"""
+        """Poll tasks group data (reconcile pass while event stream is live)"""
         if not self.jellyfin.is_group_enabled('tasks'):
             return
+        if self._event_driven('tasks'):
+            return
         
         # api/tasks.py: get_scheduled_tasks()
         tasks = self.jellyfin.tasks.get_scheduled_tasks()
+        self.publish_tasks(tasks)
+    
+    def publish_tasks(self, tasks):
+        """Publish task state from /ScheduledTasks poll or ScheduledTasksInfo event"""
+        with self._tasks_lock:
+            self._publish_tasks(tasks)
+    
+    def _publish_tasks(self, tasks):
+        """Publish tasks (caller holds _tasks_lock)"""
         if tasks:
+            self.task_ids_by_key = {t.get('Key'): t.get('Id') for t in tasks if t.get('Key')}
             self.publish("tasks/count", len(tasks))
             
             running = 0
@@ -465,14 +748,17 @@ class MQTTBridge:
                     self.registered_tasks.add(task_id)
                 
                 if task_id:
-                    self.publish(f"tasks/{task_id}/name", task_name)
-                    self.publish(f"tasks/{task_id}/state", state)
-                    self.publish(f"tasks/{task_id}/running", state == 'Running')
-                    
                     progress = task.get('CurrentProgressPercentage', 0)
-                    self.publish(f"tasks/{task_id}/progress", round(progress, 1) if progress else 0)
+                    self.publish_fields(f"tasks/{task_id}", {
+                        'name': task_name,
+                        'state': state,
+                        'running': state == 'Running',
+                        'is_running': state == 'Running',
+                        'progress': round(progress, 1) if progress else 0,
+                    }, source=task)
             
             self.publish("tasks/running_count", running)
+            self._record_task_metrics(tasks)
     
     def poll_devices(self):
         """Poll devices group data"""
@@ -495,8 +781,8 @@ class MQTTBridge:
                     self.registered_devices.add(device_id)
                 
                 if device_id:
-                    self.publish(f"devices/{device_id}/name", device_name)
-                    self.publish(f"devices/{device_id}/app", app_name)
+                    self.publish_fields(f"devices/{device_id}", {'name': device_name, 'app': app_name},
+                                        source=device)
 
     def poll_plugins(self):
         """Poll plugins group data"""
@@ -523,9 +809,12 @@ class MQTTBridge:
                     self.registered_plugins.add(plugin_id)
                 
                 if plugin_id:
-                    self.publish(f"plugins/{plugin_id}/name", plugin_name)
-                    self.publish(f"plugins/{plugin_id}/version", version)
-                    self.publish(f"plugins/{plugin_id}/enabled", status == 'Active')
+                    self.publish_fields(f"plugins/{plugin_id}", {
+                        'name': plugin_name,
+                        'version': version,
+                        'enabled': status == 'Active',
+                        'is_active': status == 'Active',
+                    }, source=plugin)
             
             self.publish("plugins/enabled_count", enabled_count)
         
@@ -547,14 +836,14 @@ class MQTTBridge:
             self.publish("livetv/tuners/count", len(services))
         
         # api/livetv.py: get_livetv_channels()
-        channels = self.jellyfin.livetv.get_livetv_channels()
-        if channels:
-            self.publish("livetv/channels/count", channels.get('TotalRecordCount', 0))
+        channels = self.jellyfin.livetv.get_livetv_channels(count_only=True)
+        if channels is not None:
+            self.publish("livetv/channels/count", channels)
         
         # api/livetv.py: get_livetv_recordings()
-        recordings = self.jellyfin.livetv.get_livetv_recordings()
-        if recordings:
-            self.publish("livetv/recordings/count", recordings.get('TotalRecordCount', 0))
+        recordings = self.jellyfin.livetv.get_livetv_recordings(count_only=True)
+        if recordings is not None:
+            self.publish("livetv/recordings/count", recordings)
         
         # api/livetv.py: get_livetv_timers()
         timers = self.jellyfin.livetv.get_livetv_timers()
@@ -567,9 +856,9 @@ class MQTTBridge:
             self.publish("livetv/series_timers/count", series_timers.get('TotalRecordCount', 0))
         
         # api/livetv.py: get_livetv_programs()
-        programs = self.jellyfin.livetv.get_livetv_programs()
-        if programs:
-            self.publish("livetv/programs/count", programs.get('TotalRecordCount', 0))
+        programs = self.jellyfin.livetv.get_livetv_programs(count_only=True)
+        if programs is not None:
+            self.publish("livetv/programs/count", programs)
 
     def poll_syncplay(self):
         """Poll syncplay group data"""
@@ -595,41 +884,20 @@ class MQTTBridge:
         if not self.jellyfin.is_group_enabled('media'):
             return
         
-        # api/media.py: get_artists()
-        artists = self.jellyfin.media.get_artists()
-        if artists:
-            self.publish("media/artists/count", artists.get('TotalRecordCount', 0))
-        
-        # api/media.py: get_album_artists()
-        album_artists = self.jellyfin.media.get_album_artists()
-        if album_artists:
-            self.publish("media/album_artists/count", album_artists.get('TotalRecordCount', 0))
-        
-        # api/media.py: get_genres()
-        genres = self.jellyfin.media.get_genres()
-        if genres:
-            self.publish("media/genres/count", genres.get('TotalRecordCount', 0))
-        
-        # api/media.py: get_music_genres()
-        music_genres = self.jellyfin.media.get_music_genres()
-        if music_genres:
-            self.publish("media/music_genres/count", music_genres.get('TotalRecordCount', 0))
-        
-        # api/media.py: get_studios()
-        studios = self.jellyfin.media.get_studios()
-        if studios:
-            self.publish("media/studios/count", studios.get('TotalRecordCount', 0))
-        
-        # api/media.py: get_persons()
-        persons = self.jellyfin.media.get_persons()
-        if persons:
-            self.publish("media/persons/count", persons.get('TotalRecordCount', 0))
-        
-        # api/media.py: get_next_up()
-        next_up = self.jellyfin.media.get_next_up()
-        if next_up:
-            items = next_up.get('Items', [])
-            self.publish("media/nextup/count", next_up.get('TotalRecordCount', len(items)))
+        # Count-only queries: limit=0, no images/user data/fields
+        counts = {
+            'artists': self.jellyfin.media.get_artists,              # api/media.py: get_artists()
+            'album_artists': self.jellyfin.media.get_album_artists,  # api/media.py: get_album_artists()
+            'genres': self.jellyfin.media.get_genres,                # api/media.py: get_genres()
+            'music_genres': self.jellyfin.media.get_music_genres,    # api/media.py: get_music_genres()
+            'studios': self.jellyfin.media.get_studios,              # api/media.py: get_studios()
+            'persons': self.jellyfin.media.get_persons,              # api/media.py: get_persons()
+            'nextup': self.jellyfin.media.get_next_up,               # api/media.py: get_next_up()
+        }
+        for name, get_list in counts.items():
+            count = get_list(count_only=True)
+            if count is not None:
+                self.publish(f"media/{name}/count", count)
 
     def poll_images(self):
         """Poll images group data"""
@@ -665,8 +933,10 @@ class MQTTBridge:
     
     def poll_hardware(self):
         """Poll GPU and container stats (always enabled)"""
-        gpu_metrics = self.gpu.get_metrics()
-        if gpu_metrics:
+        gpus = self.gpu.get_all_metrics()
+        if gpus:
+            # gpu/* keeps reporting the first card for existing dashboards
+            gpu_metrics = gpus[min(gpus)]
             self.publish("gpu/name", gpu_metrics.get('name', ''))
             self.publish("gpu/utilization", gpu_metrics.get('utilization', 0))
             self.publish("gpu/temperature", gpu_metrics.get('temperature', 0))
@@ -675,34 +945,349 @@ class MQTTBridge:
             self.publish("gpu/memory_percent", gpu_metrics.get('memory_percent', 0))
             self.publish("gpu/encoder", gpu_metrics.get('encoder', 0))
             self.publish("gpu/decoder", gpu_metrics.get('decoder', 0))
+            
+            for index, metrics in gpus.items():
+                self.discovery.register_gpu(index, metrics.get('name', ''))
+                for key in ('name', 'uuid', 'utilization', 'temperature', 'fan_speed',
+                            'memory_total', 'memory_used', 'memory_percent',
+                            'encoder', 'decoder', 'power'):
+                    self.publish(f"gpu/{index}/{key}", metrics.get(key, 0))
+            
+            for key, value in aggregate_metrics(gpus).items():
+                self.publish(f"gpu/total/{key}", value)
         
         container = self.container.get_all_stats()
+        self._record_hardware_metrics(gpus, container)
         if container.get('memory'):
             self.publish("container/memory_used", container['memory'].get('used_mb', 0))
             self.publish("container/memory_limit", container['memory'].get('limit_mb', 0))
             self.publish("container/memory_percent", container['memory'].get('percent', 0))
+        
+        memory_stat = container.get('memory_stat')
+        if memory_stat:
+            for key, value in memory_stat.items():
+                self.publish(f"container/memory/{key}", value // (1024 * 1024))
+        
+        pressure = container.get('pressure')
+        if pressure:
+            for resource, kinds in pressure.items():
+                for kind, values in kinds.items():
+                    for window in ('avg10', 'avg60', 'avg300'):
+                        self.publish(f"container/pressure/{resource}/{kind}/{window}", values[window])
+        
+        io = container.get('io')
+        if io:
+            self.publish("container/block_read", io['read_bytes'])
+            self.publish("container/block_write", io['write_bytes'])
+            for device, stats in io['devices'].items():
+                self.discovery.register_block_device(device)
+                for key, value in stats.items():
+                    self.publish(f"container/io/{device}/{key}", value)
+        
+        cpu = container.get('cpu')
+        if cpu:
+            self.publish("container/cpus", cpu['cpus'])
+            if 'percent' in cpu:
+                self.publish("container/cpu_percent", cpu['percent'])
+                self.publish("container/cpu_percent_avg", cpu['percent_avg'])
+        
+        network = container.get('network')
+        if network:
+            self.publish("container/network_rx", network['rx_bytes'])
+            self.publish("container/network_tx", network['tx_bytes'])
+            for key in ('rx_rate', 'tx_rate', 'rx_rate_avg', 'tx_rate_avg'):
+                if key in network:
+                    self.publish(f"container/network_{key}", network[key])
+            
+            for iface, stats in network['interfaces'].items():
+                if 'rx_rate' not in stats:
+                    continue
+                self.discovery.register_network_interface(iface)
+                for key in ('rx_rate', 'tx_rate', 'rx_rate_avg', 'tx_rate_avg'):
+                    self.publish(f"container/network/{iface}/{key}", stats[key])
 
+    # ==========================================================================
+    # BRIDGE STATS (bridge/stats/*)
+    # ==========================================================================
+    
+    def publish_bridge_stats(self):
+        """Publish poll timings, request stats and component counters"""
+        polls = self.scheduler.get_stats()
+        for group, stats in polls.items():
+            for key in ('runs', 'skipped', 'errors', 'overruns', 'last_ms', 'avg_ms',
+                        'p95_ms', 'max_ms', 'publishes', 'suppressed'):
+                self.publish(f"bridge/stats/polls/{group}/{key}", stats[key])
+        self.publish("bridge/stats/overruns", sum(s['overruns'] for s in polls.values()))
+        
+        requests = self.jellyfin.http.request_stats
+        self.publish("bridge/stats/requests", requests.get_stats())
+        for key, value in requests.get_totals().items():
+            self.publish(f"bridge/stats/requests/{key}", value)
+        
+        components = {
+            'pool': self.jellyfin.get_pool_stats(),
+            'cache': self.jellyfin.get_cache_stats(),
+            'commands': self.commands.get_stats(),
+            'router': self.router.get_stats() if self.router else None,
+            'discovery': self.discovery.config_cache.get_stats() if self.discovery else None,
+            'publish': self.publish_cache.get_stats() if self.publish_cache else None,
+            'state_json': self.state_docs.get_stats() if self.state_docs else None,
+            'slots': self.session_slots.get_stats() if self.session_slots else None,
+            'session_index': self.session_index.get_stats(),
+            'outbound': self.outbound.get_stats() if self.outbound else None,
+            'mqtt5': self.publisher.get_stats() if isinstance(self.publisher, MQTT5Publisher) else None,
+        }
+        for component, stats in components.items():
+            for key, value in (stats or {}).items():
+                self.publish(f"bridge/stats/{component}/{key}", value)
+        
+        if self.metrics:
+            self.metrics.set_family('poll_duration_seconds', [
+                ({'group': name}, (job.latency.cumulative(), job.latency.sum, job.latency.count))
+                for name, job in self.scheduler.jobs.items()
+            ], 'histogram', 'Duration of group polls')
+            for key, metric, help_text in (('errors', 'poll_errors_total', 'Failed group polls'),
+                                           ('overruns', 'poll_overruns_total', 'Polls longer than their interval'),
+                                           ('skipped', 'poll_skipped_total', 'Polls skipped while still running'),
+                                           ('publishes', 'poll_publishes_total', 'MQTT messages sent by group')):
+                self.metrics.set_family(metric, [({'group': g}, s[key]) for g, s in polls.items()],
+                                        'counter', help_text)
+            self.metrics.set_family('api_request_duration_seconds', [
+                ({'method': method, 'endpoint': endpoint}, (buckets, total, count))
+                for method, endpoint, buckets, total, count in requests.get_histograms()
+            ], 'histogram', 'Jellyfin API request latency')
+            endpoints = requests.get_stats()
+            self.metrics.set_family('api_response_bytes_total', [
+                (dict(zip(('method', 'endpoint'), key.split(' ', 1))), s['bytes']) for key, s in endpoints.items()
+            ], 'counter', 'Jellyfin API response bytes')
+            self.metrics.set_family('api_responses_total', [
+                (dict(zip(('method', 'endpoint'), key.split(' ', 1)), status=code), n)
+                for key, s in endpoints.items() for code, n in s['status'].items()
+            ], 'counter', 'Jellyfin API responses by status code')
+            self.metrics.set_family('api_timeouts_total', [
+                (dict(zip(('method', 'endpoint'), key.split(' ', 1))), s['timeouts']) for key, s in endpoints.items()
+            ], 'counter', 'Jellyfin API request timeouts')
+    
+    # ==========================================================================
+    # PROMETHEUS METRICS (filled by polls, read by /metrics scrapes)
+    # ==========================================================================
+    
+    def _record_session_metrics(self, sessions, playing, paused, transcoding):
+        """Store session counts and per-session state"""
+        if not self.metrics:
+            return
+        
+        self.metrics.set('sessions', len(sessions), help_text='Active sessions')
+        self.metrics.set('sessions_playing', playing, help_text='Sessions playing')
+        self.metrics.set('sessions_paused', paused, help_text='Sessions paused')
+        self.metrics.set('sessions_transcoding', transcoding, help_text='Sessions transcoding while playing')
+        
+        info = []
+        progress = []
+        for session_id, session in sessions.items():
+            labels = {'session': session_id, 'user': session.get('UserName', ''),
+                      'device': session.get('DeviceName', '')}
+            now_playing = session.get('NowPlayingItem')
+            if now_playing:
+                state = 'paused' if session.get('PlayState', {}).get('IsPaused') else 'playing'
+            else:
+                state = 'idle'
+            info.append((dict(labels, client=session.get('Client', ''), state=state), 1))
+            if now_playing:
+                duration = now_playing.get('RunTimeTicks') or 0
+                position = session.get('PlayState', {}).get('PositionTicks') or 0
+                progress.append((labels, round(position / duration * 100, 1) if duration > 0 else 0))
+        
+        self.metrics.set_family('session_info', info, help_text='Session state (value always 1)')
+        self.metrics.set_family('session_progress_percent', progress, help_text='Playback progress')
+    
+    def _record_transcode_metrics(self, processes, matched, sessions):
+        """Store ffmpeg process usage labelled with its session"""
+        if not self.metrics:
+            return
+        
+        by_pid = {p['pid']: sid for sid, p in matched.items()}
+        users = {s.get('Id'): s.get('UserName', '') for s in sessions}
+        cpu, cpu_seconds, rss, read, write = [], [], [], [], []
+        for process in processes:
+            session_id = by_pid.get(process['pid'], '')
+            labels = {'pid': process['pid'], 'session': session_id, 'user': users.get(session_id, ''),
+                      'hwaccel': process.get('hwaccel') or 'none', 'codec': process.get('video_codec') or ''}
+            if 'cpu_percent' in process:
+                cpu.append((labels, process['cpu_percent']))
+            cpu_seconds.append((labels, process['cpu_seconds']))
+            rss.append((labels, process['rss_bytes']))
+            read.append((labels, process.get('read_bytes', 0)))
+            write.append((labels, process.get('write_bytes', 0)))
+        
+        self.metrics.set('transcodes', len(processes), help_text='Running ffmpeg processes')
+        self.metrics.set_family('transcode_cpu_percent', cpu, help_text='ffmpeg CPU usage (100 = one core)')
+        self.metrics.set_family('transcode_cpu_seconds_total', cpu_seconds, 'counter', 'ffmpeg CPU time')
+        self.metrics.set_family('transcode_rss_bytes', rss, help_text='ffmpeg resident memory')
+        self.metrics.set_family('transcode_read_bytes_total', read, 'counter', 'ffmpeg bytes read from storage')
+        self.metrics.set_family('transcode_write_bytes_total', write, 'counter', 'ffmpeg bytes written to storage')
+    
+    def _record_task_metrics(self, tasks):
+        """Store scheduled task state and progress"""
+        if not self.metrics:
+            return
+        
+        running, progress = [], []
+        for task in tasks:
+            labels = {'task': task.get('Name', ''), 'key': task.get('Key', '')}
+            is_running = task.get('State') == 'Running'
+            running.append((labels, is_running))
+            if is_running:
+                progress.append((labels, round(task.get('CurrentProgressPercentage') or 0, 1)))
+        
+        self.metrics.set_family('task_running', running, help_text='Scheduled task running (1/0)')
+        self.metrics.set_family('task_progress_percent', progress, help_text='Progress of running tasks')
+    
+    def _record_hardware_metrics(self, gpus, container):
+        """Store GPU and container metrics"""
+        if not self.metrics:
+            return
+        
+        mb = 1024 * 1024
+        gpu_fields = (
+            ('utilization', 'gpu_utilization_percent', 1, 'GPU utilization'),
+            ('encoder', 'gpu_encoder_percent', 1, 'NVENC utilization'),
+            ('decoder', 'gpu_decoder_percent', 1, 'NVDEC utilization'),
+            ('temperature', 'gpu_temperature_celsius', 1, 'GPU temperature'),
+            ('memory_used', 'gpu_memory_used_bytes', mb, 'VRAM used'),
+            ('memory_total', 'gpu_memory_total_bytes', mb, 'VRAM total'),
+            ('power', 'gpu_power_watts', 1, 'GPU power draw'),
+            ('fan_speed', 'gpu_fan_speed_percent', 1, 'GPU fan speed'),
+        )
+        for key, name, scale, help_text in gpu_fields:
+            self.metrics.set_family(name, [
+                ({'gpu': index, 'name': g.get('name', ''), 'uuid': g.get('uuid', '')}, g.get(key, 0) * scale)
+                for index, g in gpus.items()
+            ], help_text=help_text)
+        
+        memory = container.get('memory')
+        if memory:
+            self.metrics.set('container_memory_used_bytes', memory['used_bytes'], help_text='Container memory usage')
+            self.metrics.set('container_memory_limit_bytes', memory['limit_bytes'],
+                             help_text='Container memory limit (host memory if unlimited)')
+        
+        memory_stat = container.get('memory_stat')
+        if memory_stat:
+            self.metrics.set_family('container_memory_stat_bytes', [
+                ({'type': key}, value) for key, value in memory_stat.items()
+            ], help_text='Container memory by type (memory.stat)')
+        
+        cpu = container.get('cpu')
+        if cpu:
+            self.metrics.set('container_cpu_usage_seconds_total', cpu['usage_usec'] / 1e6, metric_type='counter',
+                             help_text='Container CPU time')
+            self.metrics.set('container_cpus', cpu['cpus'], help_text='CPUs available to the container')
+            if 'percent' in cpu:
+                self.metrics.set('container_cpu_percent', cpu['percent'], help_text='Container CPU usage of its quota')
+        
+        pressure = container.get('pressure')
+        if pressure:
+            avg, total = [], []
+            for resource, kinds in pressure.items():
+                for kind, values in kinds.items():
+                    for window in ('avg10', 'avg60', 'avg300'):
+                        avg.append(({'resource': resource, 'kind': kind, 'window': window}, values[window]))
+                    total.append(({'resource': resource, 'kind': kind}, values['total'] / 1e6))
+            self.metrics.set_family('container_pressure_percent', avg, help_text='Pressure stall information')
+            self.metrics.set_family('container_pressure_stalled_seconds_total', total, 'counter', 'Total stall time')
+        
+        io = container.get('io')
+        if io:
+            devices = io['devices'].items()
+            self.metrics.set_family('container_io_read_bytes_total', [
+                ({'device': d}, s['rbytes']) for d, s in devices], 'counter', 'Block device bytes read')
+            self.metrics.set_family('container_io_write_bytes_total', [
+                ({'device': d}, s['wbytes']) for d, s in devices], 'counter', 'Block device bytes written')
+        
+        network = container.get('network')
+        if network:
+            interfaces = network['interfaces'].items()
+            self.metrics.set_family('container_network_receive_bytes_total', [
+                ({'interface': i}, s['rx_bytes']) for i, s in interfaces], 'counter', 'Bytes received')
+            self.metrics.set_family('container_network_transmit_bytes_total', [
+                ({'interface': i}, s['tx_bytes']) for i, s in interfaces], 'counter', 'Bytes transmitted')
+    
+    # ==========================================================================
+    # EVENT STREAM (WebSocket /socket)
+    # ==========================================================================
+    
+    def setup_events(self):
+        """Subscribe to Jellyfin WebSocket events"""
+        self.events = JellyfinEventStream(
+            self.config.jellyfin_host,
+            self.config.jellyfin_api_key,
+            device_id=self.config.mqtt_client_id
+        )
+        self.events.on('Sessions', self._on_sessions_event)
+        self.events.on('ScheduledTasksInfo', self._on_tasks_event)
+        self.events.on('ActivityLogEntry', self._on_activity_event)
+        self.events.on('LibraryChanged', lambda data: self._trigger_polls('library', 'items', 'media'))
+        self.events.on('UserDataChanged', lambda data: self._trigger_polls('items'))
+        return self.events.start()
+    
+    def _event_driven(self, group):
+        """True while the event stream feeds this group and no reconcile pass is due"""
+        if not (self.events and self.events.is_live()):
+            return False
+        now = time.monotonic()
+        if now - self._last_reconcile.get(group, float('-inf')) >= self.config.jellyfin_events_reconcile:
+            self._last_reconcile[group] = now
+            return False
+        return True
+    
+    def _trigger_polls(self, *groups):
+        """Run group polls now instead of waiting for the next interval"""
+        for group in groups:
+            if self.jellyfin.is_group_enabled(group):
+                self.scheduler.trigger(group)
+    
+    def _on_sessions_event(self, data):
+        if self.jellyfin.is_group_enabled('sessions'):
+            self.publish_sessions(data or [])
+    
+    def _on_tasks_event(self, data):
+        if self.jellyfin.is_group_enabled('tasks'):
+            self.publish_tasks(data or [])
+    
+    def _on_activity_event(self, data):
+        if self.jellyfin.is_group_enabled('system') and data:
+            self.publish("system/activity_log/latest", data[0].get('Name', ''))
+    
+    def poll_jobs(self):
+        """Get all group polls in publish order"""
+        return {
+            'system': self.poll_system,
+            'sessions': self.poll_sessions,
+            'library': self.poll_library,
+            'items': self.poll_items,
+            'users': self.poll_users,
+            'playstate': self.poll_playstate,
+            'tasks': self.poll_tasks,
+            'devices': self.poll_devices,
+            'plugins': self.poll_plugins,
+            'livetv': self.poll_livetv,
+            'syncplay': self.poll_syncplay,
+            'playlists': self.poll_playlists,
+            'media': self.poll_media,
+            'images': self.poll_images,
+            'misc': self.poll_misc,
+            'hardware': self.poll_hardware,
+        }
+    
     def poll_and_publish(self):
-        """Main polling loop - call all group polls"""
-        try:
-            self.poll_system()
-            self.poll_sessions()
-            self.poll_library()
-            self.poll_items()
-            self.poll_users()
-            self.poll_playstate()
-            self.poll_tasks()
-            self.poll_devices()
-            self.poll_plugins()
-            self.poll_livetv()
-            self.poll_syncplay()
-            self.poll_playlists()
-            self.poll_media()
-            self.poll_images()
-            self.poll_misc()
-            self.poll_hardware()
-        except Exception as e:
-            logger.error("Poll error: %s", str(e))
+        """Run all group polls once, sequentially (for scripts and debugging)"""
+        for name, poll in self.poll_jobs().items():
+            start = time.monotonic()
+            try:
+                poll()
+            except Exception as e:
+                logger.error("Poll error (%s): %s", name, str(e))
+            logger.debug("Poll '%s' took %.1fms", name, (time.monotonic() - start) * 1000)
     
     def run(self):
         """Main entry point"""
@@ -719,37 +1304,113 @@ class MQTTBridge:
         self.config.log_config()
         
         # Initialize components
-        self.jellyfin = JellyfinAPI(self.config.jellyfin_host, self.config.jellyfin_api_key)
-        self.gpu = get_gpu_monitor()
-        self.container = get_container_stats()
+        self.jellyfin = JellyfinAPI(
+            self.config.jellyfin_host,
+            self.config.jellyfin_api_key,
+            pool_size=self.config.jellyfin_http_pool_size,
+            max_per_host=self.config.jellyfin_http_max_per_host,
+            cache_enable=self.config.jellyfin_cache_enable,
+            cache_ttl=self.config.jellyfin_cache_ttl,
+            cache_max_bytes=self.config.jellyfin_cache_max_kb * 1024
+        )
+        self.gpu = get_gpu_monitor(self.config.gpu_smi_binary)
+        if self.config.gpu_sampler_enable:
+            self.gpu.start_sampler(self.config.gpu_sample_interval_ms)
+        self.transcodes = get_transcode_inspector()
+        self.container = get_container_stats(self.config.container_cgroup_root)
+        self.scheduler = PollScheduler(
+            self.config.mqtt_poll_interval,
+            max_concurrency=self.config.mqtt_poll_concurrency
+        )
+        self.jellyfin_async = AsyncJellyfinAPI(self.jellyfin, self.scheduler.executor)
+        self.commands = CommandExecutor(
+            workers=self.config.mqtt_command_workers,
+            max_queue=self.config.mqtt_command_queue,
+            deadline=self.config.mqtt_command_deadline
+        )
+        if self.config.mqtt_publish_changes_only:
+            self.publish_cache = LastValueCache(
+                refresh_interval=self.config.mqtt_publish_refresh,
+                bypass=self.config.mqtt_publish_bypass
+            )
+        
+        if self.config.mqtt_state_json:
+            self.state_docs = StateDocuments()
+        
+        if self.config.mqtt_session_slots > 0:
+            self.session_slots = SessionSlots(
+                self.config.mqtt_session_slots,
+                by_device=self.config.mqtt_session_slots_by_device
+            )
         
+        if self.config.mqtt_position_tick > 0:
+            # Stop extrapolating if resyncs stop for more than about two polls
+            self.positions = PositionTicker(max_age=2 * self.config.get_poll_interval('sessions') + 5)
+        
+        if self.config.metrics_enable:
+            self.metrics = MetricsRegistry()
+            self.metrics_exporter = MetricsExporter(
+                self.metrics,
+                host=self.config.metrics_host,
+                port=self.config.metrics_port
+            )
+        
+        for name, poll in self.poll_jobs().items():
+            self.scheduler.add_job(
+                name, poll,
+                interval=self.config.get_poll_interval(name),
+                priority=self.config.get_poll_priority(name)
+            )
+        if self.config.mqtt_stats_interval > 0:
+            self.scheduler.add_job('stats', self.publish_bridge_stats,
+                                   interval=self.config.mqtt_stats_interval, priority=9)
+        if self.positions:
+            self.scheduler.add_job('positions', self.publish_positions,
+                                   interval=self.config.mqtt_position_tick, priority=0)
+        
+        return asyncio.run(self._run_async())
+    
+    async def _run_async(self):
+        """Asyncio main loop"""
         # Wait for Jellyfin
         logger.info("Waiting for Jellyfin API...")
         for i in range(30):
-            if self.jellyfin.system.ping():
+            if await self.jellyfin_async.ping():
                 logger.info("Jellyfin API responding")
                 break
-            time.sleep(2)
+            await asyncio.sleep(2)
         else:
             logger.error("Jellyfin API not responding after 60s")
             return 1
         
         # Get server info
-        self.server_info = self.jellyfin.system.get_system_info()
+        self.server_info = await self.jellyfin_async.get_system_info()
         if self.server_info:
             logger.info("Connected to Jellyfin %s", self.server_info.get('Version'))
 
         # Setup MQTT
-        self.setup_mqtt()
+        v5 = self.config.mqtt_protocol == '5'
+        if v5 and not probe_v5(self.config.mqtt_host, self.config.mqtt_port, self.config.mqtt_client_id,
+                               self.config.mqtt_user, self.config.mqtt_password):
+            logger.warning("MQTT broker does not support MQTT 5, falling back to 3.1.1")
+            v5 = False
+        self.setup_mqtt(v5)
         self.discovery = DiscoveryManager(self.mqtt_client, self.server_info)
         
         # Connect
+        connect_args = {}
+        if self._persistent_session():
+            connect_args = {'clean_start': False,
+                            'properties': connect_properties(self.config.mqtt_session_expiry)}
         try:
-            self.mqtt_client.connect(self.config.mqtt_host, self.config.mqtt_port, keepalive=60)
+            self.mqtt_client.connect(self.config.mqtt_host, self.config.mqtt_port, keepalive=60, **connect_args)
         except Exception as e:
             logger.error("MQTT connection failed: %s", str(e))
             return 1
         
+        self.commands.start()
+        if self.outbound:
+            self.outbound.start()
         self.mqtt_client.loop_start()
         
         # Setup signals
@@ -758,22 +1419,50 @@ class MQTTBridge:
         signal.signal(signal.SIGINT, self._signal_handler)
         
         # Main loop
-        logger.info("Starting main loop (poll interval: %ds)", self.config.mqtt_poll_interval)
+        logger.info("Starting main loop (default poll interval: %ds, concurrency: %d)",
+                    self.config.mqtt_poll_interval, self.config.mqtt_poll_concurrency)
+        for name, schedule in self.scheduler.get_schedule().items():
+            if schedule['interval'] != self.config.mqtt_poll_interval:
+                logger.info("  %s: every %ds (priority %d)", name, schedule['interval'], schedule['priority'])
         logger.info("Enabled groups: %s", self.jellyfin.get_enabled_groups())
         
-        while self.running:
-            self.poll_and_publish()
-            
-            for _ in range(self.config.mqtt_poll_interval * 10):
-                if not self.running:
-                    break
-                time.sleep(0.1)
+        if self.config.jellyfin_events_enable:
+            self.setup_events()
+        if self.metrics_exporter:
+            self.metrics_exporter.start()
+        
+        await self.scheduler.run(lambda: self.running)
         
         # Cleanup
         logger.info("Shutting down...")
-        self.publish("status", "offline", retain=True)
+        if self.events:
+            self.events.stop()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        self.discovery.save_cache()
+        self.publish("status", "offline", retain=True, force=True)
+        if self.outbound:
+            self.outbound.stop()
         self.mqtt_client.loop_stop()
         self.mqtt_client.disconnect()
+        self.commands.stop()
+        self.gpu.stop_sampler()
+        
+        commands = self.commands.get_stats()
+        logger.info("Commands: %d completed, %d failed, %d expired, %d rejected (avg %.1fms)",
+                    commands['completed'], commands['failed'], commands['expired'],
+                    commands['rejected'], commands['latency_avg_ms'])
+        pool = self.jellyfin.get_pool_stats()
+        logger.info("HTTP pool: %d requests, %d reused, %d new connections",
+                    pool['requests'], pool['hits'], pool['misses'])
+        self.jellyfin.close()
+        if self.publish_cache:
+            stats = self.publish_cache.get_stats()
+            logger.info("Publish cache: %d sent, %d suppressed", stats['sent'], stats['suppressed'])
+        if self.outbound:
+            stats = self.outbound.get_stats()
+            logger.info("Outbound queue: %d queued, %d coalesced, %d dropped, %d resynced",
+                        stats['queued'], stats['coalesced'], stats['dropped'], stats['resynced'])
         logger.info("MQTT Bridge stopped")
         
         return 0
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Outbound Queue
+Bounded last-write-wins buffer for MQTT publishes while the broker is
+unreachable, flushed at a paced rate once the connection is back
+"""
+
+import time
+import logging
+import threading
+import collections
+import paho.mqtt.client as mqtt
+
+logger = logging.getLogger(__name__)
+
+
+class OutboundQueue:
+    """
+    Sends publishes directly while connected and nothing is pending,
+    otherwise keeps only the latest payload per topic (in first-queued
+    order) and drops the oldest topic once max_messages are pending.
+    Without a socket paho rejects QoS 0 publishes (MQTT_ERR_NO_CONN) and
+    the update is lost; while the socket is up but stalled it appends to
+    its packet queue without limit until the keepalive notices. Connection
+    state therefore comes from the bridge's connect/disconnect callbacks,
+    and a failed publish is queued here instead.
+    on_drop(topic) is called for evicted topics
+    """
+
+    def __init__(self, client, max_messages=10000, rate=500, retry_delay=1.0, on_drop=None):
+        self.client = client
+        self.on_drop = on_drop
+        self.max_messages = max_messages
+        self.rate = rate
+        self.retry_delay = retry_delay
+        self._pending = collections.OrderedDict()   # topic -> (payload, qos, retain)
+        self._connected = False
+        self._running = False
+        self._thread = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.queued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+        self.resynced = 0
+
+    def start(self):
+        """Start the flush thread"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='mqtt-outbound', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop the flush thread and send what is pending within timeout (unpaced)"""
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self._flush_batch(self.max_messages):
+            pass
+        with self._lock:
+            if self._pending:
+                logger.warning("Outbound queue: %d messages not sent on shutdown", len(self._pending))
+
+    def set_connected(self, connected):
+        """Called from the MQTT connect/disconnect callbacks"""
+        with self._lock:
+            self._connected = connected
+            pending = len(self._pending)
+        if connected and pending:
+            logger.info("Outbound queue: flushing %d messages at %d/s", pending, self.rate)
+            self._wake.set()
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        """Send or queue a message, returns True if it was handed to the client"""
+        with self._lock:
+            direct = self._connected and not self._pending
+            if not direct:
+                evicted = self._enqueue(topic, (payload, qos, retain))
+        if direct:
+            if self._send(topic, payload, qos, retain):
+                return True
+            with self._lock:
+                evicted = self._enqueue(topic, (payload, qos, retain))
+            self._wake.set()
+        if evicted and self.on_drop:
+            self.on_drop(evicted)
+        return False
+
+    def resync(self, messages):
+        """
+        Queue (topic, payload, retain) last values so the broker gets current
+        state after a reconnect. Only free capacity is used, pending updates
+        are never evicted for them; returns the topics that did not fit
+        """
+        overflow = []
+        with self._lock:
+            for topic, payload, retain in messages:
+                if topic in self._pending:
+                    continue
+                if len(self._pending) >= self.max_messages:
+                    overflow.append(topic)
+                    continue
+                self._pending[topic] = (payload, 0, retain)
+                self.resynced += 1
+        return overflow
+
+    def _enqueue(self, topic, message):
+        """Replace a pending payload in place or append, returns the evicted topic (caller locks)"""
+        if topic in self._pending:
+            self._pending[topic] = message
+            self.coalesced += 1
+            return None
+        evicted = None
+        if len(self._pending) >= self.max_messages:
+            evicted, _ = self._pending.popitem(last=False)
+            self.dropped += 1
+        self._pending[topic] = message
+        self.queued += 1
+        return evicted
+
+    def _send(self, topic, payload, qos, retain):
+        info = self.client.publish(topic, payload, qos=qos, retain=retain)
+        if info.rc != mqtt.MQTT_ERR_SUCCESS:
+            with self._lock:
+                self.failed += 1
+            logger.debug("Publish to %s failed (rc=%d)", topic, info.rc)
+            return False
+        with self._lock:
+            self.sent += 1
+        return True
+
+    def _flush_batch(self, size):
+        """Send up to size pending messages, returns False if nothing more can be sent now"""
+        with self._lock:
+            if not self._connected or not self._pending:
+                return False
+            batch = [self._pending.popitem(last=False) for _ in range(min(size, len(self._pending)))]
+        for i, (topic, (payload, qos, retain)) in enumerate(batch):
+            if not self._send(topic, payload, qos, retain):
+                # Put the rest back in front unless a newer payload was queued meanwhile
+                with self._lock:
+                    for topic, message in reversed(batch[i:]):
+                        if topic not in self._pending:
+                            self._pending[topic] = message
+                            self._pending.move_to_end(topic, last=False)
+                return False
+        return True
+
+    def _run(self):
+        batch = max(1, self.rate // 10)
+        while self._running:
+            if self._flush_batch(batch):
+                time.sleep(batch / self.rate)
+                continue
+            with self._lock:
+                backoff = self._connected and bool(self._pending)
+            self._wake.wait(self.retry_delay if backoff else None)
+            self._wake.clear()
+
+    def get_stats(self):
+        """Pending size and sent/queued/coalesced/dropped counters"""
+        with self._lock:
+            return {
+                'connected': self._connected,
+                'pending': len(self._pending),
+                'max_messages': self.max_messages,
+                'sent': self.sent,
+                'queued': self.queued,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'resynced': self.resynced,
+            }
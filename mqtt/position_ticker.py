@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Position Ticker
+Extrapolates playback position between /Sessions polls from the last
+reported position, pause state and playback rate
+"""
+
+import time
+import threading
+
+TICKS_PER_SECOND = 10_000_000
+
+
+class PositionTicker:
+    """
+    Last known playback state per session, resynced on every poll or event
+    Positions advance with the monotonic clock while playing and are clamped
+    to the runtime; after max_age seconds without a resync they stop moving
+    """
+
+    def __init__(self, max_age=30):
+        self.max_age = max_age
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def resync(self, key, position, runtime, paused=False, rate=1.0, now=None):
+        """Store the reported state of a session"""
+        with self._lock:
+            self._states[key] = (position or 0, runtime or 0, paused, rate or 1.0,
+                                 time.monotonic() if now is None else now)
+
+    def forget(self, key):
+        """Drop a session (ended, idle or moved to another slot)"""
+        with self._lock:
+            self._states.pop(key, None)
+
+    def get_position(self, key, now=None):
+        """Extrapolated position in ticks, None if unknown"""
+        with self._lock:
+            state = self._states.get(key)
+        if state is None:
+            return None
+        return self._extrapolate(state, time.monotonic() if now is None else now)
+
+    def _extrapolate(self, state, now):
+        position, runtime, paused, rate, synced = state
+        if not paused:
+            elapsed = min(max(now - synced, 0), self.max_age)
+            position += int(elapsed * rate * TICKS_PER_SECOND)
+        return min(position, runtime) if runtime > 0 else position
+
+    def positions(self, now=None):
+        """{key: (position_ticks, runtime_ticks)} of all sessions that are playing"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            states = dict(self._states)
+        return {
+            key: (self._extrapolate(state, now), state[1])
+            for key, state in states.items()
+            if not state[2]
+        }
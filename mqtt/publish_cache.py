@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Publish Cache
+Last-value cache that suppresses re-publishing unchanged MQTT payloads,
+and per-object state documents for MQTT_STATE_JSON
+"""
+
+import json
+import time
+import logging
+import threading
+from paho.mqtt.client import topic_matches_sub
+
+logger = logging.getLogger(__name__)
+
+
+def format_payload(payload):
+    """MQTT payload string of a value (dict/list as JSON, bools lowercase, None empty)"""
+    if isinstance(payload, (dict, list)):
+        return json.dumps(payload)
+    if isinstance(payload, bool):
+        return "true" if payload else "false"
+    if payload is None:
+        return ""
+    return str(payload)
+
+
+def pick_fields(obj, paths):
+    """
+    Values of obj at '/'-separated paths ('Policy/IsAdministrator',
+    'Triggers/0/Type', 'Triggers/count' for a list length); missing paths
+    are left out
+    """
+    fields = {}
+    for path in paths:
+        value = obj
+        for part in path.split('/'):
+            if isinstance(value, dict):
+                value = value.get(part)
+            elif isinstance(value, list) and part == 'count':
+                value = len(value)
+            elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            else:
+                value = None
+            if value is None:
+                break
+        if value is not None:
+            fields[path] = value
+    return fields
+
+
+class LastValueCache:
+    """
+    Remembers the last payload sent per topic
+    Identical payloads are suppressed until refresh_interval has passed;
+    topics matching a bypass filter (MQTT wildcards) are always sent
+    """
+
+    def __init__(self, refresh_interval=300, bypass=None):
+        self.refresh_interval = refresh_interval
+        self.bypass = list(bypass or [])
+        self.sent = 0
+        self.suppressed = 0
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _is_bypassed(self, topic):
+        return any(topic_matches_sub(sub, topic) for sub in self.bypass)
+
+    def should_publish(self, topic, payload, retain=False):
+        """Record payload and return True if it must be sent"""
+        now = time.monotonic()
+        with self._lock:
+            last = self._values.get(topic)
+            if (last and last[0] == payload and last[1] == retain
+                    and now - last[2] < self.refresh_interval
+                    and not self._is_bypassed(topic)):
+                self.suppressed += 1
+                return False
+
+            self._values[topic] = (payload, retain, now)
+            self.sent += 1
+            return True
+
+    def forget(self, topic):
+        """
+        Drop the cached value of one topic, or of every topic below a
+        prefix ending in '/' (e.g. an ended session's sessions/<id>/)
+        """
+        with self._lock:
+            if not topic.endswith('/'):
+                self._values.pop(topic, None)
+                return
+            for cached in [t for t in self._values if t.startswith(topic)]:
+                del self._values[cached]
+
+    def items(self):
+        """(topic, payload, retain) of every cached value"""
+        with self._lock:
+            return [(topic, value[0], value[1]) for topic, value in self._values.items()]
+
+    def clear(self):
+        """Drop all cached values, next publish of every topic is sent"""
+        with self._lock:
+            self._values.clear()
+
+    def get_stats(self):
+        """Get sent/suppressed counters"""
+        with self._lock:
+            return {
+                'sent': self.sent,
+                'suppressed': self.suppressed,
+                'topics': len(self._values),
+            }
+
+
+class StateDocuments:
+    """
+    Current fields of each object (session, task, plugin, device, user)
+    Fields are stored as their scalar payload strings, so value_templates
+    render exactly what the per-field topics would carry
+    """
+
+    def __init__(self):
+        self._docs = {}
+        self._lock = threading.Lock()
+
+    def update(self, prefix, fields, replace=False):
+        """Merge fields into the document of prefix, returns a copy to publish"""
+        values = {field: value if isinstance(value, (dict, list)) else format_payload(value)
+                  for field, value in fields.items()}
+        with self._lock:
+            doc = self._docs.get(prefix) if not replace else None
+            if doc is None:
+                doc = self._docs[prefix] = {}
+            doc.update(values)
+            return dict(doc)
+
+    def forget(self, prefix):
+        """Drop the document of an object that is gone"""
+        with self._lock:
+            self._docs.pop(prefix, None)
+
+    def get_stats(self):
+        """Number of documents held"""
+        with self._lock:
+            return {'documents': len(self._docs)}
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Poll Scheduler
+Asyncio loop that fires group polls concurrently with bounded parallelism
+Each group has its own interval, next-run deadline and priority
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api.request_stats import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Name of the job running in the current executor thread
+_current = threading.local()
+
+
+class PollJob:
+    """One scheduled poll"""
+
+    def __init__(self, name, func, interval, priority=5):
+        self.name = name
+        self.func = func
+        self.interval = max(interval, 1)
+        self.priority = priority
+        self.next_run = 0.0
+        self.runs = 0
+        self.skipped = 0
+        # Instrumentation (only touched by the thread running the job)
+        self.errors = 0
+        self.overruns = 0
+        self.last_duration = 0.0
+        self.latency = Histogram()
+        self.publishes = 0
+        self.suppressed = 0
+
+
+class PollScheduler:
+    """
+    Runs registered poll jobs when their deadline is reached
+    Due jobs start in priority order (0 = highest); a job that is still
+    in flight is skipped instead of queued again, so one slow group
+    never delays the others
+    """
+
+    def __init__(self, interval, max_concurrency=4):
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='poll')
+        self.jobs = {}
+        self._tasks = {}
+        self._semaphore = None
+        self._loop = None
+
+    def add_job(self, name, func, interval=None, priority=5):
+        """Register a blocking poll function"""
+        self.jobs[name] = PollJob(name, func, interval or self.interval, priority)
+
+    def get_interval(self, name):
+        """Get interval of a job in seconds"""
+        job = self.jobs.get(name)
+        return job.interval if job else None
+
+    def set_interval(self, name, interval):
+        """Change interval of a job at runtime (thread-safe)"""
+        job = self.jobs.get(name)
+        if not job:
+            return False
+        job.interval = max(interval, 1)
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._reschedule, job)
+        return True
+
+    def _reschedule(self, job):
+        """Pull next deadline forward if the new interval is shorter"""
+        job.next_run = min(job.next_run, self._loop.time() + job.interval)
+
+    @staticmethod
+    def current_job():
+        """Job running in the calling thread, None outside polls"""
+        return getattr(_current, 'job', None)
+    
+    def _call(self, job):
+        """Run job function in an executor thread and time it"""
+        _current.job = job
+        start = time.monotonic()
+        try:
+            job.func()
+        except Exception as e:
+            job.errors += 1
+            logger.error("Poll error (%s): %s", job.name, str(e))
+        finally:
+            _current.job = None
+            job.last_duration = time.monotonic() - start
+            job.latency.observe(job.last_duration)
+            if job.last_duration > job.interval:
+                job.overruns += 1
+                logger.warning("Poll '%s' took %.1fs, longer than its %ds interval",
+                               job.name, job.last_duration, job.interval)
+    
+    async def _run_job(self, job):
+        """Run one poll in the executor, bounded by the semaphore"""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self._call, job)
+
+    def _start_job(self, name):
+        """Start a job unless it is still running"""
+        job = self.jobs[name]
+        task = self._tasks.get(name)
+        if task and not task.done():
+            job.skipped += 1
+            logger.debug("Poll '%s' still running, skipped", name)
+            return False
+        job.runs += 1
+        self._tasks[name] = asyncio.create_task(self._run_job(job))
+        return True
+
+    def _dispatch(self, now):
+        """Start every due job in priority order, return next deadline"""
+        due = sorted((j for j in self.jobs.values() if j.next_run <= now),
+                     key=lambda j: j.priority)
+        for job in due:
+            self._start_job(job.name)
+            # Keep a fixed cadence, but never try to catch up missed runs
+            job.next_run += job.interval
+            if job.next_run <= now:
+                job.next_run = now + job.interval
+
+        return min((j.next_run for j in self.jobs.values()), default=now + self.interval)
+
+    def trigger(self, name):
+        """Request an immediate run of a job (thread-safe, e.g. from event callbacks)"""
+        if self._loop and name in self.jobs:
+            self._loop.call_soon_threadsafe(self._start_job, name)
+
+    async def run(self, is_running):
+        """Main loop - runs until is_running() returns False"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = self._loop = asyncio.get_running_loop()
+
+        while is_running():
+            deadline = self._dispatch(loop.time())
+            await asyncio.sleep(min(0.1, max(deadline - loop.time(), 0)))
+
+        await self.drain()
+
+    async def drain(self, timeout=15):
+        """Wait for in-flight polls to finish"""
+        pending = [t for t in self._tasks.values() if not t.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+        self.executor.shutdown(wait=False)
+
+    def get_schedule(self):
+        """Get interval, priority and run counters per job"""
+        return {
+            name: {
+                'interval': job.interval,
+                'priority': job.priority,
+                'runs': job.runs,
+                'skipped': job.skipped,
+            }
+            for name, job in self.jobs.items()
+        }
+    
+    def get_stats(self):
+        """Get timing, error, overrun and publish counters per job"""
+        return {
+            name: dict(
+                job.latency.summary(),
+                runs=job.runs,
+                skipped=job.skipped,
+                errors=job.errors,
+                overruns=job.overruns,
+                last_ms=round(job.last_duration * 1000, 1),
+                publishes=job.publishes,
+                suppressed=job.suppressed,
+            )
+            for name, job in self.jobs.items()
+        }
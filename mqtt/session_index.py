@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Session Index
+Lookup tables over the current /Sessions list, rebuilt once per sessions
+update: short id -> full id, UserId -> sessions, DeviceId -> session
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Length of the id prefix used in discovery object ids (session_<prefix>_...)
+SHORT_ID_LENGTH = 8
+
+
+class SessionIndex:
+    """
+    Resolves command topic keys and user presence without scanning sessions
+    A prefix shared by several sessions is a collision and resolves to
+    nothing instead of an arbitrary session
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._by_short = {}     # short id -> [full id, ...]
+        self._by_user = {}      # user id -> [session id, ...]
+        self._by_device = {}    # device id -> session id
+        self._ambiguous = set()
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def update(self, sessions):
+        """Rebuild from {session_id: session}"""
+        by_short, by_user, by_device = {}, {}, {}
+        ambiguous = set()
+        for session_id, session in sessions.items():
+            short = session_id[:SHORT_ID_LENGTH]
+            if short in by_short:
+                ambiguous.add(short)
+            by_short.setdefault(short, []).append(session_id)
+            user_id = session.get('UserId')
+            if user_id:
+                by_user.setdefault(user_id, []).append(session_id)
+            device_id = session.get('DeviceId')
+            if device_id:
+                by_device[device_id] = session_id
+        with self._lock:
+            self._sessions = sessions
+            self._by_short, self._by_user, self._by_device = by_short, by_user, by_device
+            new, self._ambiguous = ambiguous - self._ambiguous, ambiguous
+        for short in new:
+            logger.warning("Session id prefix %s is ambiguous, commands need a longer id", short)
+
+    def resolve(self, key):
+        """Full session id for a full id, short id prefix or DeviceId, None if unknown or ambiguous"""
+        with self._lock:
+            if key in self._sessions:
+                return key
+            session_id = None
+            if len(key) >= SHORT_ID_LENGTH:
+                candidates = [c for c in self._by_short.get(key[:SHORT_ID_LENGTH], ()) if c.startswith(key)]
+                if len(candidates) == 1:
+                    session_id = candidates[0]
+            if session_id is None:
+                session_id = self._by_device.get(key)
+            if session_id is None:
+                self.misses += 1
+            return session_id
+
+    def get_user_sessions(self, user_id):
+        """Session ids of a user"""
+        with self._lock:
+            return list(self._by_user.get(user_id, ()))
+
+    def is_user_online(self, user_id):
+        """True if the user has at least one session"""
+        with self._lock:
+            return user_id in self._by_user
+
+    def get_device_session(self, device_id):
+        """Current session id of a device"""
+        with self._lock:
+            return self._by_device.get(device_id)
+
+    def get_stats(self):
+        """Index sizes and lookup counters"""
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'users': len(self._by_user),
+                'devices': len(self._by_device),
+                'collisions': len(self._ambiguous),
+                'misses': self.misses,
+            }
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Session Slots
+Maps short-lived Jellyfin session ids onto a fixed pool of reusable
+slots, so Home Assistant entities exist per slot instead of per session
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSlots:
+    """
+    Fixed-size pool of session slots
+    A session keeps its slot for as long as it is listed by /Sessions.
+    With by_device a returning device gets its previous slot back if it is
+    still free; otherwise the free slot released longest ago is used
+    """
+
+    def __init__(self, size, by_device=True):
+        self.size = size
+        self.by_device = by_device
+        self._sessions = {}        # slot -> session id
+        self._slots = {}           # session id -> slot
+        self._device_slots = {}    # device id -> last slot
+        self._slot_devices = {}    # slot -> device id of its last owner
+        self._released = {slot: 0 for slot in range(size)}
+        self._generation = 0
+        self.assigned = 0
+        self.reused = 0
+        self.overflow = 0          # sessions currently without a slot
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(slot):
+        """Topic/entity key of a slot"""
+        return f"slot_{slot}"
+
+    @staticmethod
+    def parse_key(key):
+        """Slot number of a key like slot_3, None for anything else"""
+        if not key.startswith('slot_'):
+            return None
+        try:
+            return int(key[5:])
+        except ValueError:
+            return None
+
+    def _allocate(self, device_id):
+        free = [slot for slot in range(self.size) if slot not in self._sessions]
+        if not free:
+            return None
+        if self.by_device and device_id:
+            slot = self._device_slots.get(device_id)
+            if slot in free:
+                self.reused += 1
+                return slot
+        # Prefer slots nobody owns, then the one released longest ago, so
+        # recently used slots stay available for their device
+        return min(free, key=lambda s: (s in self._slot_devices, self._released[s]))
+
+    def update(self, sessions):
+        """
+        Assign slots for the current session list
+        Returns (assigned {session_id: slot}, released [slot, ...])
+        """
+        current = {s.get('Id'): s for s in sessions if s.get('Id')}
+        with self._lock:
+            self._generation += 1
+            released = []
+            for session_id in list(self._slots):
+                if session_id not in current:
+                    slot = self._slots.pop(session_id)
+                    del self._sessions[slot]
+                    self._released[slot] = self._generation
+                    released.append(slot)
+
+            overflow = 0
+            for session_id, session in current.items():
+                if session_id in self._slots:
+                    continue
+                device_id = session.get('DeviceId')
+                slot = self._allocate(device_id)
+                if slot is None:
+                    overflow += 1
+                    continue
+                self._slots[session_id] = slot
+                self._sessions[slot] = session_id
+                self.assigned += 1
+                if device_id:
+                    previous = self._slot_devices.get(slot)
+                    if previous and self._device_slots.get(previous) == slot:
+                        del self._device_slots[previous]
+                    self._device_slots[device_id] = slot
+                    self._slot_devices[slot] = device_id
+
+            self.overflow = overflow
+            if overflow:
+                logger.debug("%d sessions without a free slot (%d slots)", overflow, self.size)
+            return dict(self._slots), released
+
+    def get_slot(self, session_id):
+        """Slot of a session, None if it has none"""
+        with self._lock:
+            return self._slots.get(session_id)
+
+    def get_session(self, slot):
+        """Session id currently in a slot"""
+        with self._lock:
+            return self._sessions.get(slot)
+
+    def get_stats(self):
+        """Pool usage counters"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'used': len(self._sessions),
+                'assigned': self.assigned,
+                'reused': self.reused,
+                'overflow': self.overflow,
+            }
@@ -0,0 +1,6 @@
+"""Shared pytest setup: the bridge modules live flat in the mqtt/ directory"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,56 @@
+"""JellyfinAPIBase._send: result and request stats per response body"""
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from api.base import JellyfinAPIBase
+from api.request_stats import RequestStats
+
+
+def make_response(status, body):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.encoding = 'utf-8'
+    return response
+
+
+@pytest.fixture
+def api():
+    http = SimpleNamespace(request_stats=RequestStats(), responses=[])
+    http.request = lambda method, url, **kwargs: http.responses.pop(0)
+    return JellyfinAPIBase('http://jellyfin.invalid', 'test', http_pool=http)
+
+
+def send(api, status, body):
+    api.http.responses.append(make_response(status, body))
+    return api._send('GET', '/System/Info', None, None, None, 10, False)
+
+
+def test_json_body_counts_once(api):
+    assert send(api, 200, b'{"Version": "10.9.0"}') == ({'Version': '10.9.0'}, 21)
+    assert api.http.request_stats.get_totals()['count'] == 1
+    assert api.http.request_stats.get_totals()['errors'] == 0
+
+
+def test_empty_body_is_success(api):
+    assert send(api, 204, b'') == (True, 0)
+    assert send(api, 200, b'') == (True, 0)
+    assert api.http.request_stats.get_totals()['count'] == 2
+    assert api.http.request_stats.get_totals()['errors'] == 0
+
+
+def test_non_json_body_counts_once_as_error(api):
+    assert send(api, 200, b'<html>proxy login</html>') == (None, 0)
+    totals = api.http.request_stats.get_totals()
+    assert totals['count'] == 1
+    assert totals['errors'] == 1
+    assert totals['bytes'] == 24
+
+
+def test_http_error_counts_once_as_error(api):
+    assert send(api, 500, b'') == (None, 0)
+    totals = api.http.request_stats.get_totals()
+    assert (totals['count'], totals['errors']) == (1, 1)
@@ -0,0 +1,67 @@
+"""CommandExecutor: per-key ordering, parallel keys, queue deadline"""
+
+import time
+import threading
+
+import pytest
+
+from command_executor import CommandExecutor, PRIORITY_PLAYBACK
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def executor():
+    executor = CommandExecutor(workers=4, deadline=5)
+    executor.start()
+    yield executor
+    executor.stop()
+
+
+def test_same_key_runs_in_order_one_at_a_time(executor):
+    log = []
+    running = []
+
+    def command(name, duration):
+        running.append(name)
+        assert len(running) == 1, running
+        time.sleep(duration)
+        log.append(name)
+        running.remove(name)
+
+    # A slow pause must not be overtaken by the unpause queued right after it
+    executor.submit('session', command, 'pause', 0.2, priority=PRIORITY_PLAYBACK, key='sessions/a')
+    executor.submit('session', command, 'unpause', 0, priority=PRIORITY_PLAYBACK, key='sessions/a')
+    executor.submit('volume', command, 'volume', 0, priority=PRIORITY_PLAYBACK, key='sessions/a')
+
+    assert wait_for(lambda: executor.get_stats()['completed'] == 3)
+    assert log == ['pause', 'unpause', 'volume']
+    assert executor.get_stats()['queue_depth'] == 0
+
+
+def test_different_keys_run_in_parallel(executor):
+    started = threading.Barrier(2, timeout=2)
+    executor.submit('session', started.wait, key='sessions/a')
+    executor.submit('session', started.wait, key='sessions/b')
+
+    assert wait_for(lambda: executor.get_stats()['completed'] + executor.get_stats()['failed'] == 2)
+    assert executor.get_stats()['failed'] == 0
+
+
+def test_deadline_drops_commands_waiting_for_their_key(executor):
+    release = threading.Event()
+    ran = []
+    executor.submit('session', release.wait, 2, key='sessions/a')
+    executor.submit('session', ran.append, 'late', deadline=0.1, key='sessions/a')
+    time.sleep(0.3)
+    release.set()
+
+    assert wait_for(lambda: executor.get_stats()['expired'] == 1)
+    assert ran == []
@@ -0,0 +1,117 @@
+"""ContainerStats against a fake cgroup v2 / proc / sys tree"""
+
+import os
+
+import pytest
+
+import container_stats
+from container_stats import ContainerStats
+
+GIB = 1024 ** 3
+
+
+def write(root, path, content):
+    full = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, 'w') as f:
+        f.write(content)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """tmp/sys/fs/cgroup (cgroup v2), tmp/proc and tmp/sys/dev/block"""
+    cgroup = os.path.join(tmp_path, 'sys', 'fs', 'cgroup')
+    write(cgroup, 'cgroup.controllers', 'cpu io memory pids\n')
+    write(tmp_path, 'proc/meminfo', 'MemTotal:       16777216 kB\nMemFree:         1024 kB\n')
+    return tmp_path, cgroup
+
+
+def stats_for(tree):
+    tmp_path, cgroup = tree
+    return ContainerStats(cgroup, proc_root=os.path.join(tmp_path, 'proc'))
+
+
+def test_memory_max_unlimited_uses_host_memory(tree):
+    _, cgroup = tree
+    write(cgroup, 'memory.current', f'{4 * GIB}\n')
+    write(cgroup, 'memory.max', 'max\n')
+
+    memory = stats_for(tree).get_memory_stats()
+
+    assert memory['limited'] is False
+    assert memory['limit_bytes'] == 16 * GIB
+    assert memory['used_mb'] == 4096
+    assert memory['percent'] == 25
+
+
+def test_memory_max_limit(tree):
+    _, cgroup = tree
+    write(cgroup, 'memory.current', f'{GIB}\n')
+    write(cgroup, 'memory.max', f'{2 * GIB}\n')
+
+    memory = stats_for(tree).get_memory_stats()
+
+    assert memory['limited'] is True
+    assert memory['limit_bytes'] == 2 * GIB
+    assert memory['percent'] == 50
+
+
+def test_pressure_some_and_full(tree):
+    _, cgroup = tree
+    write(cgroup, 'cpu.pressure',
+          'some avg10=1.50 avg60=0.75 avg300=0.10 total=123456\n'
+          'full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n')
+    write(cgroup, 'memory.pressure',
+          'some avg10=12.00 avg60=8.00 avg300=2.50 total=999\n'
+          'full avg10=10.00 avg60=6.00 avg300=2.00 total=888\n')
+
+    pressure = stats_for(tree).get_pressure_stats()
+
+    assert set(pressure) == {'cpu', 'memory'}
+    assert pressure['cpu']['some'] == {'avg10': 1.5, 'avg60': 0.75, 'avg300': 0.1, 'total': 123456}
+    assert pressure['cpu']['full']['total'] == 0
+    assert pressure['memory']['full'] == {'avg10': 10.0, 'avg60': 6.0, 'avg300': 2.0, 'total': 888}
+
+
+def test_memory_stat_breakdown(tree):
+    _, cgroup = tree
+    write(cgroup, 'memory.stat', 'anon 1000\nfile 2000\nkernel 300\nshmem 40\nslab 99\n')
+
+    assert stats_for(tree).get_memory_breakdown() == {'anon': 1000, 'file': 2000, 'kernel': 300, 'shmem': 40}
+
+
+def test_memory_stat_kernel_summed_on_old_kernels(tree):
+    _, cgroup = tree
+    write(cgroup, 'memory.stat',
+          'anon 1\nfile 2\nkernel_stack 10\npagetables 20\npercpu 30\nsock 40\nslab 50\nshmem 3\n')
+
+    assert stats_for(tree).get_memory_breakdown()['kernel'] == 150
+
+
+def test_io_stat_rates_and_device_names(tree, monkeypatch):
+    tmp_path, cgroup = tree
+    os.makedirs(os.path.join(tmp_path, 'sys', 'devices', 'virtual', 'block', 'vda'))
+    os.makedirs(os.path.join(tmp_path, 'sys', 'dev', 'block'))
+    os.symlink('../../devices/virtual/block/vda', os.path.join(tmp_path, 'sys', 'dev', 'block', '253:0'))
+    clock = [100.0]
+    monkeypatch.setattr(container_stats.time, 'monotonic', lambda: clock[0])
+    stats = stats_for(tree)
+
+    write(cgroup, 'io.stat',
+          '253:0 rbytes=1000 wbytes=2000 rios=1 wios=2 dbytes=0 dios=0\n'
+          '8:16 rbytes=0 wbytes=0 rios=0 wios=0 dbytes=0 dios=0\n')
+    first = stats.get_io_stats()
+    assert set(first['devices']) == {'vda', '8_16'}
+    assert 'read_rate' not in first['devices']['vda']
+
+    clock[0] += 2
+    write(cgroup, 'io.stat',
+          '253:0 rbytes=5000 wbytes=3000 rios=5 wios=3 dbytes=0 dios=0\n'
+          '8:16 rbytes=0 wbytes=0 rios=0 wios=0 dbytes=0 dios=0\n')
+    second = stats.get_io_stats()
+
+    vda = second['devices']['vda']
+    assert vda['read_rate'] == 2000
+    assert vda['write_rate'] == 500
+    assert second['read_bytes'] == 5000
+    assert second['write_bytes'] == 3000
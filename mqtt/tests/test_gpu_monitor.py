@@ -0,0 +1,120 @@
+"""GPU parsing and the streaming sampler against tests/fixtures/fake_nvidia_smi"""
+
+import os
+import time
+
+import pytest
+
+from gpu_monitor import GPUMonitor, GPUSampler, aggregate_metrics, parse_metrics_line, parse_metrics_output
+
+FAKE_SMI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'fake_nvidia_smi')
+ROW = '0, GPU-aaaa, NVIDIA GeForce RTX 3060, 550.54, 45, 17, 12288, 3072, 9216, 8, 5, 35.50, 30'
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def sampler():
+    samplers = []
+
+    def start(**kwargs):
+        sampler = GPUSampler(FAKE_SMI, **kwargs)
+        sampler.start()
+        samplers.append(sampler)
+        return sampler
+
+    yield start
+    for sampler in samplers:
+        sampler.stop()
+
+
+def test_parse_metrics_line():
+    metrics = parse_metrics_line(ROW + '\n')
+
+    assert metrics['index'] == 0
+    assert metrics['uuid'] == 'GPU-aaaa'
+    assert metrics['name'] == 'NVIDIA GeForce RTX 3060'
+    assert metrics['utilization'] == 17
+    assert metrics['memory_percent'] == 25
+    assert metrics['encoder'] == 8
+    assert metrics['power'] == 35.5
+    assert metrics['fan_speed'] == 30
+
+
+def test_parse_metrics_line_rejects_malformed_rows():
+    assert parse_metrics_line('') is None
+    assert parse_metrics_line('index, uuid, name') is None
+    assert parse_metrics_line('No devices were found') is None
+    # [N/A] fields read as 0 instead of failing the row
+    assert parse_metrics_line(ROW.replace('35.50, 30', '[N/A], [N/A]'))['power'] == 0.0
+
+
+def test_parse_metrics_output_multi_gpu():
+    gpus = parse_metrics_output(ROW + '\n' + ROW.replace('0, GPU-aaaa', '1, GPU-bbbb') + '\n')
+
+    assert sorted(gpus) == [0, 1]
+    assert aggregate_metrics(gpus)['memory_used'] == 6144
+    assert aggregate_metrics(gpus)['count'] == 2
+
+
+def test_sampler_parses_streamed_rows_incrementally(sampler):
+    gpu = sampler(interval_ms=20)
+
+    assert wait_for(lambda: gpu.get_latest().get(0, {}).get('utilization', 0) >= 3)
+    latest = gpu.get_latest()
+    assert sorted(latest) == [0, 1]
+    assert latest[1]['name'] == 'NVIDIA T400'
+    # Both cards come from the same loop of the fake
+    assert abs(latest[0]['utilization'] - latest[1]['utilization']) <= 1
+
+
+def test_sampler_ring_buffer_keeps_newest_samples(sampler):
+    gpu = sampler(interval_ms=10, history=6)
+
+    assert wait_for(lambda: gpu.get_latest().get(0, {}).get('utilization', 0) >= 10)
+    history = gpu.get_history()
+    assert len(history) == 6
+    times = [sampled for sampled, _ in history]
+    assert times == sorted(times)
+    utilizations = [metrics['utilization'] for _, metrics in history]
+    assert min(utilizations) >= 6
+    assert utilizations == sorted(utilizations)
+
+
+def test_get_latest_leaves_out_stale_cards(sampler):
+    gpu = sampler(interval_ms=10)
+    assert wait_for(lambda: len(gpu.get_latest()) == 2)
+
+    gpu.stop()
+    time.sleep(0.2)
+
+    assert gpu.get_latest(max_age=0.1) == {}
+    assert sorted(gpu.get_latest()) == [0, 1]
+
+
+def test_sampler_restarts_exited_process(sampler, monkeypatch):
+    monkeypatch.setenv('FAKE_SMI_LOOPS', '2')
+    gpu = sampler(interval_ms=10, restart_delay=0.05)
+
+    assert wait_for(lambda: gpu.restarts >= 2)
+    assert len(gpu.get_latest()) == 2
+
+
+def test_monitor_serves_sampler_metrics():
+    monitor = GPUMonitor(FAKE_SMI)
+    assert monitor.available
+    assert sorted(monitor.get_all_metrics()) == [0, 1]
+
+    monitor.start_sampler(interval_ms=10)
+    try:
+        assert wait_for(lambda: monitor.sampler.get_latest().get(0, {}).get('utilization', 0) >= 2)
+        assert monitor.get_all_metrics()[0]['utilization'] >= 2
+    finally:
+        monitor.stop_sampler()
@@ -0,0 +1,206 @@
+"""Event stream and the bridge's event/polling switch against the /socket of bench/fake_jellyfin.py"""
+
+import time
+import threading
+
+import pytest
+
+pytest.importorskip('websocket')
+
+import config
+import mqtt_bridge
+from bench import fixtures
+from bench.fake_broker import FakeBroker
+from bench.fake_jellyfin import FakeJellyfin
+from jellyfin_events import JellyfinEventStream
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def jellyfin():
+    server = FakeJellyfin(sessions=2, library_size=10, persons=0, tasks=3, users=1, libraries=1).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def stream(jellyfin):
+    stream = JellyfinEventStream(jellyfin.url, 'test', reconnect_delay=0.1)
+    received = []
+    stream.on('Sessions', lambda data: received.append(('Sessions', data)))
+    stream.on('ScheduledTasksInfo', lambda data: received.append(('ScheduledTasksInfo', data)))
+    stream.received = received
+    assert stream.start()
+    assert wait_for(stream.is_live)
+    yield stream
+    stream.stop()
+
+
+def test_subscribes_to_feeds(jellyfin, stream):
+    assert wait_for(lambda: len(jellyfin.socket_messages) >= 3)
+    assert list(jellyfin.socket_messages)[:3] == [
+        ('SessionsStart', '0,1000'),
+        ('ScheduledTasksInfoStart', '0,1000'),
+        ('ActivityLogEntryStart', '0,1000'),
+    ]
+    # Each Start is answered with the current state
+    assert wait_for(lambda: len(stream.received) >= 2)
+    assert [len(data) for _, data in stream.received[:2]] == [2, 3]
+
+
+def test_dispatches_pushed_messages(jellyfin, stream):
+    assert wait_for(lambda: len(stream.received) >= 2)
+    session = fixtures.make_session(7)
+    task = fixtures.make_task(0, running=True, progress=12.5)
+
+    assert jellyfin.push('Sessions', [session]) == 1
+    assert jellyfin.push('ScheduledTasksInfo', [task]) == 1
+    jellyfin.push('UnknownMessage', {})
+
+    assert wait_for(lambda: len(stream.received) >= 4)
+    assert stream.received[2:] == [('Sessions', [session]), ('ScheduledTasksInfo', [task])]
+
+
+def test_set_sessions_pushes_to_subscribers(jellyfin, stream):
+    assert wait_for(lambda: len(stream.received) >= 2)
+    jellyfin.set_sessions([])
+    assert wait_for(lambda: stream.received[-1] == ('Sessions', []))
+
+
+def test_answers_force_keepalive(jellyfin, stream):
+    # The fake sends ForceKeepAlive on connect, the stream answers at once
+    assert wait_for(lambda: ('KeepAlive', None) in jellyfin.socket_messages)
+    assert stream._keepalive_interval == jellyfin.keepalive_timeout / 2
+
+
+def test_disconnect_and_reconnect(jellyfin, stream):
+    def starts():
+        return sum(1 for message in jellyfin.socket_messages if message[0] == 'SessionsStart')
+
+    assert wait_for(lambda: starts() == 1)
+
+    stream.reconnect_delay = 1
+    assert jellyfin.close_sockets() == 1
+    assert wait_for(lambda: not stream.is_live())
+
+    assert wait_for(lambda: starts() == 2)
+    assert stream.is_live()
+
+
+def test_stop_while_reconnecting(jellyfin, stream):
+    stream.reconnect_delay = 0
+    for _ in range(20):
+        jellyfin.close_sockets()
+        time.sleep(0.005)
+    stream.stop()
+    assert not stream._thread.is_alive()
+    assert wait_for(lambda: jellyfin.socket_count() == 0)
+
+
+def test_no_server_is_not_live():
+    stream = JellyfinEventStream(None, None, url='ws://127.0.0.1:9/socket', reconnect_delay=0.1)
+    assert stream.start()
+    try:
+        assert not wait_for(stream.is_live, timeout=0.5)
+    finally:
+        stream.stop()
+
+
+# ----------------------------------------------------------------------
+# Bridge: published state from events, polling while the socket is down
+# ----------------------------------------------------------------------
+
+@pytest.fixture
+def broker():
+    server = FakeBroker().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def bridge_env(monkeypatch, tmp_path, jellyfin, broker):
+    monkeypatch.setattr(config, '_config', None)
+    monkeypatch.setattr(mqtt_bridge.signal, 'signal', lambda *args: None)
+    for name, value in {
+        'MQTT_ENABLE': 'true',
+        'MQTT_HOST': '127.0.0.1',
+        'MQTT_PORT': str(broker.port),
+        'MQTT_TOPIC': 'jellyfin',
+        'MQTT_CLIENT_ID': 'jellyfin-test',
+        'MQTT_POLL_INTERVAL': '1',
+        'MQTT_DISCOVERY_CACHE': '',
+        'MQTT_DISCOVERY_SYNC_WAIT': '0',
+        'JELLYFIN_HOST': jellyfin.url,
+        'JELLYFIN_API_KEY': 'test',
+        'JELLYFIN_EVENTS_ENABLE': 'true',
+        'JELLYFIN_EVENTS_RECONCILE': '3600',
+        'METRICS_ENABLE': 'false',
+        'GPU_SAMPLER_ENABLE': 'false',
+        'GPU_SMI_BINARY': str(tmp_path / 'no-nvidia-smi'),
+    }.items():
+        monkeypatch.setenv(name, value)
+    for group in ('sessions', 'tasks'):
+        broker.retain(f"jellyfin/groups/{group}/set", b'ON')
+
+
+def run_bridge(scenario):
+    """Run the bridge on this thread (it installs signal handlers) while scenario(bridge) runs beside it"""
+    bridge = mqtt_bridge.MQTTBridge()
+    errors = []
+
+    def target():
+        try:
+            scenario(bridge)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            wait_for(lambda: bridge.running, timeout=30)
+            bridge.running = False
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    bridge.run()
+    thread.join(timeout=10)
+    if errors:
+        raise errors[0]
+
+
+def test_bridge_publishes_events_and_falls_back_to_polling(jellyfin, broker, bridge_env):
+    published = {}
+    broker.listeners.append(lambda topic, payload: published.__setitem__(
+        topic[len('jellyfin/'):], payload.decode('utf-8')))
+    session = fixtures.make_session(42, playing=True, paused=False)
+    task = dict(fixtures.make_task(1), State='Running', CurrentProgressPercentage=40.0)
+
+    def scenario(bridge):
+        assert wait_for(lambda: bridge.events is not None and bridge.events.is_live(), timeout=30)
+        assert wait_for(lambda: published.get("sessions/total_count") == '2', timeout=10)
+
+        # Pushed state is published without a poll
+        polls = jellyfin.hits['/Sessions']
+        jellyfin.push('Sessions', [session])
+        jellyfin.push('ScheduledTasksInfo', [task])
+        assert wait_for(lambda: published.get(f"sessions/{session['Id']}/state") == 'playing')
+        assert wait_for(lambda: published.get("sessions/total_count") == '1')
+        assert wait_for(lambda: published.get(f"tasks/{task['Id']}/state") == 'Running')
+        assert wait_for(lambda: published.get(f"tasks/{task['Id']}/progress") == '40.0')
+
+        # Socket gone: sessions are polled again until the stream reconnects
+        bridge.events.reconnect_delay = 60
+        jellyfin.close_sockets()
+        assert wait_for(lambda: not bridge.events.is_live())
+        assert not bridge._event_driven('sessions')
+        jellyfin.set_sessions([dict(session, PlayState=dict(session['PlayState'], IsPaused=True))])
+        assert wait_for(lambda: published.get(f"sessions/{session['Id']}/state") == 'paused')
+        assert jellyfin.hits['/Sessions'] > polls
+        assert not bridge.events.is_live()
+
+    run_bridge(scenario)
@@ -0,0 +1,33 @@
+"""LastValueCache suppression and forget semantics"""
+
+from publish_cache import LastValueCache
+
+
+def test_unchanged_payload_is_suppressed():
+    cache = LastValueCache()
+
+    assert cache.should_publish('jellyfin/a', '1')
+    assert not cache.should_publish('jellyfin/a', '1')
+    assert cache.should_publish('jellyfin/a', '2')
+    assert cache.get_stats() == {'sent': 2, 'suppressed': 1, 'topics': 1}
+
+
+def test_forget_topic_is_exact():
+    cache = LastValueCache()
+    for topic in ('jellyfin/sessions/x/json', 'jellyfin/sessions/x/json2'):
+        cache.should_publish(topic, 'v')
+
+    cache.forget('jellyfin/sessions/x/json')
+
+    assert cache.should_publish('jellyfin/sessions/x/json', 'v')
+    assert not cache.should_publish('jellyfin/sessions/x/json2', 'v')
+
+
+def test_forget_prefix_needs_trailing_slash():
+    cache = LastValueCache()
+    for topic in ('jellyfin/sessions/1/state', 'jellyfin/sessions/1/media/title', 'jellyfin/sessions/10/state'):
+        cache.should_publish(topic, 'v')
+
+    cache.forget('jellyfin/sessions/1/')
+
+    assert [t for t, _, _ in cache.items()] == ['jellyfin/sessions/10/state']
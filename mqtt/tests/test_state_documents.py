@@ -0,0 +1,162 @@
+"""MQTT_STATE_JSON: discovery value_templates rendered against the documents the bridge publishes"""
+
+import re
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import config
+import mqtt_bridge
+from bench import fixtures
+from discovery import DiscoveryManager
+from publish_cache import StateDocuments, pick_fields
+
+TEMPLATE = re.compile(r"^\{\{ value_json\['(.+)'\] \| default\(None\) \}\}$")
+
+DEVICE = {'Name': 'Living Room TV', 'Id': 'device-1', 'CustomName': '', 'AppName': 'Jellyfin Android TV',
+          'AppVersion': '0.16.0', 'LastUserName': 'user0', 'LastUserId': 'user-0',
+          'DateLastActivity': '2024-01-01T12:00:00.0000000Z', 'IconUrl': 'https://example.invalid/tv.png'}
+PLUGIN = {'Name': 'Open Subtitles', 'Id': 'plugin-1', 'Version': '20.0.0.0', 'Description': 'Subtitles',
+          'Status': 'Active', 'CanUninstall': True, 'HasImage': False, 'ConfigurationFileName': 'subs.xml',
+          'AssemblyFilePath': '/config/plugins/subs.dll', 'DataFolderPath': '/config/plugins/subs'}
+PROCESS = {'pid': 4242, 'cpu_percent': 87.5, 'cpu_seconds': 12.0, 'rss_bytes': 300 * 1024 * 1024,
+           'hwaccel': 'nvenc', 'video_codec': 'h264', 'audio_codec': 'aac', 'bitrate': '8000k',
+           'input': '/media/movie.mkv', 'output_dir': '/transcodes'}
+
+# Entities the bridge has no data for, in either MQTT_STATE_JSON mode
+UNPUBLISHED = {'has_update', 'message/text', 'active_session', 'watch_count', 'watch_time'}
+
+
+class Recorder:
+    """Publisher stand-in keeping the last payload per topic"""
+
+    def __init__(self):
+        self.messages = {}
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        self.messages[topic] = payload
+        return SimpleNamespace(rc=0)
+
+
+@pytest.fixture
+def bridge(monkeypatch):
+    monkeypatch.setattr(config, '_config', None)
+    monkeypatch.setenv('MQTT_STATE_JSON', 'true')
+    monkeypatch.setenv('MQTT_DISCOVERY_CACHE', '')
+    monkeypatch.setenv('MQTT_TOPIC', 'jellyfin')
+    bridge = mqtt_bridge.MQTTBridge()
+    bridge.publisher = Recorder()
+    bridge.state_docs = StateDocuments()
+    bridge.discovery = DiscoveryManager(bridge.publisher, fixtures.make_system_info())
+    session = fixtures.make_session(3, transcoding=True)
+    bridge.jellyfin = SimpleNamespace(
+        is_group_enabled=lambda group: True,
+        users=SimpleNamespace(get_users=lambda: [fixtures.make_user(0)], get_public_users=lambda: []),
+        devices=SimpleNamespace(get_devices=lambda: {'Items': [DEVICE]}),
+        plugins=SimpleNamespace(get_plugins=lambda: [PLUGIN], get_repositories=lambda: []),
+    )
+    bridge.transcodes = SimpleNamespace(scan=lambda: [PROCESS],
+                                        correlate=lambda processes, sessions: {session['Id']: PROCESS})
+    bridge.publish_sessions([session])
+    bridge.publish_tasks([fixtures.make_task(0, running=True, progress=12.5)])
+    bridge.poll_users()
+    bridge.poll_devices()
+    bridge.poll_plugins()
+    return bridge
+
+
+def documents(bridge):
+    """Discovery configs that read a state document, with the document they point at"""
+    messages = bridge.publisher.messages
+    for topic, payload in messages.items():
+        if not topic.endswith('/config') or not payload:
+            continue
+        entity = json.loads(payload)
+        if not entity.get('state_topic', '').endswith('/json'):
+            continue
+        yield entity, json.loads(messages[entity['state_topic']])
+
+
+def render(entity, document):
+    """What Home Assistant shows for the entity"""
+    field = TEMPLATE.match(entity['value_template']).group(1)
+    return field, document.get(field)
+
+
+def test_pick_fields():
+    task = fixtures.make_task(0)
+    assert pick_fields(task, ['Name', 'LastExecutionResult/Status', 'Triggers/0/Type', 'Triggers/count',
+                              'Triggers/1/Type', 'Policy/IsAdministrator']) == {
+        'Name': task['Name'],
+        'LastExecutionResult/Status': 'Completed',
+        'Triggers/0/Type': 'IntervalTrigger',
+        'Triggers/count': 1,
+    }
+
+
+def test_every_template_finds_its_field(bridge):
+    groups = set()
+    for entity, document in documents(bridge):
+        field, value = render(entity, document)
+        groups.add(entity['state_topic'].split('/')[1])
+        if field not in UNPUBLISHED:
+            assert value is not None, f"{entity['unique_id']} reads missing field {field!r}"
+    assert groups == {'sessions', 'tasks', 'users', 'devices', 'plugins'}
+
+
+def test_templates_render_object_values(bridge):
+    prefix = f"jellyfin_{config.get_config().server_id}_"
+    values = {entity['unique_id'][len(prefix):]: render(entity, document)[1]
+              for entity, document in documents(bridge)}
+    assert values['user_user0_name'] == 'user0'
+    assert values['user_user0_is_admin'] == 'true'
+    assert values['user_user0_max_parental_rating'] == ''
+    assert values['task_scan_media_library_state'] == 'Running'
+    assert values['task_scan_media_library_current_progress'] == '12.5'
+    assert values['task_scan_media_library_is_running'] == 'true'
+    assert values['task_scan_media_library_trigger_type'] == 'IntervalTrigger'
+    assert values['device_living_room_tv_app_name'] == 'Jellyfin Android TV'
+    assert values['plugin_open_subtitles_is_active'] == 'true'
+    assert values['plugin_open_subtitles_version'] == '20.0.0.0'
+
+    session = fixtures.make_session(3, transcoding=True)
+    prefix = f"session_{session['Id'][:8]}"
+    assert values[f"{prefix}_state"] == 'playing'
+    assert values[f"{prefix}_user_name"] == session['UserName']
+    assert values[f"{prefix}_now_playing_name"] == session['NowPlayingItem']['Name']
+    assert values[f"{prefix}_is_transcoding"] == 'true'
+    assert values[f"{prefix}_transcode_hwaccel"] == 'nvenc'
+
+
+def test_attributes_entity_has_its_field(bridge):
+    for entity, document in documents(bridge):
+        if 'json_attributes_topic' in entity:
+            assert render(entity, document)[1] not in (None, '')
+
+
+def test_fields_the_object_lost_are_blanked(bridge):
+    session = fixtures.make_session(3, playing=False)
+    bridge.publish_sessions([session])
+    document = json.loads(bridge.publisher.messages[f"jellyfin/sessions/{session['Id']}/json"])
+    assert document['state'] == 'idle'
+    assert document['NowPlayingItem/Name'] == ''
+    assert document['TranscodingInfo/VideoCodec'] == ''
+    assert document['UserName'] == session['UserName']
+
+
+def test_transcode_fields_cleared_when_transcode_ends(bridge):
+    session = fixtures.make_session(3, transcoding=True)
+    topic = f"jellyfin/sessions/{session['Id']}/json"
+    assert json.loads(bridge.publisher.messages[topic])['transcode/cpu_percent'] == '87.5'
+
+    bridge.transcodes = SimpleNamespace(scan=lambda: [], correlate=lambda processes, sessions: {})
+    bridge.publish_sessions([fixtures.make_session(3, transcoding=False)])
+    document = json.loads(bridge.publisher.messages[topic])
+    assert document['is_transcoding'] == 'false'
+    assert {document[f"transcode/{field}"] for field in mqtt_bridge.TRANSCODE_TOPICS} == {''}
+
+
+def test_process_list_leaves_out_usage_counters(bridge):
+    processes = json.loads(bridge.publisher.messages['jellyfin/transcoding/processes'])
+    assert processes == [{field: PROCESS[field] for field in mqtt_bridge.PROCESS_FIELDS}]
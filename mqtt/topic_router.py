@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Topic Router
+Compiles command topic patterns into a trie with exactly one MQTT
+subscription per route, so no message is delivered twice
+"""
+
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _filters_overlap(a, b):
+    """True if some topic matches both subscription filters"""
+    a, b = a.split('/'), b.split('/')
+    for x, y in zip(a, b):
+        if x == '#' or y == '#':
+            return True
+        if x != y and x != '+' and y != '+':
+            return False
+    if len(a) == len(b):
+        return True
+    # a/b also matches a/b/#
+    longer = a if len(a) > len(b) else b
+    return longer[min(len(a), len(b))] == '#'
+
+
+class _Node:
+    __slots__ = ('children', 'route')
+
+    def __init__(self):
+        self.children = {}
+        self.route = None
+
+
+class TopicRouter:
+    """
+    Routes MQTT topics below base to handlers
+    Patterns are relative to base and may contain + and a trailing #;
+    handlers are called with the + segments (and the # remainder) followed
+    by the payload. Broker redeliveries (DUP flag) are counted, not dropped
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self._root = _Node()
+        self._routes = []
+        self._lock = threading.Lock()
+        self.routed = 0
+        self.unmatched = 0
+        self.duplicates = 0
+        self._cost_total = 0.0
+        self._cost_max = 0.0
+
+    def add(self, pattern, handler):
+        """Add a route, overlapping patterns are rejected"""
+        for existing, _ in self._routes:
+            if _filters_overlap(existing, pattern):
+                raise ValueError(f"Route '{pattern}' overlaps '{existing}'")
+        node = self._root
+        for segment in pattern.split('/'):
+            node = node.children.setdefault(segment, _Node())
+        node.route = (pattern, handler)
+        self._routes.append((pattern, handler))
+
+    def subscriptions(self):
+        """One subscription filter per route"""
+        return [f"{self.base}/{pattern}" for pattern, _ in self._routes]
+
+    def _match(self, node, segments, i, captures):
+        if i == len(segments):
+            return node.route, captures
+        for key in (segments[i], '+'):
+            child = node.children.get(key)
+            if child is not None:
+                found = self._match(child, segments, i + 1,
+                                    captures + [segments[i]] if key == '+' else captures)
+                if found[0]:
+                    return found
+        child = node.children.get('#')
+        if child is not None and child.route:
+            return child.route, captures + ['/'.join(segments[i:])]
+        return None, captures
+
+    def match(self, topic):
+        """(pattern, handler, captures) of a topic, None if no route matches"""
+        prefix = self.base + '/'
+        if not topic.startswith(prefix):
+            return None
+        route, captures = self._match(self._root, topic[len(prefix):].split('/'), 0, [])
+        return (route[0], route[1], captures) if route else None
+
+    def route(self, topic, payload, dup=False):
+        """Dispatch a message, returns True if a route handled it"""
+        start = time.perf_counter()
+        found = self.match(topic)
+        with self._lock:
+            if found is None:
+                self.unmatched += 1
+            else:
+                self.routed += 1
+                self.duplicates += bool(dup)
+            cost = time.perf_counter() - start
+            self._cost_total += cost
+            self._cost_max = max(self._cost_max, cost)
+
+        if found is None:
+            logger.debug("No route for %s", topic)
+            return False
+        _, handler, captures = found
+        handler(*captures, payload)
+        return True
+
+    def get_stats(self):
+        """Route counters and routing cost"""
+        with self._lock:
+            total = self.routed + self.unmatched
+            return {
+                'routes': len(self._routes),
+                'routed': self.routed,
+                'unmatched': self.unmatched,
+                'duplicates': self.duplicates,
+                'avg_us': round(self._cost_total / total * 1e6, 1) if total else 0,
+                'max_us': round(self._cost_max * 1e6, 1),
+            }
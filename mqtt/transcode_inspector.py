@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Transcode Inspector
+Finds Jellyfin's ffmpeg processes by scanning /proc (no fork) and reports
+their arguments and resource usage
+"""
+
+import os
+import time
+import logging
+
+from container_stats import RateTracker
+
+logger = logging.getLogger(__name__)
+
+# ffmpeg options whose value we report
+VIDEO_CODEC_OPTS = ('-codec:v:0', '-codec:v', '-c:v', '-vcodec')
+AUDIO_CODEC_OPTS = ('-codec:a:0', '-codec:a', '-c:a', '-acodec')
+BITRATE_OPTS = ('-b:v', '-maxrate', '-b')
+
+# Encoder name -> codec as reported in TranscodingInfo.VideoCodec
+ENCODER_CODECS = {
+    'h264_nvenc': 'h264', 'libx264': 'h264', 'h264_qsv': 'h264', 'h264_vaapi': 'h264',
+    'hevc_nvenc': 'hevc', 'libx265': 'hevc', 'hevc_qsv': 'hevc', 'hevc_vaapi': 'hevc',
+    'av1_nvenc': 'av1', 'libsvtav1': 'av1', 'av1_qsv': 'av1', 'av1_vaapi': 'av1',
+}
+
+
+def _strip_path(value):
+    """Remove file: prefix and quotes Jellyfin puts around paths"""
+    if value.startswith('file:'):
+        value = value[5:]
+    return value.strip('"')
+
+
+def _option(args, names):
+    """Value of the first matching option"""
+    for i, arg in enumerate(args[:-1]):
+        if arg in names:
+            return args[i + 1]
+    return None
+
+
+def parse_bitrate(value):
+    """Parse ffmpeg bitrate (e.g. 8000000, 8M, 720k) into bits/s"""
+    if not value:
+        return None
+    multiplier = {'k': 1000, 'm': 1000 ** 2, 'g': 1000 ** 3}.get(value[-1].lower(), 1)
+    try:
+        return int(float(value.rstrip('kKmMgG')) * multiplier)
+    except ValueError:
+        return None
+
+
+def parse_cmdline(args):
+    """
+    Extract the interesting parts of an ffmpeg command line
+    Returns dict with input, video/audio codec, hwaccel, bitrate and output dir
+    """
+    inputs = [_strip_path(args[i + 1]) for i, arg in enumerate(args[:-1]) if arg == '-i']
+
+    segments = _option(args, ('-hls_segment_filename',))
+    output = _strip_path(segments or (args[-1] if len(args) > 1 else ''))
+
+    video_codec = _option(args, VIDEO_CODEC_OPTS)
+
+    return {
+        'input': inputs[0] if inputs else None,
+        'video_codec': video_codec,
+        'video_format': ENCODER_CODECS.get(video_codec, video_codec),
+        'audio_codec': _option(args, AUDIO_CODEC_OPTS),
+        'hwaccel': _option(args, ('-hwaccel',)),
+        'bitrate': parse_bitrate(_option(args, BITRATE_OPTS)),
+        'output_dir': os.path.dirname(output) if output else None,
+    }
+
+
+class TranscodeInspector:
+    """Scans /proc for ffmpeg processes started by Jellyfin"""
+
+    def __init__(self, proc_root='/proc', binary_name='ffmpeg', parent_name='jellyfin'):
+        self.proc_root = proc_root
+        self.binary_name = binary_name
+        self.parent_name = parent_name
+        self.clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+        self.rates = RateTracker()
+        self._pids = set()
+
+    def _read(self, pid, name, binary=False):
+        try:
+            with open(os.path.join(self.proc_root, str(pid), name), 'rb' if binary else 'r') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _stat(self, pid):
+        """(comm, ppid, cpu_seconds, rss_bytes) from /proc/<pid>/stat"""
+        stat = self._read(pid, 'stat')
+        if not stat:
+            return None
+        # comm may contain spaces and parentheses, fields follow the last ')'
+        comm = stat[stat.find('(') + 1:stat.rfind(')')]
+        fields = stat[stat.rfind(')') + 2:].split()
+        try:
+            ppid = int(fields[1])
+            cpu_seconds = (int(fields[11]) + int(fields[12])) / self.clock_ticks
+            rss = int(fields[21]) * self.page_size
+        except (IndexError, ValueError):
+            return None
+        return comm, ppid, cpu_seconds, rss
+
+    def _cmdline(self, pid):
+        raw = self._read(pid, 'cmdline', binary=True)
+        if not raw:
+            return []
+        return [a.decode('utf-8', errors='replace') for a in raw.rstrip(b'\0').split(b'\0')]
+
+    def _io(self, pid):
+        """read_bytes/write_bytes from /proc/<pid>/io (needs same user)"""
+        content = self._read(pid, 'io')
+        if not content:
+            return {}
+        values = {}
+        for line in content.splitlines():
+            key, _, value = line.partition(':')
+            if key in ('read_bytes', 'write_bytes', 'rchar', 'wchar'):
+                values[key] = int(value)
+        return values
+
+    def scan(self):
+        """
+        List ffmpeg processes whose parent is Jellyfin
+        If no Jellyfin process is visible, ffmpeg processes mentioning
+        jellyfin in their arguments are reported instead
+        """
+        try:
+            pids = [int(p) for p in os.listdir(self.proc_root) if p.isdigit()]
+        except OSError as e:
+            logger.error("Cannot list %s: %s", self.proc_root, str(e))
+            return []
+
+        stats = {}
+        for pid in pids:
+            stat = self._stat(pid)
+            if stat:
+                stats[pid] = stat
+
+        parents = {pid for pid, stat in stats.items() if self.parent_name in stat[0].lower()}
+        now = time.monotonic()
+        processes = []
+
+        for pid, (comm, ppid, cpu_seconds, rss) in stats.items():
+            if self.binary_name not in comm:
+                continue
+            args = self._cmdline(pid)
+            if not args or self.binary_name not in os.path.basename(args[0]):
+                continue
+            if parents and ppid not in parents:
+                continue
+            if not parents and not any(self.parent_name in a for a in args):
+                continue
+
+            process = {
+                'pid': pid,
+                'cpu_seconds': round(cpu_seconds, 2),
+                'rss_bytes': rss,
+            }
+            rate = self.rates.update(pid, cpu_seconds, now)
+            if rate:
+                process['cpu_percent'] = round(rate[0] * 100, 1)
+            process.update(self._io(pid))
+            process.update(parse_cmdline(args))
+            processes.append(process)
+
+        current = {p['pid'] for p in processes}
+        for pid in self._pids - current:
+            self.rates.forget(pid)
+        self._pids = current
+
+        return processes
+
+    @staticmethod
+    def correlate(processes, sessions):
+        """
+        Map session id -> process for transcoding sessions
+        Matches on the media path first, then on the output codec; a single
+        unmatched transcode and process are paired directly
+        """
+        transcoding = {
+            s.get('Id'): s for s in sessions or []
+            if s.get('Id') and s.get('TranscodingInfo')
+        }
+        result = {}
+        free = list(processes)
+
+        def assign(session_id, process):
+            result[session_id] = process
+            free.remove(process)
+
+        for session_id, session in transcoding.items():
+            path = (session.get('NowPlayingItem') or {}).get('Path')
+            match = next((p for p in free if path and p.get('input') == path), None)
+            if match:
+                assign(session_id, match)
+
+        for session_id, session in transcoding.items():
+            if session_id in result:
+                continue
+            codec = (session['TranscodingInfo'].get('VideoCodec') or '').lower()
+            candidates = [p for p in free if codec and p.get('video_format') == codec]
+            if len(candidates) == 1:
+                assign(session_id, candidates[0])
+
+        unmatched = [s for s in transcoding if s not in result]
+        if len(unmatched) == 1 and len(free) == 1:
+            assign(unmatched[0], free[0])
+
+        return result
+
+
+# Singleton instance
+_inspector = None
+
+def get_transcode_inspector():
+    """Get transcode inspector singleton"""
+    global _inspector
+    if _inspector is None:
+        _inspector = TranscodeInspector()
+    return _inspector